@@ -1,13 +1,154 @@
 import os
 import re
 import datetime
+import gc
+import hashlib
 import logging
+import pickle
+from contextlib import contextmanager
 from typing import List, Dict, Optional, Union, Tuple, Any
 
+import numpy as np
+
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('YML')
 
+
+
+def _default_cache_dir() -> str:
+    """当前用户自己的缓存目录: Windows为%LOCALAPPDATA%\\OpenWECD,其他系统为~/.cache/OpenWECD"""
+    if os.name == 'nt':
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "OpenWECD")
+
+
+# 解析缓存及结果库的根目录(每个用户独立),可通过环境变量OPENWECD_CACHE修改
+CACHE_DIR = os.environ.get("OPENWECD_CACHE") or _default_cache_dir()
+# 缓存格式版本,解析逻辑变化时递增使旧缓存失效
+CACHE_VERSION = 1
+
+
+# 布尔值的文本写法
+_TRUE = frozenset(("true", "yes", "on", "1", "t", "y"))
+_FALSE = frozenset(("false", "no", "off", "0", "f", "n"))
+# 列表项/数组元素分隔符
+_ITEM_SEPARATOR = re.compile(r"[\s,;]+")
+# 多行列表项前缀"-  "(短横线后必须有空白,与负号区分)
+_LIST_ITEM = re.compile(r"^-\s+")
+
+
+def cache_dir(*parts: str) -> str:
+    """
+    返回CACHE_DIR下的子目录,不存在时以0o700权限创建.
+    缓存中的pickle文件载入时会执行代码,因此目录不属于当前用户或其他用户可写时抛出PermissionError,不使用该目录
+    """
+    path = CACHE_DIR
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    dirs = [path]
+    for part in parts:
+        path = os.path.join(path, part)
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        dirs.append(path)
+    if hasattr(os, "getuid"):
+        for d in dirs:
+            stat = os.stat(d)
+            if stat.st_uid != os.getuid() or stat.st_mode & 0o022:
+                raise PermissionError(f"缓存目录{d}不属于当前用户或其他用户可写,不使用该目录")
+    return path
+
+
+def yaml_loader():
+    """PyYAML的安全加载器,有libyaml时使用C实现的CSafeLoader"""
+    import yaml
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def load_yaml(path: str) -> Any:
+    """用最快的安全加载器读取YAML文件"""
+    import yaml
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=yaml_loader())
+
+
+def to_float(value) -> float:
+    """将节点值转换为浮点数"""
+    return float(value)
+
+
+def to_int(value) -> int:
+    """将节点值转换为整数,允许"3.0"这样的整数值浮点写法"""
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            number = float(value)
+            if not number.is_integer():
+                raise
+            return int(number)
+    return int(value)
+
+
+def to_bool(value) -> bool:
+    """将节点值转换为布尔值(true/false, yes/no, on/off, 1/0)"""
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in _TRUE:
+            return True
+        if text in _FALSE:
+            return False
+        raise ValueError(f"无法转换为布尔值: {value}")
+    return bool(value)
+
+
+def _split_items(text: str) -> List[str]:
+    return [item for item in _ITEM_SEPARATOR.split(text.strip().strip("[]")) if item]
+
+
+def to_array(value) -> np.ndarray:
+    """
+    将节点值转换为只读的浮点数组:
+    "-  "多行列表每项一行,项内多个数时得到二维数组(如翼型、变桨表),否则为一维数组;
+    单行值按空格/逗号分隔;PyYAML读出的列表直接转换
+    """
+    if isinstance(value, str):
+        lines = [line.strip() for line in value.split('\n') if line.strip()]
+        if len(lines) > 1 or (lines and _LIST_ITEM.match(lines[0])):
+            rows = [[float(x) for x in _split_items(_LIST_ITEM.sub('', line, count=1))] for line in lines]
+            if all(len(row) == 1 for row in rows):
+                array = np.array([row[0] for row in rows], dtype=np.float64)
+            else:
+                if len({len(row) for row in rows}) != 1:
+                    raise ValueError("列表各项的元素个数不一致")
+                array = np.array(rows, dtype=np.float64)
+        else:
+            array = np.array([float(x) for x in _split_items(value)], dtype=np.float64)
+    else:
+        items = [_split_items(v) if isinstance(v, str) else v for v in value]
+        array = np.array(items, dtype=np.float64)
+        if array.ndim == 2 and array.shape[1] == 1:
+            array = array[:, 0]
+    array.setflags(write=False)
+    return array
+
+
+# 类型名 -> 转换函数
+CONVERTERS = {"float": to_float, "int": to_int, "bool": to_bool, "array": to_array}
+
+
+@contextmanager
+def _gc_paused():
+    """批量创建节点时暂停循环垃圾回收(节点与父子列表互相引用,回收扫描开销远大于创建本身)"""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
 class YML:
     """处理YAML文件的读写和操作，支持节点增删改查和层级结构管理"""
     
@@ -15,6 +156,9 @@ class YML:
     
     YML_VERSION = "2.0.013"
     
+    # 修改时间节点,事务提交时更新
+    MODIFIED_KEY = "OpenWECD.Information.最后修改时间"
+    
     
     #所有行
     lines = []  # 存储YAML文件的行
@@ -29,7 +173,7 @@ class YML:
     
     class Node:
         """表示YAML文件中的节点"""
-        __slots__ = ('name', 'value', 'parent', 'space', 'tier')
+        __slots__ = ('name', 'value', 'parent', 'space', 'tier', 'children', 'cache')
         
         def __init__(self, name: str = "", value: str = None,  # type: ignore
                      parent: 'YML.Node' = None, space: int = 0, tier: int = 0):
@@ -38,50 +182,96 @@ class YML:
             self.parent = parent
             self.space = space  # 缩进空格数
             self.tier = tier    # 节点层级
+            self.children: List['YML.Node'] = []  # 直接子节点(按文件顺序)
+            self.cache: Optional[Tuple[str, Dict[str, Any]]] = None  # (原始值, {类型: 转换结果})
             
-        def clone(self) -> 'YML.Node':
-            """创建节点的深拷贝"""
-        
-            cloned_parent = self.parent.clone() if self.parent else None
-            return YML.Node(
+        def converted(self, kind: str) -> Any:
+            """按类型转换节点值并缓存,节点值变化后自动重新转换"""
+            cache = self.cache
+            if cache is None or cache[0] is not self.value:
+                cache = self.cache = (self.value, {})
+            try:
+                return cache[1][kind]
+            except KeyError:
+                if self.value is None:
+                    raise ValueError(f"节点{self.name}没有值")
+                result = cache[1][kind] = CONVERTERS[kind](self.value)
+                return result
+            
+        def clone(self, parent: 'YML.Node' = None) -> 'YML.Node':
+            """
+            拷贝节点本身(不含子节点)
+            :param parent: 拷贝的父节点,应为新树中对应的节点,不再逐个拷贝整条父链
+            """
+            cloned = YML.Node(
                 name=self.name,
                 value=self.value,
-                parent=cloned_parent,
+                parent=parent,
                 space=self.space,
                 tier=self.tier
             )
+            if parent is not None:
+                parent.children.append(cloned)
+            return cloned
             
         def __repr__(self) -> str:
             return f"<Node '{self.name}': {self.value}>"
 
-    def __init__(self, path: str = None):
+    def __init__(self, path: str = None, readonly: bool = False, cache: bool = True):
         """
         初始化YAML处理器
         :param path: YAML文件路径，若为None则创建空结构
+        :param readonly: 只读加载,不添加作者/修改时间等元数据节点,文档保持与文件一致,不能save
+        :param cache: 使用CACHE_DIR中的解析缓存(按路径、修改时间和内容摘要校验)
         """
         self.lines: List[str] = []
         self.tier: int = 0
         self.node_list: List[YML.Node] = []
         self.path: str = path
+        # 完整键路径 -> 节点
+        self._index: Dict[str, YML.Node] = {}
+        # 节点名 -> 同名节点列表,与node_list顺序一致(用于按键路径后缀查找)
+        self._by_name: Dict[str, List[YML.Node]] = {}
+        # 已删除但尚未从node_list中移除的节点,下次formatting时一并去掉
+        self._removed: set = set()
+        # node_list是否需要重新格式化(顺序或层级可能已变化)
+        self._needs_format: bool = False
+        # 事务嵌套深度与撤销记录,不在事务中时撤销记录为None
+        self._batch_depth: int = 0
+        self._journal: Optional[List[tuple]] = None
+        self.readonly: bool = readonly
         
         if path:
             # 读取文件内容
             if os.path.exists(path):
                 with open(path, 'r', encoding='utf-8') as f:
-                    self.lines = f.read().splitlines()
+                    text = f.read()
+                self.lines = text.splitlines()
+                # 解析YAML内容,缓存有效时直接重建节点树
+                if not (cache and self._load_cache(path, text)):
+                    self._parse_lines()
+                    if cache:
+                        self._save_cache(path, text)
             else:
                 self.lines = ["# OpenWECD.IO.IO Yaml by 赵子祯@zzz，will create file!"]
-            
-            # 解析YAML内容
-            self._parse_lines()
+                self._parse_lines()
             
             # 添加元数据节点
-            self._add_metadata_nodes()
+            if readonly:
+                if self.check_node_exists("OpenWECD.Information.YMLVersion"):
+                    self._validate_yml_version()
+            else:
+                self._add_metadata_nodes()
 
     def _parse_lines(self):
         """解析YAML文本行并构建节点树"""
-        current_indent = -1
-        currentNode = None
+        names: List[str] = []
+        values: List[Optional[str]] = []
+        parents: List[int] = []
+        spaces: List[int] = []
+        tiers: List[int] = []
+        # 缩进递增的祖先节点下标栈,栈顶为最近的缩进较小的节点
+        stack: List[int] = []
         i = 0
         while i < len(self.lines):
             line = self.lines[i]
@@ -99,32 +289,108 @@ class YML:
                 
             # 分割键值对
             kv = line.split(':', 1)
-            if not kv:
-                i += 1
-                continue
-                
-            # 创建节点
-            node = YML.Node()
-            node.space = self._find_pre_space(line)
-            node.name = kv[0].strip()
+            space = self._find_pre_space(line)
             
             # 处理值
-            if len(kv) > 1:
-                value_part = kv[1].strip()
-                if not value_part:  # 值为空的情况
-                    node.value = self._read_multiline_value(i, node.space)
-                    # 跳过已处理的行
-                    if node.value and '\n' in node.value:
-                        i += node.value.count('\n')
-                else:
-                    node.value = value_part
+            value_part = kv[1].strip()
+            if not value_part:  # 值为空的情况
+                value = self._read_multiline_value(i, space)
+                # 跳过已处理的行
+                if value and '\n' in value:
+                    i += value.count('\n')
             else:
-                node.value = None
+                value = value_part
                 
             # 设置父节点
-            node.parent = self._find_parent(node.space)
-            self.node_list.append(node)
+            while stack and spaces[stack[-1]] >= space:
+                stack.pop()
+            parent = stack[-1] if stack else -1
+            stack.append(len(names))
+            names.append(kv[0].strip())
+            values.append(value)
+            parents.append(parent)
+            spaces.append(space)
+            tiers.append(tiers[parent] + 1 if parent >= 0 else 0)
             i += 1
+            
+        # 解析顺序即深度优先顺序,层级也已确定,无需格式化
+        self._build(names, values, parents, spaces, tiers)
+
+    # ------------------------------------------------------------------ 节点树的扁平表示
+    def _flatten(self) -> Tuple[List[str], List[Optional[str]], List[int], List[int], List[int]]:
+        """
+        节点树的扁平表示,用于缓存和拷贝
+        :return: (名称, 值, 父节点下标(-1为根节点), 缩进, 层级),顺序与node_list一致
+        """
+        position = {id(node): i for i, node in enumerate(self.node_list)}
+        parents = [position.get(id(node.parent), -1) if node.parent else -1 for node in self.node_list]
+        return ([node.name for node in self.node_list], [node.value for node in self.node_list],
+                parents, [node.space for node in self.node_list], [node.tier for node in self.node_list])
+
+    def _build(self, names, values, parents, spaces, tiers):
+        """由扁平表示重建节点树和索引(父节点需在子节点之前),完整键路径逐级拼接"""
+        nodes: List[YML.Node] = []
+        keys: List[str] = []
+        index, by_name = self._index, self._by_name
+        with _gc_paused():
+            for name, value, p, space, tier in zip(names, values, parents, spaces, tiers):
+                if p >= 0:
+                    parent = nodes[p]
+                    node = YML.Node(name, value, parent, space, tier)
+                    parent.children.append(node)
+                    key = f"{keys[p]}.{name}"
+                else:
+                    node = YML.Node(name, value, None, space, tier)
+                    key = name
+                nodes.append(node)
+                keys.append(key)
+                index[key] = node
+                by_name.setdefault(name, []).append(node)
+        self.node_list.extend(nodes)
+
+    # ------------------------------------------------------------------ 解析缓存
+    @staticmethod
+    def _cache_path(path: str) -> str:
+        key = hashlib.blake2b(os.path.abspath(path).encode('utf-8'), digest_size=16).hexdigest()
+        return os.path.join(cache_dir("yml"), key + ".pkl")
+
+    def _load_cache(self, path: str, text: str) -> bool:
+        """
+        读取解析缓存: 修改时间和大小都相同时直接使用,否则比较内容摘要
+        :return: 缓存是否有效并已载入
+        """
+        try:
+            stat = os.stat(path)
+            with open(self._cache_path(path), 'rb') as f:
+                payload = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return False
+        if payload.get("version") != CACHE_VERSION:
+            return False
+        if (payload["mtime_ns"], payload["size"]) != (stat.st_mtime_ns, stat.st_size) and \
+                payload["digest"] != hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest():
+            return False
+        self._build(*payload["tree"])
+        return True
+
+    def _save_cache(self, path: str, text: str):
+        """写入解析缓存(先写临时文件再替换,多进程同时写入时不会读到半个文件)"""
+        try:
+            stat = os.stat(path)
+            payload = {
+                "version": CACHE_VERSION,
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "digest": hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest(),
+                "tree": self._flatten(),
+            }
+            cache_path = self._cache_path(path)
+            tmp_path = f"{cache_path}.tmp{os.getpid()}"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"写入YML解析缓存失败: {e}")
 
     def _read_multiline_value(self, start_index: int, base_indent: int) -> str:
         """
@@ -169,7 +435,7 @@ class YML:
         self.add_node("OpenWECD.Information.Auther", "YML 模块由赵子祯独立开发 @copyright")
         
         # 添加修改时间
-        self.add_node("OpenWECD.Information.最后修改时间", datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        self._stamp()
         
         # 格式化节点结构
         self.formatting()
@@ -194,52 +460,202 @@ class YML:
         cloned = YML()
         cloned.tier = self.tier
         cloned.lines = self.lines.copy()
-        cloned.node_list = [node.clone() for node in self.node_list]
         cloned.path = self.path
+        # 父节点指向新列表中对应的拷贝,而不是各自独立的父链拷贝
+        cloned._build(*self._flatten())
+        cloned._needs_format = self._needs_format
         return cloned
 
+    def variant(self) -> 'YMLVariant':
+        """
+        创建写时复制的变体: 与本文档共享全部节点,只记录修改、添加和删除的键,
+        创建开销和内存与修改的键数成正比,适合由一个基准配置派生大量参数化工况
+        """
+        return YMLVariant(self)
+
+    def template(self) -> 'YMLTemplate':
+        """创建渲染模板,用于由本文档快速生成大量只修改已有键值的文件内容"""
+        return YMLTemplate(self)
+
+    def _stamp(self):
+        """更新修改时间节点"""
+        self.add_node(self.MODIFIED_KEY, datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+
     def modify(self, key: str, value: str):
         """修改指定节点的值"""
         node = self.find_node_by_key(key)
         if node:
+            if self._journal is not None:
+                self._journal.append(("value", node, node.value))
             node.value = value
+            node.cache = None
+
+    @contextmanager
+    def batch(self, stamp: bool = True):
+        """
+        批量修改事务: 事务内的add_node/modify/delete_node/update/delete不做格式化,
+        提交时只更新一次修改时间(stamp为False时不更新)并格式化一次; 事务内抛出异常时恢复到事务开始前的状态.
+        可以嵌套,只有最外层事务提交或回滚
+
+        with yml.batch():
+            yml.update({"a.b": "1", "a.c": "2"})
+            yml.delete(["a.d"])
+        """
+        if self._batch_depth:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+            return
+
+        saved_list, saved_len, saved_format = self.node_list, len(self.node_list), self._needs_format
+        self._journal = []
+        self._batch_depth = 1
+        try:
+            yield self
+            if self._journal and stamp:
+                self._stamp()
+        except BaseException:
+            self._rollback(saved_list, saved_len, saved_format)
+            raise
+        finally:
+            self._batch_depth = 0
+            self._journal = None
+        if self._needs_format or self._removed:
+            self.formatting()
+
+    def _rollback(self, saved_list: List[Node], saved_len: int, saved_format: bool):
+        """按撤销记录逆序恢复,事务中node_list只追加,截断即可恢复"""
+        for entry in reversed(self._journal):
+            kind, node = entry[0], entry[1]
+            if kind == "value":
+                node.value = entry[2]
+                node.cache = None
+            elif kind == "attach":
+                if node.parent is not None:
+                    node.parent.children.remove(node)
+            elif kind == "unlink":
+                node.parent.children.insert(entry[2], node)
+        self.node_list = saved_list[:saved_len]
+        self._removed.clear()
+        self._needs_format = saved_format
+        self._reindex()
+
+    def _reindex(self):
+        """由node_list重建键路径索引和同名节点列表"""
+        self._index = {}
+        self._by_name = {}
+        for node in self.node_list:
+            self._index[self.get_node_key(node)] = node
+            self._by_name.setdefault(node.name, []).append(node)
+
+    def update(self, values: Dict[str, str]):
+        """在一个事务中批量添加或修改节点 {键路径: 值}"""
+        with self.batch():
+            for key, value in values.items():
+                self.add_node(key, value)
+
+    def delete(self, keys: List[str]):
+        """在一个事务中批量删除节点及其子节点"""
+        with self.batch():
+            for key in keys:
+                self.delete_node(key)
 
     def read(self, key: str) -> str:
         """读取指定节点的值"""
         node = self.find_node_by_key(key)
         return node.value if node else ""
 
+    def _read_typed(self, key: str, kind: str, default: Any) -> Any:
+        node = self.find_node_by_key(key)
+        if node is None:
+            if default is not None:
+                return default
+            raise KeyError(f"未找到节点: {key}")
+        return node.converted(kind)
+
+    def read_float(self, key: str, default: float = None) -> float:
+        """读取浮点数,节点不存在且未给出default时抛出KeyError"""
+        return self._read_typed(key, "float", default)
+
+    def read_int(self, key: str, default: int = None) -> int:
+        """读取整数"""
+        return self._read_typed(key, "int", default)
+
+    def read_bool(self, key: str, default: bool = None) -> bool:
+        """读取布尔值(true/false, yes/no, on/off, 1/0)"""
+        return self._read_typed(key, "bool", default)
+
+    def read_array(self, key: str, default: np.ndarray = None) -> np.ndarray:
+        """
+        读取"-  "列表或单行数值为只读numpy数组,转换结果缓存在节点上,
+        步进循环中反复读取同一张表时只在第一次或修改后解析
+        """
+        return self._read_typed(key, "array", default)
+
     def find_node_by_key(self, key: str) -> Optional[Node]:
         """
-        通过键路径查找节点
+        通过键路径查找节点: 返回node_list中最靠后的、自身及父级名称依次与key末尾部分匹配的节点,
+        key可以是完整路径,也可以是路径的后缀
         :param key: 点分隔的键路径 (e.g., "parent.child.grandchild")
         :return: 找到的节点或None
         """
         keys = key.split('.')
-        for node in reversed(self.node_list):  # 从后向前搜索
-            if node.name == keys[-1]:
-                # 检查父级匹配
-                temp = node
-                match_count = 1
-                for key_part in reversed(keys[:-1]):
-                    if temp.parent and temp.parent.name == key_part:
-                        match_count += 1
-                        temp = temp.parent
-                    else:
-                        break
-                if match_count == len(keys):
-                    return node
+        candidates = self._by_name.get(keys[-1], ())
+        # 完整路径命中且是最后一个同名节点时,它就是后缀匹配的结果;
+        # 否则(如根节点b3之后还有x.b3)按后缀匹配查找,结果与逐个比较node_list相同
+        node = self._index.get(key)
+        if node is not None and candidates and candidates[-1] is node:
+            return node
+        for node in reversed(candidates):
+            if self._match_suffix(node, keys):
+                return node
         return None
 
+    @staticmethod
+    def _match_suffix(node: 'YML.Node', keys: List[str]) -> bool:
+        """节点及其祖先的名称是否依次与keys的末尾部分相同"""
+        temp = node
+        for key_part in reversed(keys[:-1]):
+            temp = temp.parent
+            if temp is None or temp.name != key_part:
+                return False
+        return True
+
+    def _attach(self, node: 'YML.Node'):
+        """把新节点加入node_list、父节点的子节点列表和索引"""
+        self.node_list.append(node)
+        if node.parent is not None:
+            node.parent.children.append(node)
+        if self._journal is not None:
+            self._journal.append(("attach", node))
+        self._needs_format = True
+        self._index[self.get_node_key(node)] = node
+        self._by_name.setdefault(node.name, []).append(node)
+
+    def _detach(self, node: 'YML.Node'):
+        """把节点从索引中移除(不修改node_list)"""
+        key = self.get_node_key(node)
+        if self._index.get(key) is node:
+            del self._index[key]
+        same_name = self._by_name.get(node.name)
+        if same_name:
+            same_name.remove(node)
+            if not same_name:
+                del self._by_name[node.name]
+
     def check_node_exists(self, key: str) -> bool:
         """检查节点是否存在"""
         return self.find_node_by_key(key) is not None
 
     def get_node_key(self, node: Node) -> str:
         """获取节点的完整键路径"""
-        if not node.parent:
-            return node.name
-        return f"{self.get_node_key(node.parent)}.{node.name}"
+        names = []
+        while node is not None:
+            names.append(node.name)
+            node = node.parent
+        return '.'.join(reversed(names))
 
     def add_node(self, key: str, value: str = None):
         """
@@ -253,39 +669,32 @@ class YML:
             return
             
         keys = key.split('.')
-        # 单节点情况
-        if len(keys) == 1:
-            self._add_child_node(None, keys[0], value)
-        else:
-            # 确保父路径存在
-            for i in range(1, len(keys)):
-                parent_key = '.'.join(keys[:i])
-                if not self.check_node_exists(parent_key):
-                    self._add_child_node('.'.join(keys[:i-1]), keys[i-1], None)
-                    
-            # 添加最终节点
-            parent_key = '.'.join(keys[:-1])
-            self._add_child_node(parent_key, keys[-1], value)
+        # 确保父路径存在
+        for i in range(1, len(keys)):
+            parent_key = '.'.join(keys[:i])
+            if not self.check_node_exists(parent_key):
+                self._add_child_node('.'.join(keys[:i-1]), keys[i-1], None)
+                
+        # 添加最终节点
+        self._add_child_node('.'.join(keys[:-1]), keys[-1], value)
 
     def _add_child_node(self, parent_key: Optional[str], name: str, value: str):
-        """添加子节点到指定父节点"""
+        """添加子节点到指定父节点,parent_key为None或空字符串时添加根节点"""
         # 根节点
-        if parent_key is None:
-            new_node = YML.Node(name=name, value=value, space=0)
-            self.node_list.append(new_node)
-        else:
-            parent_node = self.find_node_by_key(parent_key)
-            if parent_node:
-                print(f"添加子节点: {name} 到父节点: {parent_node.name}")
-            else:
-                new_node = YML.Node(
-                    name=name,
-                    value=value,
-                    parent=parent_node,
-                    space=parent_node.space + 2,
-                    tier=parent_node.tier + 1
-                )
-                self.node_list.append(new_node)
+        if not parent_key:
+            self._attach(YML.Node(name=name, value=value, space=0))
+            return
+        parent_node = self.find_node_by_key(parent_key)
+        if parent_node is None:
+            logger.error(f"未找到父节点: {parent_key}")
+            return
+        self._attach(YML.Node(
+            name=name,
+            value=value,
+            parent=parent_node,
+            space=parent_node.space + 2,
+            tier=parent_node.tier + 1
+        ))
 
     def delete_node(self, key: str):
         """删除节点及其所有子节点"""
@@ -294,22 +703,32 @@ class YML:
             logger.warning(f"未找到要删除的节点: {key}")
             return
             
-        nodes_to_remove = []
+        nodes_to_remove = [node_to_delete]
         self._find_all_children(node_to_delete, nodes_to_remove)
         
-        # 移除节点
+        # 从父节点和索引中移除,node_list在formatting时统一去掉
+        parent = node_to_delete.parent
+        if parent is not None:
+            pos = parent.children.index(node_to_delete)
+            del parent.children[pos]
+            if self._journal is not None:
+                self._journal.append(("unlink", node_to_delete, pos))
+        elif self._journal is not None:
+            self._journal.append(("unlink_root", node_to_delete))
         for node in nodes_to_remove:
-            if node in self.node_list:
-                self.node_list.remove(node)
-                
-        self.formatting()
+            self._detach(node)
+        self._removed.add(node_to_delete)
+        
+        if not self._batch_depth:
+            self.formatting()
 
     def _find_all_children(self, parent: Node, nodes: List[Node]):
-        """递归查找所有子节点"""
-        children = [node for node in self.node_list if node.parent == parent]
-        for child in children:
+        """查找所有子孙节点(深度优先,非递归)"""
+        stack = list(reversed(parent.children))
+        while stack:
+            child = stack.pop()
             nodes.append(child)
-            self._find_all_children(child, nodes)
+            stack.extend(reversed(child.children))
 
     def find_children(self, key: str) -> List[Node]:
         """查找指定节点的直接子节点"""
@@ -318,7 +737,7 @@ class YML:
             logger.error(f"未找到父节点: {key}")
             return []
             
-        return [node for node in self.node_list if node.parent == parent]
+        return list(parent.children)
 
     def save(self, save_path: str = None, format_output: bool = True):
         """保存YAML到文件"""
@@ -326,67 +745,286 @@ class YML:
         if not path:
             logger.error("未指定保存路径")
             return
+        if self.readonly:
+            logger.error(f"只读加载的YML不能保存: {path}")
+            return
             
         # 确保目录存在
         os.makedirs(os.path.dirname(path), exist_ok=True)
         
-        # 格式化节点
-        if format_output:
+        # 格式化节点(节点结构未变化时跳过)
+        if format_output and (self._needs_format or self._removed):
             self.formatting()
             
         # 写入文件
         with open(path, 'w', encoding='utf-8') as f:
-            for node in self.node_list:
-                indent = '  ' * node.tier
-                line = f"{indent}{node.name}:"
-                if node.value:
-                    # 多行值处理
-                    if '\n' in node.value:
-                        lines = node.value.split('\n')
-                        f.write(f"{line}\n")
-                        for sub_line in lines:
-                            f.write(f"{indent}  - {sub_line.strip()}\n")
-                    else:
-                        f.write(f"{line} {node.value}\n")
-                else:
-                    f.write(f"{line}\n")
+            f.write(self.dumps(format_output=False))
+
+    def dumps(self, format_output: bool = True) -> str:
+        """返回save()写出的文件内容"""
+        if format_output and (self._needs_format or self._removed):
+            self.formatting()
+        node_text = self._node_text
+        return ''.join([node_text(node.name, node.value, node.tier) for node in self.node_list])
+
+    @staticmethod
+    def _node_text(name: str, value: Optional[str], tier: int) -> str:
+        """单个节点在文件中的文本(含换行)"""
+        indent = '  ' * tier
+        line = f"{indent}{name}:"
+        if not value:
+            return f"{line}\n"
+        if '\n' not in value:
+            return f"{line} {value}\n"
+        # 多行值处理: 列表项本身已带"-  "前缀,按原样写回
+        items = [item.strip() for item in value.split('\n')]
+        return f"{line}\n" + ''.join(
+            f"{indent}  {item if _LIST_ITEM.match(item) else '-  ' + item}\n" for item in items)
 
     def formatting(self):
         """重新格式化节点列表（按层级排序）"""
-        # 查找根节点
-        root_nodes = [node for node in self.node_list if node.parent is None]
+        # 查找根节点(跳过已删除的根节点,已删除节点的子孙不会被收集)
+        removed = self._removed
+        root_nodes = [node for node in self.node_list if node.parent is None and node not in removed]
         
-        # 递归添加子节点
+        # 按子节点列表深度优先添加
         formatted_nodes = []
         for node in root_nodes:
+            node.tier = 0
             formatted_nodes.append(node)
             self._collect_children(node, formatted_nodes)
             
         self.node_list = formatted_nodes
+        # 同名节点列表按新的顺序重建
+        by_name: Dict[str, List[YML.Node]] = {}
+        for node in formatted_nodes:
+            by_name.setdefault(node.name, []).append(node)
+        self._by_name = by_name
+        self._removed = set()
+        self._needs_format = False
 
     def _collect_children(self, parent: Node, nodes: List[Node]):
-        """递归收集子节点"""
-        children = [node for node in self.node_list if node.parent == parent]
-        for child in children:
-            child.tier = parent.tier + 1
+        """收集子节点并更新层级(深度优先,非递归)"""
+        stack = list(reversed(parent.children))
+        while stack:
+            child = stack.pop()
+            child.tier = child.parent.tier + 1
             nodes.append(child)
-            self._collect_children(child, nodes)
+            stack.extend(reversed(child.children))
 
     @staticmethod
     def _find_pre_space(line: str) -> int:
         """计算行首空格数"""
         return len(line) - len(line.lstrip())
 
-    def _find_parent(self, space: int) -> Optional[Node]:
-        """根据缩进查找父节点"""
-        if not self.node_list:
+class YMLVariant:
+    """
+    YML文档的写时复制变体,只保存相对基准文档的覆盖值:
+    overrides为基准中已有键的新值,added为新增的键,deleted为删除的子树,键均为完整路径.
+    未修改的键直接读取基准文档,因此创建变体后不应再修改基准文档的结构.
+    需要完整文档时用materialize()生成,save()写出变体后的文件
+    """
+
+    def __init__(self, base: YML, overrides: Dict[str, str] = None,
+                 added: Dict[str, str] = None, deleted: set = None):
+        self.base = base
+        self.path = base.path
+        self.overrides: Dict[str, str] = dict(overrides or {})
+        self.added: Dict[str, str] = dict(added or {})
+        self.deleted: set = set(deleted or ())
+
+    def variant(self) -> 'YMLVariant':
+        """基于当前变体再派生一个变体(仍共享同一基准文档)"""
+        return YMLVariant(self.base, self.overrides, self.added, self.deleted)
+
+    def _is_deleted(self, key: str) -> bool:
+        """键或其任一上级是否已删除"""
+        if not self.deleted:
+            return False
+        parts = key.split('.')
+        return any('.'.join(parts[:i]) in self.deleted for i in range(1, len(parts) + 1))
+
+    def _resolve(self, key: str) -> Optional[str]:
+        """将键解析为完整路径,不存在或已删除时返回None"""
+        if key in self.added:
+            return key
+        node = self.base.find_node_by_key(key)
+        if node is None:
             return None
-            
-        # 反向查找最近的缩进较小的节点
-        for node in reversed(self.node_list):
-            if node.space < space:
-                return node
-        return None
+        full = self.base.get_node_key(node)
+        return None if self._is_deleted(full) else full
+
+    def read(self, key: str) -> str:
+        """读取指定节点的值"""
+        full = self._resolve(key)
+        if full is None:
+            return ""
+        if full in self.added:
+            return self.added[full]
+        if full in self.overrides:
+            return self.overrides[full]
+        return self.base.find_node_by_key(full).value
+
+    def check_node_exists(self, key: str) -> bool:
+        """检查节点是否存在"""
+        return self._resolve(key) is not None
+
+    def _read_typed(self, key: str, kind: str, default: Any) -> Any:
+        full = self._resolve(key)
+        if full is None:
+            if default is not None:
+                return default
+            raise KeyError(f"未找到节点: {key}")
+        if full in self.added:
+            return CONVERTERS[kind](self.added[full])
+        if full in self.overrides:
+            return CONVERTERS[kind](self.overrides[full])
+        # 未修改的键使用基准文档节点上的缓存
+        return self.base.find_node_by_key(full).converted(kind)
+
+    read_float = YML.read_float
+    read_int = YML.read_int
+    read_bool = YML.read_bool
+    read_array = YML.read_array
+
+    def modify(self, key: str, value: str):
+        """修改指定节点的值"""
+        full = self._resolve(key)
+        if full is None:
+            return
+        if full in self.added:
+            self.added[full] = value
+        else:
+            self.overrides[full] = value
+
+    def add_node(self, key: str, value: str = None):
+        """添加新节点,已存在则修改;缺少的上级节点在materialize时自动创建"""
+        if self.check_node_exists(key):
+            self.modify(key, value)
+        else:
+            self.added[key] = value
+
+    def delete_node(self, key: str):
+        """删除节点及其所有子节点"""
+        full = self._resolve(key)
+        if full is None:
+            logger.warning(f"未找到要删除的节点: {key}")
+            return
+        prefix = full + '.'
+        for table in (self.overrides, self.added):
+            for k in [k for k in table if k == full or k.startswith(prefix)]:
+                del table[k]
+        if self.base.find_node_by_key(full) is not None:
+            self.deleted.add(full)
+
+    def update(self, values: Dict[str, str]):
+        """批量添加或修改节点 {键路径: 值}"""
+        for key, value in values.items():
+            self.add_node(key, value)
+
+    def delete(self, keys: List[str]):
+        """批量删除节点及其子节点"""
+        for key in keys:
+            self.delete_node(key)
+
+    def materialize(self, stamp: bool = True) -> YML:
+        """
+        生成应用了全部修改的独立YML文档
+        :param stamp: 更新修改时间节点;为False时相同的修改总是得到相同的文件内容
+        """
+        doc = self.base.clone()
+        with doc.batch(stamp):
+            for key in self.deleted:
+                doc.delete_node(key)
+            for key, value in self.overrides.items():
+                doc.modify(key, value)
+            for key, value in self.added.items():
+                doc.add_node(key, value)
+        return doc
+
+    def save(self, save_path: str = None, format_output: bool = True):
+        """保存变体到文件"""
+        self.materialize().save(save_path or self.path, format_output)
+
+    def __len__(self) -> int:
+        """修改的键数"""
+        return len(self.overrides) + len(self.added) + len(self.deleted)
+
+    def __repr__(self) -> str:
+        return (f"<YMLVariant of {self.base.path!r}: {len(self.overrides)} modified, "
+                f"{len(self.added)} added, {len(self.deleted)} deleted>")
+
+
+class YMLTemplate:
+    """
+    YML文档的渲染模板: 预先生成基准文档每个节点的文本片段,
+    只修改已有键的值时,渲染只需替换对应片段后拼接,不再拷贝节点树、格式化;
+    包含新增或删除的键时退回到YMLVariant.materialize.
+    渲染结果不更新修改时间节点,相同的值总是得到相同的文件内容.
+    与YMLVariant相同,创建模板后不应再修改基准文档
+    """
+
+    def __init__(self, base: YML):
+        self.base = base
+        if base._needs_format or base._removed:
+            base.formatting()
+        self.nodes = list(base.node_list)
+        self.blocks = [YML._node_text(node.name, node.value, node.tier) for node in self.nodes]
+        self._position = {node: i for i, node in enumerate(self.nodes)}
+        # 键 -> 片段位置(不存在的键为None)
+        self._slots: Dict[str, Optional[int]] = {}
+
+    def slot(self, key: str) -> Optional[int]:
+        """键对应的片段位置,键不存在时返回None"""
+        try:
+            return self._slots[key]
+        except KeyError:
+            node = self.base.find_node_by_key(key)
+            position = self._slots[key] = None if node is None else self._position[node]
+            return position
+
+    def changes(self, values: Dict[str, str]) -> Optional[List[Tuple[int, str]]]:
+        """
+        与基准文档不同的片段
+        :param values: {键路径: 值},键可以只给出末尾几级
+        :return: [(片段位置, 新文本)]按位置排序;包含基准文档中不存在的键时返回None
+        """
+        changed = {}
+        for key, value in values.items():
+            position = self.slot(key)
+            if position is None:
+                return None
+            node = self.nodes[position]
+            text = YML._node_text(node.name, value, node.tier)
+            if text == self.blocks[position]:
+                changed.pop(position, None)
+            else:
+                changed[position] = text
+        return sorted(changed.items())
+
+    def join(self, changes: List[Tuple[int, str]]) -> str:
+        """由changes()的结果拼接文件内容"""
+        if not changes:
+            return ''.join(self.blocks)
+        blocks = self.blocks.copy()
+        for position, text in changes:
+            blocks[position] = text
+        return ''.join(blocks)
+
+    def render(self, values: Dict[str, str]) -> str:
+        """渲染修改后的文件内容,包含新增的键时退回到YMLVariant.materialize"""
+        changes = self.changes(values)
+        if changes is None:
+            variant = self.base.variant()
+            variant.update(values)
+            return variant.materialize(stamp=False).dumps()
+        return self.join(changes)
+
+    def save(self, values: Dict[str, str], path: str):
+        """渲染并写出文件"""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.render(values))
+
 
 # 示例用法
 if __name__ == "__main__":
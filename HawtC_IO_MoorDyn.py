@@ -0,0 +1,239 @@
+import hashlib
+import os
+import pickle
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from HawtC_IO import cache_dir
+
+# 内存中最多缓存的解析结果数
+MEMORY_CACHE_SIZE = 256
+_MEMORY_CACHE: "OrderedDict[str, MoorDyn]" = OrderedDict()
+
+# 表格型段落的列定义(列顺序与文件一致)
+TABLE_SCHEMAS = {
+    "LINE DICTIONARY": [
+        ("LineType", "U32"), ("Diam", "f8"), ("MassDenInAir", "f8"), ("EA", "f8"), ("BA", "f8"),
+        ("Can", "f8"), ("Cat", "f8"), ("Cdn", "f8"), ("Cdt", "f8"),
+    ],
+    "NODE PROPERTIES": [
+        ("Node", "i8"), ("Type", "U16"), ("X", "f8"), ("Y", "f8"), ("Z", "f8"), ("M", "f8"), ("V", "f8"),
+        ("FX", "f8"), ("FY", "f8"), ("FZ", "f8"), ("CdA", "f8"), ("CA", "f8"),
+    ],
+    "LINE PROPERTIES": [
+        ("Line", "i8"), ("LineType", "U32"), ("UnstrLen", "f8"), ("NumSegs", "i8"),
+        ("NodeAnch", "i8"), ("NodeFair", "i8"), ("Flags", "U64"),
+    ],
+}
+# 段落名 -> 属性名
+TABLE_ATTRS = {
+    "LINE DICTIONARY": "line_types",
+    "NODE PROPERTIES": "nodes",
+    "LINE PROPERTIES": "lines",
+}
+
+_DIVIDER = re.compile(r"^\s*-{3,}\s*(.*?)\s*-*\s*$")
+
+
+def _format_value(value) -> str:
+    """格式化表格中的值,浮点数使用repr保证读回后数值不变"""
+    if isinstance(value, (float, np.floating)):
+        return repr(float(value))
+    return str(value)
+
+
+class MoorDyn:
+    """
+    MoorDyn输入文件(如Mooring/lines.txt)的结构化表示:
+    line_types/nodes/lines 为numpy结构化数组,options为求解器选项,outputs为输出通道列表.
+    可通过to_text()写回文本,解析结果按内容摘要缓存
+    """
+
+    def __init__(self):
+        self.title = ""
+        self.line_types: np.ndarray = np.zeros(0, dtype=TABLE_SCHEMAS["LINE DICTIONARY"])
+        self.nodes: np.ndarray = np.zeros(0, dtype=TABLE_SCHEMAS["NODE PROPERTIES"])
+        self.lines: np.ndarray = np.zeros(0, dtype=TABLE_SCHEMAS["LINE PROPERTIES"])
+        # 选项名 -> 值(数值选项为float),以及选项说明
+        self.options: "OrderedDict[str, object]" = OrderedDict()
+        self.option_notes: Dict[str, str] = {}
+        self.outputs: List[str] = []
+        # 段落顺序: (段落名, 分隔行原文)
+        self.sections: List[Tuple[str, str]] = []
+        # 表格段落的表头与单位行原文
+        self.table_headers: Dict[str, Tuple[str, str]] = {}
+        # 未识别段落的原始行
+        self.raw_sections: Dict[str, List[str]] = {}
+
+    # ------------------------------------------------------------------ 解析
+    @classmethod
+    def parse(cls, text: str) -> 'MoorDyn':
+        """解析MoorDyn输入文件文本"""
+        doc = cls()
+        lines = text.splitlines()
+        if not lines:
+            return doc
+        doc.title = lines[0]
+        current = None
+        body: List[str] = []
+        for line in lines[1:]:
+            match = _DIVIDER.match(line)
+            if match:
+                if current is not None:
+                    doc._parse_section(current, body)
+                current = match.group(1).strip().upper()
+                doc.sections.append((current, line))
+                body = []
+            elif current is not None:
+                body.append(line)
+        if current is not None:
+            doc._parse_section(current, body)
+        return doc
+
+    def _parse_section(self, name: str, body: List[str]):
+        key = self._section_key(name)
+        if key in TABLE_SCHEMAS:
+            schema = TABLE_SCHEMAS[key]
+            header, units, *rows = body + [""] * max(0, 2 - len(body))
+            self.table_headers[key] = (header, units)
+            records = []
+            for row in rows:
+                fields = row.split()
+                if not fields:
+                    continue
+                if len(fields) < len(schema):
+                    raise ValueError(f"{key}段数据列数不足: {row}")
+                # 最后一列之后的内容并入最后一列(如Flags/Outputs)
+                fields = fields[:len(schema) - 1] + [" ".join(fields[len(schema) - 1:])]
+                records.append(tuple(fields))
+            table = np.array(records, dtype=[(n, "U64") for n, _ in schema]) if records else \
+                np.zeros(0, dtype=[(n, "U64") for n, _ in schema])
+            setattr(self, TABLE_ATTRS[key], table.astype(schema))
+        elif key == "SOLVER OPTIONS":
+            for row in body:
+                fields = row.split(None, 2)
+                if len(fields) < 2:
+                    continue
+                value, option = fields[0], fields[1]
+                try:
+                    self.options[option] = float(value)
+                except ValueError:
+                    self.options[option] = value
+                self.option_notes[option] = fields[2] if len(fields) > 2 else ""
+        elif key == "OUTPUTS":
+            self.outputs = [row.strip() for row in body if row.strip()]
+        else:
+            self.raw_sections[key] = body
+
+    @staticmethod
+    def _section_key(name: str) -> str:
+        """统一段落名(去掉多余空格),如"SOLVER OPTIONS-----"->"SOLVER OPTIONS" """
+        return re.sub(r"\s+", " ", name.replace("-", " ")).strip()
+
+    # ------------------------------------------------------------------ 写回
+    def _format_table(self, key: str) -> List[str]:
+        table = getattr(self, TABLE_ATTRS[key])
+        header, units = self.table_headers.get(key, ("  ".join(table.dtype.names), ""))
+        rows = [[_format_value(v) for v in record] for record in table.tolist()]
+        widths = [max([len(n) + 2] + [len(r[i]) + 2 for r in rows]) for i, n in enumerate(table.dtype.names)]
+        return [header, units] + ["".join(v.ljust(w) for v, w in zip(r, widths)).rstrip() for r in rows]
+
+    def to_text(self) -> str:
+        """写回MoorDyn输入文件文本"""
+        out = [self.title]
+        for name, divider in self.sections:
+            out.append(divider)
+            key = self._section_key(name)
+            if key in TABLE_SCHEMAS:
+                out.extend(self._format_table(key))
+            elif key == "SOLVER OPTIONS":
+                for option, value in self.options.items():
+                    # 整数值的选项按整数写出,如WtrDpth 320
+                    text = str(int(value)) if isinstance(value, float) and value.is_integer() \
+                        else _format_value(value)
+                    note = self.option_notes.get(option, "")
+                    out.append(f"{text:<8} {option:<12} {note}".rstrip())
+            elif key == "OUTPUTS":
+                out.extend(self.outputs)
+            else:
+                out.extend(self.raw_sections.get(key, []))
+        return "\n".join(out) + "\n"
+
+    def save(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_text())
+
+    def copy(self) -> 'MoorDyn':
+        """拷贝(数组各自独立),供参数扫描时修改"""
+        new = MoorDyn()
+        new.title = self.title
+        new.line_types = self.line_types.copy()
+        new.nodes = self.nodes.copy()
+        new.lines = self.lines.copy()
+        new.options = OrderedDict(self.options)
+        new.option_notes = dict(self.option_notes)
+        new.outputs = list(self.outputs)
+        new.sections = list(self.sections)
+        new.table_headers = dict(self.table_headers)
+        new.raw_sections = {k: list(v) for k, v in self.raw_sections.items()}
+        return new
+
+    # ------------------------------------------------------------------ 查询
+    def line_type(self, name: str) -> np.void:
+        """按名称查找缆绳类型"""
+        idx = np.flatnonzero(self.line_types["LineType"] == name)
+        if not len(idx):
+            raise KeyError(f"未定义的缆绳类型: {name}")
+        return self.line_types[idx[0]]
+
+    def node(self, number: int) -> np.void:
+        """按编号查找节点"""
+        idx = np.flatnonzero(self.nodes["Node"] == number)
+        if not len(idx):
+            raise KeyError(f"未定义的节点: {number}")
+        return self.nodes[idx[0]]
+
+    def __repr__(self) -> str:
+        return (f"<MoorDyn line_types={len(self.line_types)} nodes={len(self.nodes)} "
+                f"lines={len(self.lines)} outputs={len(self.outputs)}>")
+
+
+def load_moordyn(path: str, cache: bool = True) -> MoorDyn:
+    """
+    读取MoorDyn输入文件,解析结果按文件内容摘要缓存在内存和HawtC_IO.CACHE_DIR中,
+    每次返回独立的拷贝,修改不会影响缓存
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if not cache:
+        return MoorDyn.parse(raw.decode('utf-8'))
+
+    key = hashlib.blake2b(raw, digest_size=16).hexdigest()
+    doc = _MEMORY_CACHE.get(key)
+    if doc is not None:
+        _MEMORY_CACHE.move_to_end(key)
+        return doc.copy()
+
+    try:
+        # 目录不安全时抛出PermissionError,只解析不使用磁盘缓存
+        cache_path = os.path.join(cache_dir("moordyn"), key + ".pkl")
+        with open(cache_path, 'rb') as f:
+            doc = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        doc = MoorDyn.parse(raw.decode('utf-8'))
+        try:
+            cache_path = os.path.join(cache_dir("moordyn"), key + ".pkl")
+            tmp_path = f"{cache_path}.tmp{os.getpid()}"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(doc, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+
+    _MEMORY_CACHE[key] = doc
+    if len(_MEMORY_CACHE) > MEMORY_CACHE_SIZE:
+        _MEMORY_CACHE.popitem(last=False)
+    return doc.copy()
@@ -0,0 +1,333 @@
+import hashlib
+import io
+import json
+import logging
+import mmap
+import os
+import shutil
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger('HawtC_IO_Out')
+
+# 默认每块解析的字节数,决定流式读取时的内存上限
+CHUNK_SIZE = 8 * 1024 * 1024
+
+# 二进制列存缓存目录的后缀及版本
+CACHE_SUFFIX = ".cache"
+CACHE_VERSION = 1
+
+# 时间索引文件后缀,以及每隔多少行记录一个(时间, 字节偏移)
+INDEX_SUFFIX = ".idx.npz"
+INDEX_STRIDE = 256
+
+
+def file_hash(path: str) -> str:
+    """计算文件内容的blake2b摘要"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class OUT:
+    """
+    MoorDyn风格的.out文本结果文件读取(如Mooring/Lines.out):
+    第一行为通道名,第二行为单位,其后每行一个时刻,列之间以制表符/空格分隔.
+    文件主体通过内存映射分块解析,内存占用只与块大小和所选通道有关
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            name_line = f.readline()
+            unit_line = f.readline()
+            # 数据区起始字节位置
+            self.body_offset = f.tell()
+        self.channels: List[str] = name_line.decode('utf-8', errors='replace').split()
+        units = unit_line.decode('utf-8', errors='replace').split()
+        if len(units) != len(self.channels):
+            raise ValueError(f"{path}: 通道名({len(self.channels)}个)与单位({len(units)}个)数量不一致")
+        self.units: Dict[str, str] = dict(zip(self.channels, units))
+        self.size = os.path.getsize(path)
+
+    def columns(self, channels: Optional[Sequence[str]] = None) -> List[int]:
+        """将通道名转换为列号,None表示全部通道"""
+        if channels is None:
+            return list(range(len(self.channels)))
+        missing = [ch for ch in channels if ch not in self.units]
+        if missing:
+            raise KeyError(f"{self.path}中不存在通道: {', '.join(missing)}")
+        return [self.channels.index(ch) for ch in channels]
+
+    def _parse(self, data: bytes, usecols: List[int], dtype) -> np.ndarray:
+        """解析若干完整数据行"""
+        if not data.strip():
+            return np.empty((0, len(usecols)), dtype=dtype)
+        return np.loadtxt(io.BytesIO(data), dtype=dtype, usecols=usecols, ndmin=2)
+
+    def _chunks(self, start: int, stop: Optional[int] = None,
+                chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """按行边界切分[start, stop)区间,逐块返回字节串"""
+        stop = self.size if stop is None else min(stop, self.size)
+        if start >= stop:
+            return
+        with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = start
+            while pos < stop:
+                end = min(pos + chunk_size, stop)
+                if end < stop:
+                    newline = mm.rfind(b'\n', pos, end)
+                    if newline == -1:  # 单行超过块大小
+                        newline = mm.find(b'\n', end, stop)
+                    end = stop if newline == -1 else newline + 1
+                yield mm[pos:end]
+                pos = end
+
+    @property
+    def time_channel(self) -> str:
+        """时间通道名,没有名为Time的通道时取第一列"""
+        return "Time" if "Time" in self.units else self.channels[0]
+
+    def iter_blocks(self, channels: Optional[Sequence[str]] = None, dtype=np.float64,
+                    chunk_size: int = CHUNK_SIZE) -> Iterator[np.ndarray]:
+        """
+        生成器模式: 逐块产出(行数, 所选通道数)的数组
+        :param channels: 只读取这些通道(按给定顺序),None为全部
+        :param dtype: np.float64或np.float32
+        """
+        usecols = self.columns(channels)
+        for data in self._chunks(self.body_offset, chunk_size=chunk_size):
+            block = self._parse(data, usecols, dtype)
+            if len(block):
+                yield block
+
+    def read(self, channels: Optional[Sequence[str]] = None, dtype=np.float64,
+             chunk_size: int = CHUNK_SIZE) -> Dict[str, np.ndarray]:
+        """
+        读取整个文件
+        :return: 通道名 -> 一维连续数组
+        """
+        names = list(self.channels) if channels is None else list(channels)
+        blocks = list(self.iter_blocks(names, dtype, chunk_size))
+        if blocks:
+            table = np.concatenate(blocks)
+        else:
+            table = np.empty((0, len(names)), dtype=dtype)
+        return {name: np.ascontiguousarray(table[:, i]) for i, name in enumerate(names)}
+
+    @property
+    def index_path(self) -> str:
+        return self.path + INDEX_SUFFIX
+
+    def _save_index(self, times: np.ndarray, offsets: np.ndarray):
+        stat = os.stat(self.path)
+        tmp_path = f"{self.index_path}.tmp{os.getpid()}.npz"
+        try:
+            np.savez(tmp_path, time=times, offset=offsets,
+                     stamp=np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64))
+            os.replace(tmp_path, self.index_path)
+        except OSError as exc:
+            logger.warning(f"无法写入时间索引{self.index_path}: {exc}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def _load_index(self):
+        """读取时间索引,文件大小或修改时间变化后视为失效"""
+        try:
+            with np.load(self.index_path) as idx:
+                stamp = idx["stamp"]
+                stat = os.stat(self.path)
+                if stamp[0] != stat.st_size or stamp[1] != stat.st_mtime_ns:
+                    return None
+                return idx["time"], idx["offset"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def build_index(self, chunk_size: int = CHUNK_SIZE):
+        """
+        只解析时间列扫描一遍文件,建立时间索引: 每隔INDEX_STRIDE行记录一个(时间, 字节偏移)
+        索引文件只是缓存,写入失败(如结果目录只读)时仍返回内存中的索引
+        :return: (times, offsets);有无法与行对应的内容时为两个空数组,read_window退化为全文件解析
+        """
+        time_col = [self.channels.index(self.time_channel)]
+        index_times, index_offsets = [], []
+        row = 0
+        pos = self.body_offset
+        for data in self._chunks(self.body_offset, chunk_size=chunk_size):
+            block = self._parse(data, time_col, np.float64)
+            starts = _line_starts(data)
+            if len(starts) != len(block):
+                index_times, index_offsets = [], []
+                break
+            # 本块中行号为INDEX_STRIDE整数倍的行
+            take = np.arange((-row) % INDEX_STRIDE, len(block), INDEX_STRIDE)
+            index_times.append(block[take, 0])
+            index_offsets.append(starts[take] + pos)
+            row += len(block)
+            pos += len(data)
+        times = np.concatenate(index_times) if index_times else np.empty(0)
+        offsets = np.concatenate(index_offsets).astype(np.int64) if index_offsets else np.empty(0, np.int64)
+        self._save_index(times, offsets)
+        return times, offsets
+
+    def read_window(self, t0: float, t1: float, channels: Optional[Sequence[str]] = None,
+                    dtype=np.float64) -> Dict[str, np.ndarray]:
+        """
+        读取时间窗口[t0, t1]内的数据
+        已有有效的二进制缓存时直接切片; 否则按稀疏时间索引定位字节偏移,只解析覆盖窗口的行.
+        索引记录的是实际时间值,适用于非等间隔的时间序列
+        """
+        names = list(self.channels) if channels is None else list(channels)
+        if os.path.isdir(self.cache_dir) and self._cache_meta() is not None:
+            data = self.load(names + [self.time_channel], dtype)
+            time = data[self.time_channel]
+            lo, hi = np.searchsorted(time, t0, 'left'), np.searchsorted(time, t1, 'right')
+            return {name: data[name][lo:hi] for name in names}
+
+        index = self._load_index()
+        times, offsets = index if index is not None else self.build_index()
+        i = max(int(np.searchsorted(times, t0, 'right')) - 1, 0)
+        j = int(np.searchsorted(times, t1, 'right'))
+        start = int(offsets[i]) if len(offsets) else self.body_offset
+        stop = int(offsets[j]) if j < len(offsets) else self.size
+
+        usecols = self.columns(names)
+        time_col = self.channels.index(self.time_channel)
+        parse_cols = usecols + [time_col]
+        blocks = [self._parse(data, parse_cols, dtype) for data in self._chunks(start, stop)]
+        table = np.concatenate(blocks) if blocks else np.empty((0, len(parse_cols)), dtype=dtype)
+        time = table[:, -1]
+        table = table[(time >= t0) & (time <= t1)]
+        return {name: np.ascontiguousarray(table[:, k]) for k, name in enumerate(names)}
+
+    @property
+    def cache_dir(self) -> str:
+        """二进制列存缓存目录,与.out文件放在一起"""
+        return self.path + CACHE_SUFFIX
+
+    def _cache_meta(self) -> Optional[dict]:
+        """
+        读取并校验缓存元数据: 文件大小和修改时间一致即有效;
+        仅修改时间变化时(如复制/touch)再比较内容摘要
+        """
+        meta_path = os.path.join(self.cache_dir, "meta.json")
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get("version") != CACHE_VERSION or meta.get("size") != self.size:
+            return None
+        mtime_ns = os.stat(self.path).st_mtime_ns
+        if meta.get("mtime_ns") != mtime_ns:
+            if meta.get("hash") != file_hash(self.path):
+                return None
+            meta["mtime_ns"] = mtime_ns
+            try:
+                with open(meta_path, 'w', encoding='utf-8') as f:
+                    json.dump(meta, f, ensure_ascii=False)
+            except OSError:
+                pass
+        return meta
+
+    def _count_rows(self, chunk_size: int = CHUNK_SIZE) -> int:
+        """不解析数值,统计数据区的非空行数"""
+        return sum(len(_line_starts(data)) for data in self._chunks(self.body_offset, chunk_size=chunk_size))
+
+    def build_cache(self, chunk_size: int = CHUNK_SIZE) -> dict:
+        """
+        写出二进制列存缓存: 每个通道一个.npy连续数组,以及通道名、单位和时间列信息.
+        先统计行数创建各通道的.npy文件,再逐块解析写入,内存占用只与块大小有关;
+        先写入临时目录再整体替换,多个进程同时构建时互不干扰
+        """
+        stat = os.stat(self.path)
+        rows = self._count_rows(chunk_size)
+        meta = {
+            "version": CACHE_VERSION,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "hash": file_hash(self.path),
+            "channels": self.channels,
+            "units": self.units,
+            "files": [f"{i}.npy" for i in range(len(self.channels))],
+            "rows": rows,
+            "time_channel": self.time_channel if self.channels else None,
+        }
+        tmp_dir = f"{self.cache_dir}.tmp{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        try:
+            columns = [np.lib.format.open_memmap(os.path.join(tmp_dir, fname), mode='w+',
+                                                 dtype=np.float64, shape=(rows,))
+                       for fname in meta["files"]]
+            row = 0
+            for block in self.iter_blocks(chunk_size=chunk_size):
+                if row + len(block) > rows:
+                    raise ValueError(f"{self.path}: 解析得到的行数多于数据行数{rows}")
+                for column, values in zip(columns, block.T):
+                    column[row:row + len(block)] = values
+                row += len(block)
+            if row != rows:
+                raise ValueError(f"{self.path}: 解析得到{row}行,数据区有{rows}行")
+            for column in columns:
+                column.flush()
+            del columns
+            with open(os.path.join(tmp_dir, "meta.json"), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+            os.replace(tmp_dir, self.cache_dir)
+        except (OSError, ValueError):
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        return meta
+
+    def load(self, channels: Optional[Sequence[str]] = None, dtype=np.float64,
+             cache: bool = True) -> Dict[str, np.ndarray]:
+        """
+        读取通道数据,优先使用二进制列存缓存: 缓存有效时只内存映射所需通道,
+        不存在或已过期时解析文本并生成缓存
+        :return: 通道名 -> 一维数组(float64时为只读内存映射)
+        """
+        if not cache:
+            return self.read(channels, dtype)
+        names = list(self.channels) if channels is None else list(channels)
+        self.columns(names)
+        meta = self._cache_meta()
+        if meta is None:
+            try:
+                meta = self.build_cache()
+            except (OSError, ValueError) as exc:
+                logger.warning(f"无法写入缓存{self.cache_dir}: {exc}")
+                return self.read(names, dtype)
+        result = {}
+        for name in names:
+            fname = meta["files"][meta["channels"].index(name)]
+            arr = np.load(os.path.join(self.cache_dir, fname), mmap_mode='r')
+            result[name] = arr if arr.dtype == dtype else arr.astype(dtype)
+        return result
+
+    def __repr__(self) -> str:
+        return f"<OUT '{self.path}' channels={len(self.channels)}>"
+
+
+def _line_starts(data: bytes) -> np.ndarray:
+    """返回data中每个非空行的起始位置"""
+    buf = np.frombuffer(data, dtype=np.uint8)
+    starts = np.concatenate(([0], np.flatnonzero(buf == 10) + 1))
+    starts = starts[starts < len(buf)]
+    # 去掉空白行,使行号与解析得到的行一一对应
+    ends = np.append(starts[1:], len(buf))
+    visible = np.concatenate(([0], np.cumsum(buf > 32)))
+    blank = visible[ends] == visible[starts]
+    return starts[~blank]
+
+
+def read_out(path: str, channels: Optional[Sequence[str]] = None, dtype=np.float64,
+             cache: bool = True) -> Dict[str, np.ndarray]:
+    """读取.out文件的便捷函数,默认使用二进制列存缓存"""
+    return OUT(path).load(channels, dtype, cache)
@@ -0,0 +1,281 @@
+from typing import Dict, Sequence
+
+import numpy as np
+
+# 重力加速度与海水密度
+GRAVITY = 9.80665
+WATER_DENSITY = 1025.0
+
+
+def _catenary_residual(HF, VF, XF, ZF, L, EA, W):
+    """悬链线方程残差(ex, ez)及雅可比矩阵元素"""
+    WL = W * L
+    a = VF / HF
+    sa = np.sqrt(1.0 + a * a)
+    # 是否有部分缆绳躺在海床上
+    grounded = VF < WL
+    b = np.where(grounded, 0.0, (VF - WL) / HF)
+    sb = np.sqrt(1.0 + b * b)
+    asinh_a = np.arcsinh(a)
+    asinh_b = np.arcsinh(b)
+
+    x_sus = HF / W * (asinh_a - asinh_b) + HF * L / EA
+    z_sus = HF / W * (sa - sb) + (VF * L - 0.5 * W * L * L) / EA
+    x_bot = L - VF / W + HF / W * asinh_a + HF * L / EA
+    z_bot = HF / W * (sa - 1.0) + VF * VF / (2.0 * EA * W)
+    ex = np.where(grounded, x_bot, x_sus) - XF
+    ez = np.where(grounded, z_bot, z_sus) - ZF
+
+    sb = np.where(grounded, 1.0, sb)
+    dxdh = (asinh_a - a / sa - np.where(grounded, 0.0, asinh_b - b / sb)) / W + L / EA
+    dxdv = (1.0 / sa - 1.0 / sb) / W
+    dzdh = dxdv
+    dzdv = np.where(grounded, a / sa / W + VF / (EA * W), (a / sa - b / sb) / W + L / EA)
+    return ex, ez, dxdh, dxdv, dzdh, dzdv
+
+
+def catenary(XF, ZF, L, EA, W, tol: float = 1e-8, max_iter: int = 100):
+    """
+    向量化的准静态弹性悬链线求解(MoorDyn/MAP的Catenary方程,海床摩擦系数为0)
+    所有参数可为相同形状的数组,一次求解任意多根缆绳/任意多个偏移工况;
+    采用带回溯线搜索的牛顿迭代,每轮只计算尚未收敛的部分
+    :param XF: 导缆孔相对锚点的水平距离(m)
+    :param ZF: 导缆孔相对锚点的竖直高度(m)
+    :param L: 缆绳原长(m)
+    :param EA: 轴向刚度(N)
+    :param W: 单位长度水中重量(N/m)
+    :return: (HF, VF, HA, VA, LB) 导缆孔水平/竖直力、锚点水平/竖直力、卧底长度
+    """
+    arrays = np.broadcast_arrays(*[np.asarray(v, dtype=np.float64) for v in (XF, ZF, L, EA, W)])
+    shape = arrays[0].shape
+    XF, ZF, L, EA, W = [np.ravel(v).copy() for v in arrays]
+    XF = np.maximum(XF, 1e-6)
+
+    # 初值(Peyrot & Goulois)
+    lam = np.where(L <= np.hypot(XF, ZF), 0.2,
+                   np.sqrt(np.maximum(3.0 * ((L * L - ZF * ZF) / (XF * XF) - 1.0), 1e-12)))
+    HF = np.maximum(np.abs(0.5 * W * XF / lam), 1e-2 * W * L)
+    VF = 0.5 * W * (ZF / np.tanh(lam) + L)
+
+    # 极度松弛(XF + ZF不超过原长加竖直悬挂段的自重伸长): 缆绳竖直悬挂并堆在海床上,
+    # 水平力趋于0,方程无正解,直接给出极限解
+    slack = XF + ZF <= L + 0.5 * W * ZF * ZF / EA
+    HF[slack] = 0.0
+    VF[slack] = W[slack] * np.maximum(ZF[slack], 0.0)
+
+    active = np.flatnonzero(~slack)
+    # 试探步可能越界产生inf/nan,这些步会被回溯拒绝
+    with np.errstate(over='ignore', divide='ignore', invalid='ignore'):
+        for _ in range(max_iter):
+            args = (XF[active], ZF[active], L[active], EA[active], W[active])
+            h, v = HF[active], VF[active]
+            ex, ez, dxdh, dxdv, dzdh, dzdv = _catenary_residual(h, v, *args)
+            norm = np.abs(ex) + np.abs(ez)
+            done = norm < tol * np.maximum(args[2], 1.0)
+            if done.all():
+                break
+            det = dxdh * dzdv - dxdv * dzdh
+            dH = (dzdv * ex - dxdv * ez) / det
+            dV = (dxdh * ez - dzdh * ex) / det
+
+            # 回溯: 水平力和竖直力必须为正且残差下降,否则步长减半
+            step = np.ones_like(h)
+            for _ in range(30):
+                h_new = h - step * dH
+                v_new = v - step * dV
+                ex_new, ez_new = _catenary_residual(np.maximum(h_new, 1e-300), v_new, *args)[:2]
+                bad = (h_new <= 0) | (v_new <= 0) | ~(np.abs(ex_new) + np.abs(ez_new) < norm)
+                bad &= ~done
+                if not bad.any():
+                    break
+                step = np.where(bad, 0.5 * step, step)
+            HF[active] = np.where(done, h, h - step * dH)
+            VF[active] = np.where(done, v, v - step * dV)
+            active = active[~done]
+
+    HF = HF.reshape(shape)
+    VF = VF.reshape(shape)
+    W = W.reshape(shape)
+    L = L.reshape(shape)
+    grounded = VF < W * L
+    HA = HF
+    VA = np.where(grounded, 0.0, VF - W * L)
+    LB = np.where(grounded, L - VF / W, 0.0)
+    return HF, VF, HA, VA, LB
+
+
+def rotation_matrix(roll, pitch, yaw) -> np.ndarray:
+    """
+    平台转动矩阵 R = Rz(yaw) Ry(pitch) Rx(roll),支持数组输入,返回(..., 3, 3)
+    """
+    roll, pitch, yaw = np.broadcast_arrays(*[np.asarray(v, dtype=np.float64) for v in (roll, pitch, yaw)])
+    cr, sr = np.cos(roll), np.sin(roll)
+    cp, sp = np.cos(pitch), np.sin(pitch)
+    cy, sy = np.cos(yaw), np.sin(yaw)
+    R = np.empty(roll.shape + (3, 3))
+    R[..., 0, 0] = cy * cp
+    R[..., 0, 1] = cy * sp * sr - sy * cr
+    R[..., 0, 2] = cy * sp * cr + sy * sr
+    R[..., 1, 0] = sy * cp
+    R[..., 1, 1] = sy * sp * sr + cy * cr
+    R[..., 1, 2] = sy * sp * cr - cy * sr
+    R[..., 2, 0] = -sp
+    R[..., 2, 1] = cp * sr
+    R[..., 2, 2] = cp * cr
+    return R
+
+
+class MooringSystem:
+    """
+    由MoorDyn输入(HawtC_IO_MoorDyn.MoorDyn)构建的准静态系泊系统:
+    Vessel节点坐标为相对平台参考点的坐标,Fix节点为锚点的全局坐标
+    """
+    def __init__(self, doc, gravity: float = GRAVITY, rho: float = WATER_DENSITY):
+        self.doc = doc
+        nodes = {int(n["Node"]): n for n in doc.nodes}
+        anchors, fairleads, L, EA, W = [], [], [], [], []
+        for line in doc.lines:
+            lt = doc.line_type(line["LineType"])
+            anchor = nodes[int(line["NodeAnch"])]
+            fair = nodes[int(line["NodeFair"])]
+            anchors.append([anchor["X"], anchor["Y"], anchor["Z"]])
+            fairleads.append([fair["X"], fair["Y"], fair["Z"]])
+            L.append(line["UnstrLen"])
+            EA.append(lt["EA"])
+            area = 0.25 * np.pi * lt["Diam"] ** 2
+            W.append((lt["MassDenInAir"] - rho * area) * gravity)
+        self.anchors = np.array(anchors, dtype=np.float64)       # (nline, 3) 全局坐标
+        self.fairleads = np.array(fairleads, dtype=np.float64)   # (nline, 3) 平台坐标系
+        self.L = np.array(L, dtype=np.float64)
+        self.EA = np.array(EA, dtype=np.float64)
+        self.W = np.array(W, dtype=np.float64)
+        self.nlines = len(self.L)
+
+    def solve(self, offsets: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        求解任意多个平台位置下所有缆绳的准静态张力
+        :param offsets: (..., 6) 平台位移 surge, sway, heave(m), roll, pitch, yaw(rad)
+        :return: 字典,含 fairlead_tension/anchor_tension (..., nline)、
+                 HF/VF (..., nline) 以及作用于平台参考点的合力 force (..., 6)
+        """
+        offsets = np.asarray(offsets, dtype=np.float64)
+        R = rotation_matrix(offsets[..., 3], offsets[..., 4], offsets[..., 5])
+        # 导缆孔相对平台参考点的全局矢量,及其全局位置 (..., nline, 3)
+        r = np.einsum('...ij,lj->...li', R, self.fairleads)
+        fair = r + offsets[..., None, :3]
+        d = fair - self.anchors
+        XF = np.hypot(d[..., 0], d[..., 1])
+        ZF = d[..., 2]
+        HF, VF, HA, VA, LB = catenary(XF, ZF, self.L, self.EA, self.W)
+
+        # 缆绳对平台的作用力: 水平指向锚点,竖直向下
+        ux = d[..., 0] / np.maximum(XF, 1e-12)
+        uy = d[..., 1] / np.maximum(XF, 1e-12)
+        f = np.stack((-HF * ux, -HF * uy, -VF), axis=-1)
+        force = np.concatenate((f.sum(axis=-2), np.cross(r, f).sum(axis=-2)), axis=-1)
+        return {
+            "HF": HF, "VF": VF, "HA": HA, "VA": VA, "LB": LB,
+            "fairlead_tension": np.hypot(HF, VF),
+            "anchor_tension": np.hypot(HA, VA),
+            "force": force,
+        }
+
+    def stiffness(self, offsets: np.ndarray, delta: Sequence[float] = (0.1, 0.1, 0.1, 1e-3, 1e-3, 1e-3)) -> np.ndarray:
+        """
+        中心差分计算恢复刚度矩阵 K = -dF/dx
+        :param offsets: (..., 6) 平台位移
+        :return: (..., 6, 6)
+        """
+        offsets = np.asarray(offsets, dtype=np.float64)
+        delta = np.asarray(delta, dtype=np.float64)
+        steps = np.concatenate((np.diag(delta), -np.diag(delta)))  # (12, 6)
+        perturbed = offsets[..., None, :] + steps                  # (..., 12, 6)
+        force = self.solve(perturbed)["force"]                      # (..., 12, 6)
+        dF = (force[..., :6, :] - force[..., 6:, :]) / (2.0 * delta[:, None])  # (..., j, i) = dF_i/dx_j
+        return -np.swapaxes(dF, -1, -2)
+
+
+def _interp_regular(axes: Sequence[np.ndarray], values: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """
+    规则网格上的多线性插值(超出范围时取边界值)
+    :param axes: 每一维的网格坐标(单调递增)
+    :param values: 形状为(len(axes[0]), ..., len(axes[-1]), *value_shape)
+    :param points: (n, ndim)
+    """
+    points = np.atleast_2d(np.asarray(points, dtype=np.float64))
+    ndim = len(axes)
+    lower, frac = [], []
+    for k, ax in enumerate(axes):
+        if len(ax) == 1:
+            lower.append(np.zeros(len(points), dtype=np.int64))
+            frac.append(np.zeros(len(points)))
+            continue
+        x = np.clip(points[:, k], ax[0], ax[-1])
+        i = np.clip(np.searchsorted(ax, x, 'right') - 1, 0, len(ax) - 2)
+        lower.append(i)
+        frac.append((x - ax[i]) / (ax[i + 1] - ax[i]))
+    result = 0.0
+    for corner in range(2 ** ndim):
+        weight = np.ones(len(points))
+        index = []
+        for k in range(ndim):
+            bit = (corner >> k) & 1
+            if len(axes[k]) == 1:
+                if bit:
+                    weight = weight * 0.0
+                index.append(lower[k])
+                continue
+            weight = weight * (frac[k] if bit else 1.0 - frac[k])
+            index.append(lower[k] + bit)
+        w = weight.reshape((-1,) + (1,) * (values.ndim - ndim))
+        result = result + w * values[tuple(index)]
+    return result
+
+
+class MooringTable:
+    """
+    纵荡/横荡/垂荡/艏摇网格上的系泊查表: 导缆孔与锚点张力、恢复力及6x6恢复刚度,
+    查询时做多线性插值,用于系泊方案预筛选和初始条件选取
+    """
+    DOFS = (0, 1, 2, 5)  # surge, sway, heave, yaw
+
+    def __init__(self, system: MooringSystem, surge: Sequence[float], sway: Sequence[float],
+                 heave: Sequence[float], yaw: Sequence[float]):
+        self.axes = [np.asarray(v, dtype=np.float64) for v in (surge, sway, heave, yaw)]
+        grid = np.meshgrid(*self.axes, indexing='ij')
+        offsets = np.zeros(grid[0].shape + (6,))
+        for k, dof in enumerate(self.DOFS):
+            offsets[..., dof] = grid[k]
+        result = system.solve(offsets)
+        self.fairlead_tension = result["fairlead_tension"]
+        self.anchor_tension = result["anchor_tension"]
+        self.force = result["force"]
+        self.stiffness = system.stiffness(offsets)
+
+    def lookup(self, points: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        :param points: (n, 4) 查询点 surge, sway, heave, yaw
+        :return: fairlead_tension/anchor_tension (n, nline), force (n, 6), stiffness (n, 6, 6)
+        """
+        return {name: _interp_regular(self.axes, getattr(self, name), points)
+                for name in ("fairlead_tension", "anchor_tension", "force", "stiffness")}
+
+
+if __name__ == "__main__":
+    # 与Mooring/Lines.out中t=0时刻的张力对比,相对误差超过0.5%时失败
+    import os
+    from HawtC_IO_MoorDyn import load_moordyn
+    from HawtC_IO_Out import OUT
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    system = MooringSystem(load_moordyn(os.path.join(here, "Mooring", "lines.txt")))
+    static = system.solve(np.zeros(6))
+    computed = np.array([static["fairlead_tension"][0], static["fairlead_tension"][1], static["anchor_tension"][0]])
+    channels = ["FAIRTEN1", "FAIRTEN2", "ANCHTEN1"]
+    window = OUT(os.path.join(here, "Mooring", "Lines.out")).read_window(0.0, 0.0, channels)
+    reference = np.array([window[ch][0] for ch in channels])
+    error = np.abs(computed / reference - 1)
+    print("准静态: FAIRTEN1=%.0f FAIRTEN2=%.0f ANCHTEN1=%.0f" % tuple(computed))
+    print("Lines.out t=0: FAIRTEN1=%.0f FAIRTEN2=%.0f ANCHTEN1=%.0f" % tuple(reference))
+    print("相对误差: " + " ".join("%.3f%%" % (100 * e) for e in error))
+    assert error.max() < 5e-3, f"准静态张力与Lines.out相差{100 * error.max():.3f}%"
@@ -0,0 +1,497 @@
+import functools
+import re
+from typing import List, Optional, Sequence, TextIO, Tuple
+
+import numpy as np
+
+from HawtC_Mooring_Catenary import GRAVITY, WATER_DENSITY, catenary, rotation_matrix
+
+# 节点运动类型
+FIXED, VESSEL, FREE = 0, 1, 2
+_NODE_KINDS = {"FIX": FIXED, "FIXED": FIXED, "ANCHOR": FIXED, "VESSEL": VESSEL,
+               "CONNECT": FREE, "CON": FREE, "FREE": FREE}
+
+# 输出通道: FairTen1/AnchTen1 或 Con2px/Con2vy/Con2Fz
+_OUTPUT_PATTERN = re.compile(r"^(FAIRTEN|ANCHTEN)(\d+)$|^CON(\d+)(P|V|F)(X|Y|Z)$")
+_OUTPUT_UNITS = {"FAIRTEN": "(N)", "ANCHTEN": "(N)", "P": "(m)", "V": "(m/s)", "F": "(N)"}
+
+# 平台位移通道(HawtC_S_GetPlatform*)
+PLATFORM_GETTERS = tuple("HawtC_S_GetPlatform" + dof + kind for kind in ("", "Vel")
+                         for dof in ("Surge", "Sway", "Heave", "Roll", "Pitch", "Yaw"))
+
+
+def _catenary_profile(anchor, fair, L, EA, W, s):
+    """
+    沿弹性悬链线的节点位置(锚点在海床上,海床摩擦为0)
+    :param s: 从锚点起算的无应力弧长
+    """
+    d = fair - anchor
+    XF = np.hypot(d[0], d[1])
+    ZF = d[2]
+    HF, VF, _, VA, LB = (float(v) for v in catenary(XF, ZF, L, EA, W))
+    HF = max(HF, 1e-6 * W * L)
+    if LB > 0:
+        sus = np.maximum(s - LB, 0.0)
+        x = np.minimum(s, LB) + HF / W * np.arcsinh(W * sus / HF) + HF * s / EA
+        z = HF / W * (np.sqrt(1.0 + (W * sus / HF) ** 2) - 1.0) + W * sus * sus / (2.0 * EA)
+    else:
+        va = VA / HF
+        vs = (VA + W * s) / HF
+        x = HF / W * (np.arcsinh(vs) - np.arcsinh(va)) + HF * s / EA
+        z = HF / W * (np.sqrt(1.0 + vs * vs) - np.sqrt(1.0 + va * va)) + (VA * s + 0.5 * W * s * s) / EA
+    # 离散后末端可能与导缆孔有微小偏差,按比例修正
+    x *= XF / x[-1] if x[-1] else 0.0
+    z *= ZF / z[-1] if z[-1] else 0.0
+    ux, uy = (d[0] / XF, d[1] / XF) if XF > 0 else (1.0, 0.0)
+    return anchor + np.column_stack((x * ux, x * uy, z))
+
+
+class MooringDynamics:
+    """
+    集中质量法系泊动力学(与MoorDyn相同的离散方式),所有缆绳的节点和单元合并为连续数组一次计算:
+    轴向刚度(不受压)与内阻尼、法向/切向拖曳力、附加质量和海床接触(kBot/cBot),
+    以固定步长dtM的二阶龙格库塔积分.Fix节点固定,Vessel节点随平台运动,Connect节点自由
+
+    平台运动由step()给出,可来自仿真的HawtC_S_GetPlatform*取值函数(attach)或文件(run);
+    输出通道与MoorDyn的Lines.out一致(FairTenN/AnchTenN/ConNpx.../ConNFz)
+    """
+
+    def __init__(self, doc, gravity: float = GRAVITY, rho: float = WATER_DENSITY,
+                 dt: Optional[float] = None, outputs: Optional[Sequence[str]] = None):
+        """
+        :param doc: HawtC_IO_MoorDyn.MoorDyn
+        :param dt: 积分步长,缺省取文件中的dtM
+        :param outputs: 输出通道,缺省取文件OUTPUTS段
+        """
+        self.doc = doc
+        self.gravity = gravity
+        self.rho = rho
+        opts = doc.options
+        self.dt = float(dt if dt is not None else opts.get("dtM", 0.001))
+        self.depth = float(opts.get("WtrDpth", np.inf))
+        self.kbot = float(opts.get("kBot", 3.0e6))
+        self.cbot = float(opts.get("cBot", 3.0e5))
+
+        # ---- 连接点(文件中的节点),作为全局节点数组的前nconn个
+        conn = doc.nodes
+        self.conn_ids = conn["Node"].astype(np.int64)
+        self._conn_index = {int(n): i for i, n in enumerate(self.conn_ids)}
+        kinds = []
+        for node_type in conn["Type"]:
+            kind = _NODE_KINDS.get(str(node_type).upper())
+            if kind is None:
+                raise ValueError(f"不支持的节点类型: {node_type}")
+            kinds.append(kind)
+        nconn = len(conn)
+        xyz = np.column_stack((conn["X"], conn["Y"], conn["Z"])).astype(np.float64)
+        self.vessel_rel = xyz.copy()    # Vessel节点: 平台坐标系下的位置
+
+        # ---- 缆绳内部节点和单元
+        seg_a, seg_b, seg_l0, seg_ea, seg_ba, seg_w, seg_m = [], [], [], [], [], [], []
+        seg_d, seg_can, seg_cat, seg_cdn, seg_cdt = [], [], [], [], []
+        self.line_ids = doc.lines["Line"].astype(np.int64)
+        self.line_nodes: List[np.ndarray] = []
+        nnode = nconn
+        for line in doc.lines:
+            lt = doc.line_type(line["LineType"])
+            nseg = int(line["NumSegs"])
+            anchor = self._conn_index[int(line["NodeAnch"])]
+            fair = self._conn_index[int(line["NodeFair"])]
+            nodes = np.concatenate(([anchor], np.arange(nnode, nnode + nseg - 1), [fair]))
+            nnode += nseg - 1
+            self.line_nodes.append(nodes)
+            l0 = line["UnstrLen"] / nseg
+            area = 0.25 * np.pi * lt["Diam"] ** 2
+            ba = lt["BA"]
+            if ba < 0:
+                # 负值为阻尼比(与MoorDyn相同的换算)
+                ba = -ba * l0 * np.sqrt(lt["EA"] * lt["MassDenInAir"])
+            seg_a.append(nodes[:-1])
+            seg_b.append(nodes[1:])
+            for arr, value in ((seg_l0, l0), (seg_ea, lt["EA"]), (seg_ba, ba),
+                               (seg_w, (lt["MassDenInAir"] - rho * area) * gravity * l0),
+                               (seg_m, lt["MassDenInAir"] * l0), (seg_d, lt["Diam"]),
+                               (seg_can, lt["Can"]), (seg_cat, lt["Cat"]),
+                               (seg_cdn, lt["Cdn"]), (seg_cdt, lt["Cdt"])):
+                arr.append(np.full(nseg, value, dtype=np.float64))
+
+        cat = np.concatenate
+        self.nnode = nnode
+        self.seg_a = cat(seg_a)
+        self.seg_b = cat(seg_b)
+        self.seg_l0 = cat(seg_l0)
+        self.seg_ea = cat(seg_ea)
+        self.seg_ba = cat(seg_ba)
+        nseg = len(self.seg_a)
+        self.nseg = nseg
+        # 单元的两半: 前nseg个属于a端,后nseg个属于b端
+        self._half_node = cat((self.seg_a, self.seg_b))
+        seg_d = cat(seg_d)
+        half_l0 = 0.5 * self.seg_l0
+        # 拖曳力系数(乘以|u|u即为力)
+        self._cdn = 0.5 * rho * seg_d * self.seg_l0 * cat(seg_cdn)
+        self._cdt = 0.5 * rho * np.pi * seg_d * self.seg_l0 * cat(seg_cdt)
+        # 每半个单元的重量(含浮力)和海床接触面积
+        self._half_weight = np.tile(-0.5 * cat(seg_w), 2)
+        self._half_contact = np.tile(seg_d * half_l0, 2)
+        # 每半个单元的(力, 方向),按节点累加时的bincount下标
+        self._half = np.empty((2 * nseg, 6))
+        self._half_bins = (self._half_node[:, None] * 6 + np.arange(6)).ravel()
+
+        # ---- 节点质量与附加质量(法向Can/切向Cat)
+        half_volume = np.tile(0.25 * np.pi * seg_d ** 2 * half_l0, 2)
+        self.mass = np.bincount(self._half_node, np.tile(0.5 * cat(seg_m), 2), nnode)
+        self._added_n = rho * np.bincount(self._half_node, half_volume * np.tile(cat(seg_can), 2), nnode)
+        self._added_t = rho * np.bincount(self._half_node, half_volume * np.tile(cat(seg_cat), 2), nnode)
+        # 连接点自身的质量/体积/外力/拖曳
+        self.mass[:nconn] += conn["M"]
+        self._added_n[:nconn] += rho * conn["V"] * conn["CA"]
+        self._added_t[:nconn] += rho * conn["V"] * conn["CA"]
+        self._conn_force = np.zeros((nconn, 3))
+        self._conn_force[:, 0] = conn["FX"] * 1e3
+        self._conn_force[:, 1] = conn["FY"] * 1e3
+        self._conn_force[:, 2] = conn["FZ"] * 1e3 + (rho * conn["V"] - conn["M"]) * gravity
+        self._conn_cda = 0.5 * rho * conn["CdA"]
+
+        kinds = np.array(kinds + [FREE] * (nnode - nconn))
+        self.free = np.flatnonzero(kinds == FREE)
+        self.vessel = np.flatnonzero(kinds == VESSEL)
+        if not len(self.free):
+            raise ValueError("系泊系统中没有自由节点")
+        c = self.mass[self.free] + self._added_n[self.free]
+        e = self._added_t[self.free] - self._added_n[self.free]
+        self._inv_mass = 1.0 / c[:, None]
+        self._mass_ratio = e / (c + e)
+
+        # ---- 状态
+        self.time = 0.0
+        self.r = np.zeros((nnode, 3))
+        self.r[:nconn] = xyz
+        self.v = np.zeros((nnode, 3))
+        self._platform = np.zeros(6)
+        self._platform_vel = np.zeros(6)
+        self._plan_outputs(outputs if outputs is not None else doc.outputs)
+        self._out: Optional[TextIO] = None
+        self.initialize(np.zeros(6))
+
+    # ------------------------------------------------------------------ 初始化
+    def _vessel_kinematics(self, platform, platform_vel):
+        """Vessel节点的全局位置和速度"""
+        R = rotation_matrix(platform[3], platform[4], platform[5])
+        rel = self.vessel_rel[self.vessel] @ R.T
+        return platform[:3] + rel, platform_vel[:3] + np.cross(platform_vel[3:], rel)
+
+    def initialize(self, platform: Sequence[float], time: float = 0.0):
+        """
+        以准静态悬链线作为初始形状: 锚点在海床上的缆绳按弹性悬链线布置节点,其余缆绳取直线
+        :param platform: 平台位移 surge, sway, heave(m), roll, pitch, yaw(rad)
+        """
+        self._platform = np.asarray(platform, dtype=np.float64).copy()
+        self._platform_vel = np.zeros(6)
+        self.time = float(time)
+        self.r[self.vessel] = self._vessel_kinematics(self._platform, self._platform_vel)[0]
+        self.v[:] = 0.0
+        for line, nodes in zip(self.doc.lines, self.line_nodes):
+            lt = self.doc.line_type(line["LineType"])
+            a, b = self.r[nodes[0]], self.r[nodes[-1]]
+            if a[2] > b[2]:
+                a, b = b, a
+                nodes = nodes[::-1]
+            s = np.linspace(0.0, line["UnstrLen"], len(nodes))
+            if a[2] <= -self.depth + 1e-3 and np.hypot(*(b - a)[:2]) > 0:
+                w = (lt["MassDenInAir"] - self.rho * 0.25 * np.pi * lt["Diam"] ** 2) * self.gravity
+                pos = _catenary_profile(a, b, line["UnstrLen"], lt["EA"], w, s)
+            else:
+                pos = a + np.outer(s / s[-1], b - a)
+            self.r[nodes[1:-1]] = pos[1:-1]
+        self._forces(self.r, self.v)
+        return self
+
+    def settle(self, max_time: Optional[float] = None, threshold: Optional[float] = None,
+               drag_scale: Optional[float] = None, interval: float = 1.0):
+        """
+        动力松弛: 平台保持不动,放大拖曳力积分到导缆孔张力稳定,消除悬链线初始形状与离散模型之间的差异.
+        参数缺省取文件中的TmaxIC/threshIC/CdScaleIC,完成后速度清零,时刻恢复
+        :param interval: 检查收敛的时间间隔(s)
+        """
+        opts = self.doc.options
+        max_time = float(max_time if max_time is not None else opts.get("TmaxIC", 60.0))
+        threshold = float(threshold if threshold is not None else opts.get("threshIC", 0.001))
+        drag_scale = float(drag_scale if drag_scale is not None else opts.get("CdScaleIC", 1.0))
+        time0, out = self.time, self._out
+        cdn, cdt = self._cdn, self._cdt
+        self._cdn, self._cdt, self._out = cdn * drag_scale, cdt * drag_scale, None
+        fair = self.nseg + np.cumsum([len(n) - 1 for n in self.line_nodes]) - 1
+        try:
+            last = np.linalg.norm(self._half[fair, :3], axis=1)
+            converged = 0
+            while self.time - time0 < max_time and converged < 3:
+                self.step(self.time + interval, self._platform, np.zeros(6))
+                ten = np.linalg.norm(self._half[fair, :3], axis=1)
+                # 连续3次检查张力相对变化都小于阈值才认为收敛
+                converged = converged + 1 if np.all(np.abs(ten - last) <= threshold * np.abs(ten)) else 0
+                last = ten
+        finally:
+            self._cdn, self._cdt, self._out = cdn, cdt, out
+        self.v[:] = 0.0
+        self.time = time0
+        self._forces(self.r, self.v)
+        return self
+
+    # ------------------------------------------------------------------ 受力
+    def _forces(self, r, v):
+        """
+        计算各节点受力(不含惯性力)与切向(相邻单元方向之和),
+        同时保存每半个单元作用在端点上的力供输出使用
+        :return: (nnode, 6) 前3列为受力,后3列为切向
+        """
+        a, b = self.seg_a, self.seg_b
+        dr = r[b] - r[a]
+        length = np.sqrt(np.einsum('ij,ij->i', dr, dr))
+        q = dr / length[:, None]
+        dv = v[b] - v[a]
+        ldot = np.einsum('ij,ij->i', dv, q)
+        tension = self.seg_ea * np.maximum(length / self.seg_l0 - 1.0, 0.0) + self.seg_ba * ldot / self.seg_l0
+
+        # 拖曳力按单元中点速度计算,平均分给两端
+        vm = 0.5 * (v[a] + v[b])
+        vt_mag = np.einsum('ij,ij->i', vm, q)
+        vt = vt_mag[:, None] * q
+        vn = vm - vt
+        vn_mag = np.sqrt(np.einsum('ij,ij->i', vn, vn))
+        drag = -0.5 * ((self._cdn * vn_mag)[:, None] * vn + (self._cdt * np.abs(vt_mag))[:, None] * vt)
+
+        # 每半个单元: 轴力 + 重量 + 拖曳 + 海床接触,以及单元方向
+        nseg = self.nseg
+        tq = tension[:, None] * q
+        half = self._half
+        half[:nseg, :3] = drag + tq
+        half[nseg:, :3] = drag - tq
+        half[:nseg, 3:] = q
+        half[nseg:, 3:] = q
+        half[:, 2] += self._half_weight
+        node = self._half_node
+        pen = -self.depth - r[node, 2]
+        contact = pen > 0
+        if contact.any():
+            half[contact, 2] += (self.kbot * pen[contact] - self.cbot * v[node[contact], 2]) \
+                * self._half_contact[contact]
+
+        f = np.bincount(self._half_bins, half.ravel(), 6 * self.nnode).reshape(self.nnode, 6)
+        nconn = len(self._conn_force)
+        vc = v[:nconn]
+        f[:nconn, :3] += self._conn_force - (self._conn_cda * np.sqrt(np.einsum('ij,ij->i', vc, vc)))[:, None] * vc
+        return f
+
+    def _acceleration(self, r, v):
+        """自由节点加速度,附加质量按节点切向取法向Can/切向Cat"""
+        f = self._forces(r, v)[self.free]
+        q = f[:, 3:]
+        q /= np.maximum(np.sqrt(np.einsum('ij,ij->i', q, q)), 1e-12)[:, None]
+        # M = c*I + e*qq^T 的逆: (I - e/(c+e) qq^T)/c
+        fq = np.einsum('ij,ij->i', f[:, :3], q)
+        return (f[:, :3] - (self._mass_ratio * fq)[:, None] * q) * self._inv_mass
+
+    # ------------------------------------------------------------------ 积分
+    def step(self, t: float, platform: Sequence[float], platform_vel: Optional[Sequence[float]] = None):
+        """
+        从当前时刻积分到t,期间Vessel节点的位置和速度在上一时刻与本时刻之间线性插值
+        :param platform: t时刻平台位移(6,)
+        :param platform_vel: t时刻平台速度(6,),缺省时由位移差分得到
+        """
+        platform = np.asarray(platform, dtype=np.float64)
+        span = t - self.time
+        if span <= 0:
+            return self
+        v1 = (platform - self._platform) / span if platform_vel is None \
+            else np.asarray(platform_vel, dtype=np.float64)
+        vessel = self.vessel
+        r, v = self.r, self.v
+        pos0, vel0 = r[vessel].copy(), v[vessel].copy()
+        pos1, vel1 = self._vessel_kinematics(platform, v1)
+        if platform_vel is None:
+            vel0 = vel1 = (pos1 - pos0) / span
+        nsub = max(int(np.ceil(span / self.dt - 1e-9)), 1)
+        h = span / nsub
+        free = self.free
+        rm, vm = r.copy(), v.copy()
+        for i in range(nsub):
+            # 二阶龙格库塔(中点法)
+            x0 = i / nsub
+            xm = (i + 0.5) / nsub
+            r[vessel] = pos0 + (pos1 - pos0) * x0
+            v[vessel] = vel0 + (vel1 - vel0) * x0
+            acc = self._acceleration(r, v)
+            rm[vessel] = pos0 + (pos1 - pos0) * xm
+            vm[vessel] = vel0 + (vel1 - vel0) * xm
+            rm[free] = r[free] + 0.5 * h * v[free]
+            vm[free] = v[free] + 0.5 * h * acc
+            acc = self._acceleration(rm, vm)
+            r[free] += h * vm[free]
+            v[free] += h * acc
+        r[vessel] = pos1
+        v[vessel] = vel1
+        self._forces(r, v)
+        self.time = float(t)
+        self._platform = platform.copy()
+        self._platform_vel = np.array(v1, dtype=np.float64)
+        if self._out is not None:
+            self._write_row()
+        return self
+
+    def run(self, time: np.ndarray, motion: np.ndarray, velocity: Optional[np.ndarray] = None,
+            settle: bool = True):
+        """
+        按给定的平台运动时程逐步积分(如motion_from_out读取的文件),第一行作为初始状态
+        :param time: (n,) 时刻
+        :param motion: (n, 6) 平台位移
+        :param velocity: (n, 6) 平台速度,可省略
+        :param settle: 是否先做动力松弛(settle)
+        """
+        self.initialize(motion[0], time[0])
+        if settle:
+            self.settle()
+        if self._out is not None:
+            self._write_row()
+        for i in range(1, len(time)):
+            self.step(time[i], motion[i], None if velocity is None else velocity[i])
+        return self
+
+    # ------------------------------------------------------------------ 与仿真耦合
+    def attach(self, sim, turbnum: int = 0):
+        """
+        挂接到仿真的时间步进回调,每步读取HawtC_S_GetPlatform*后积分到当前时刻,
+        挂接前应先按仿真的初始平台位置调用initialize/settle
+        """
+        self._sim = sim
+        self._turbnum = turbnum
+        self.rebind(sim.api)
+        if self not in sim.step_hooks:
+            sim.step_hooks.append(self)
+        return self
+
+    def rebind(self, api):
+        """按api重新生成平台运动的读取函数(api的函数被替换后调用)"""
+        self._platform_calls = [functools.partial(getattr(api, name), self._turbnum) for name in PLATFORM_GETTERS]
+        return self
+
+    def detach(self):
+        sim = getattr(self, "_sim", None)
+        if sim is not None and self in sim.step_hooks:
+            sim.step_hooks.remove(self)
+        self._sim = None
+
+    def __call__(self, times_n, t):
+        state = np.array([call() for call in self._platform_calls])
+        self.step(t, state[:6], state[6:])
+
+    # ------------------------------------------------------------------ 输出
+    def _plan_outputs(self, outputs: Sequence[str]):
+        """将输出通道解析为(节点或半单元下标, 取值方式)"""
+        names, units, plan = [], [], []
+        # 每根缆绳第一个单元的编号
+        offsets = np.concatenate(([0], np.cumsum([len(n) - 1 for n in self.line_nodes])))
+        for channel in outputs:
+            key = channel.strip().upper()
+            match = _OUTPUT_PATTERN.match(key)
+            if not match:
+                raise ValueError(f"不支持的输出通道: {channel}")
+            if match.group(1):
+                found = np.flatnonzero(self.line_ids == int(match.group(2)))
+                if not len(found):
+                    raise ValueError(f"输出通道{channel}引用了不存在的缆绳")
+                i = int(found[0])
+                # 锚端为该缆绳第一个单元的a端,导缆孔端为最后一个单元的b端
+                half = offsets[i] if match.group(1) == "ANCHTEN" else self.nseg + offsets[i + 1] - 1
+                plan.append(("ten", half, 0))
+                units.append(_OUTPUT_UNITS[match.group(1)])
+            else:
+                node = int(match.group(3))
+                if node not in self._conn_index:
+                    raise ValueError(f"输出通道{channel}引用了不存在的节点")
+                plan.append((match.group(4), self._conn_index[node], "XYZ".index(match.group(5))))
+                units.append(_OUTPUT_UNITS[match.group(4)])
+            names.append(key)
+        self.output_names = names
+        self.output_units = units
+        self._output_plan = plan
+
+    def outputs(self) -> np.ndarray:
+        """当前时刻各输出通道的值"""
+        values = np.empty(len(self._output_plan))
+        node_force = None
+        for k, (kind, index, comp) in enumerate(self._output_plan):
+            if kind == "ten":
+                force = self._half[index, :3]
+                values[k] = np.sqrt(np.dot(force, force))
+            elif kind == "P":
+                values[k] = self.r[index, comp]
+            elif kind == "V":
+                values[k] = self.v[index, comp]
+            else:
+                if node_force is None:
+                    node_force = self._forces(self.r, self.v)[:, :3]
+                values[k] = node_force[index, comp]
+        return values
+
+    def open_output(self, path: str):
+        """打开Lines.out格式的输出文件,之后每次step()写一行"""
+        self.close_output()
+        self._out = open(path, 'w', encoding='utf-8')
+        self._out.write("Time\t " + "".join(f"{n}\t " for n in self.output_names) + "\n")
+        self._out.write("(s)\t " + "".join(f"{u:<8}\t " for u in self.output_units) + "\n")
+        return self
+
+    def _write_row(self):
+        self._out.write(f"{self.time:g}\t " + "".join(f"{v:g}\t " for v in self.outputs()) + "\n")
+
+    def close_output(self):
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+
+    def __repr__(self) -> str:
+        return (f"<MooringDynamics lines={len(self.line_nodes)} nodes={self.nnode} "
+                f"free={len(self.free)} dt={self.dt:g}>")
+
+
+def motion_from_out(path: str, channels: Sequence[str] = ("PtfmSurge", "PtfmSway", "PtfmHeave",
+                                                           "PtfmRoll", "PtfmPitch", "PtfmYaw"),
+                    degrees: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    从.out文件读取平台运动时程
+    :param channels: 6个自由度对应的通道名
+    :param degrees: 转动通道单位为度时设为True
+    :return: (时刻(n,), 位移(n, 6))
+    """
+    from HawtC_IO_Out import OUT
+    out = OUT(path)
+    data = out.load(list(channels) + [out.time_channel])
+    motion = np.column_stack([data[ch] for ch in channels]).astype(np.float64)
+    if degrees:
+        motion[:, 3:] = np.radians(motion[:, 3:])
+    return np.asarray(data[out.time_channel], dtype=np.float64), motion
+
+
+if __name__ == "__main__":
+    # 平台静止时与Mooring/Lines.out前几个时刻的输出对比,相对误差超过1%时失败
+    import os
+    from HawtC_IO_MoorDyn import load_moordyn
+    from HawtC_IO_Out import OUT
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    model = MooringDynamics(load_moordyn(os.path.join(here, "Mooring", "lines.txt"))).settle()
+    print(model)
+    out = OUT(os.path.join(here, "Mooring", "Lines.out"))
+    print("Time " + " ".join(model.output_names))
+    worst = 0.0
+    for t in (0.0, 0.5, 1.0, 2.0):
+        model.step(t, np.zeros(6))
+        window = out.read_window(t, t, model.output_names)
+        reference = np.array([window[name][0] for name in model.output_names])
+        computed = np.asarray(model.outputs())
+        worst = max(worst, float(np.max(np.abs(computed / reference - 1))))
+        print("%.3f 本模型: %s" % (t, " ".join("%.6g" % v for v in computed)))
+        print("%.3f Lines.out: %s" % (t, " ".join("%.6g" % v for v in reference)))
+    print("最大相对误差: %.3f%%" % (100 * worst))
+    assert worst < 1e-2, f"与Lines.out相差{100 * worst:.3f}%"
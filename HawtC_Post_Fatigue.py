@@ -0,0 +1,188 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# 向量化消去每轮至少去掉的比例,低于此比例时剩余部分改用顺序堆栈算法
+_MIN_PASS_FRACTION = 0.01
+
+
+def turning_points(x: np.ndarray) -> np.ndarray:
+    """
+    提取峰谷点(保留首尾点),去掉相邻重复值和单调段中间的点
+    """
+    x = np.asarray(x, dtype=np.float64).ravel()
+    if len(x) < 3:
+        return x.copy()
+    # 去掉相邻重复值
+    keep = np.empty(len(x), dtype=bool)
+    keep[0] = True
+    np.not_equal(x[1:], x[:-1], out=keep[1:])
+    x = x[keep]
+    if len(x) < 3:
+        return x
+    d = np.diff(x)
+    turning = np.empty(len(x), dtype=bool)
+    turning[0] = turning[-1] = True
+    np.less(d[:-1] * d[1:], 0, out=turning[1:-1])
+    return x[turning]
+
+
+def _four_point_stack(tp: np.ndarray) -> Tuple[list, list, np.ndarray]:
+    """顺序四点法,返回(全循环幅值, 全循环均值, 残余序列)"""
+    ranges, means = [], []
+    stack = []
+    for p in tp.tolist():
+        stack.append(p)
+        while len(stack) >= 4:
+            a, b, c, d = stack[-4], stack[-3], stack[-2], stack[-1]
+            inner = abs(b - c)
+            if inner <= abs(a - b) and inner <= abs(c - d):
+                ranges.append(inner)
+                means.append(0.5 * (b + c))
+                del stack[-3:-1]
+            else:
+                break
+    return ranges, means, np.array(stack, dtype=np.float64)
+
+
+def _cycles(full_ranges, full_means, residue) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """合并全循环与残余半循环,返回(幅值, 均值, 计数)"""
+    half_ranges = np.abs(np.diff(residue))
+    half_means = 0.5 * (residue[1:] + residue[:-1])
+    ranges = np.concatenate((full_ranges, half_ranges))
+    means = np.concatenate((full_means, half_means))
+    counts = np.concatenate((np.ones(len(full_ranges)), np.full(len(half_ranges), 0.5)))
+    return ranges, means, counts
+
+
+def rainflow_reference(x: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    参考实现: 逐点的四点法雨流计数,残余序列按半循环计
+    :return: (幅值, 均值, 计数)
+    """
+    ranges, means, residue = _four_point_stack(turning_points(x))
+    return _cycles(np.array(ranges), np.array(means), residue)
+
+
+def rainflow(x: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    向量化四点法雨流计数: 每一轮同时找出所有满足四点条件且互不重叠的内侧点对并一起消去,
+    雨流计数结果与消去顺序无关,因此与逐点算法结果相同; 消去效率过低时剩余部分改用顺序算法
+    :return: (幅值, 均值, 计数),全循环计数为1,残余半循环为0.5
+    """
+    y = turning_points(x)
+    full_ranges, full_means = [], []
+    while len(y) >= 4:
+        r = np.abs(np.diff(y))
+        inner = r[1:-1]
+        # 点对(i, i+1)满足 r[i] <= r[i-1] 且 r[i] <= r[i+1]
+        cand = (inner <= r[:-2]) & (inner <= r[2:])
+        # 共用一个点的相邻点对只保留前一个
+        cand[1:] &= ~cand[:-1]
+        nremove = int(cand.sum())
+        if nremove == 0:
+            break
+        i = np.flatnonzero(cand) + 1
+        full_ranges.append(inner[cand])
+        full_means.append(0.5 * (y[i] + y[i + 1]))
+        keep = np.ones(len(y), dtype=bool)
+        keep[i] = False
+        keep[i + 1] = False
+        y = y[keep]
+        if nremove < _MIN_PASS_FRACTION * len(y):
+            ranges, means, y = _four_point_stack(y)
+            full_ranges.append(np.array(ranges))
+            full_means.append(np.array(means))
+            break
+    full_ranges = np.concatenate(full_ranges) if full_ranges else np.empty(0)
+    full_means = np.concatenate(full_means) if full_means else np.empty(0)
+    return _cycles(full_ranges, full_means, y)
+
+
+def _slopes(m, nch: int) -> np.ndarray:
+    return np.broadcast_to(np.asarray(m, dtype=np.float64), (nch,))
+
+
+def fatigue_damage(data: np.ndarray, m: Union[float, Sequence[float]]) -> np.ndarray:
+    """
+    各通道的雨流损伤和 sum(n_i * S_i^m)
+    :param data: 一维时间序列或(行数, 通道数)数组
+    :param m: Wöhler曲线斜率,标量或每个通道一个
+    """
+    data = np.asarray(data, dtype=np.float64)
+    if data.ndim == 1:
+        data = data[:, None]
+    slopes = _slopes(m, data.shape[1])
+    damage = np.empty(data.shape[1])
+    for c in range(data.shape[1]):
+        ranges, _, counts = rainflow(data[:, c])
+        damage[c] = np.dot(counts, ranges ** slopes[c])
+    return damage
+
+
+def damage_equivalent_load(data: np.ndarray, m: Union[float, Sequence[float]], neq: float) -> np.ndarray:
+    """
+    等效疲劳载荷 DEL = (sum(n_i * S_i^m) / neq)^(1/m)
+    :param neq: 等效循环次数,如1Hz等效时取时间序列时长(秒)
+    """
+    data = np.asarray(data, dtype=np.float64)
+    nch = 1 if data.ndim == 1 else data.shape[1]
+    slopes = _slopes(m, nch)
+    return (fatigue_damage(data, slopes) / neq) ** (1.0 / slopes)
+
+
+def weibull_bin_probability(v_edges: Sequence[float], k: float, A: float) -> np.ndarray:
+    """
+    Weibull风速分布下各风速区间[v_edges[i], v_edges[i+1])的概率
+    :param k: 形状参数
+    :param A: 尺度参数(m/s)
+    """
+    v = np.asarray(v_edges, dtype=np.float64)
+    cdf = 1.0 - np.exp(-(v / A) ** k)
+    return np.diff(cdf)
+
+
+def lifetime_del(damages: np.ndarray, durations: Sequence[float], probabilities: Sequence[float],
+                 lifetime: float, m: Union[float, Sequence[float]], neq: float) -> np.ndarray:
+    """
+    按风速区间概率加权得到寿命期等效疲劳载荷
+    :param damages: (区间数, 通道数) 每个风速区间仿真得到的损伤和(同一区间多个种子可先求和)
+    :param durations: 每个区间对应的仿真总时长(秒)
+    :param probabilities: 每个区间的出现概率(如weibull_bin_probability)
+    :param lifetime: 寿命期时长(秒)
+    :param neq: 寿命期等效循环次数
+    """
+    damages = np.atleast_2d(np.asarray(damages, dtype=np.float64))
+    rate = damages / np.asarray(durations, dtype=np.float64)[:, None]
+    total = lifetime * (np.asarray(probabilities, dtype=np.float64)[:, None] * rate).sum(axis=0)
+    slopes = _slopes(m, damages.shape[1])
+    return (total / neq) ** (1.0 / slopes)
+
+
+def damage_out_file(path: str, channels: Sequence[str], m: Union[float, Sequence[float]]) -> Tuple[np.ndarray, float]:
+    """
+    计算一个.out文件中若干通道的损伤和
+    :return: (各通道损伤和, 仿真时长)
+    """
+    from HawtC_IO_Out import OUT
+    out = OUT(path)
+    data = out.load(list(channels) + [out.time_channel])
+    time = data[out.time_channel]
+    duration = float(time[-1] - time[0]) if len(time) > 1 else 0.0
+    block = np.column_stack([data[ch] for ch in channels])
+    return fatigue_damage(block, m), duration
+
+
+def damage_out_files(paths: Sequence[str], channels: Sequence[str], m: Union[float, Sequence[float]],
+                     workers: Optional[int] = None) -> Dict[str, Tuple[np.ndarray, float]]:
+    """
+    批量计算多个.out文件的损伤和,workers>1时使用多进程
+    :return: 文件路径 -> (各通道损伤和, 仿真时长)
+    """
+    paths = list(paths)
+    if workers is not None and workers <= 1:
+        return {p: damage_out_file(p, channels, m) for p in paths}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results: List = list(pool.map(damage_out_file, paths, [channels] * len(paths), [m] * len(paths)))
+    return dict(zip(paths, results))
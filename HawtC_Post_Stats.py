@@ -0,0 +1,232 @@
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# 默认输出的百分位数
+PERCENTILES = (1, 5, 25, 50, 75, 95, 99)
+
+
+def _rebin(counts, lo, width, new_lo, new_width):
+    """
+    将直方图从(lo, width)重新分箱到(new_lo, new_width)
+    箱宽均为2的整数次幂且起点为箱宽的整数倍,因此旧箱完整落在某个新箱内
+    """
+    nbins = len(counts)
+    idx = np.floor((lo + np.arange(nbins) * width - new_lo) / new_width).astype(np.int64)
+    new_counts = np.zeros_like(counts)
+    np.add.at(new_counts, np.clip(idx, 0, nbins - 1), counts)
+    return new_counts
+
+
+class HawtC_Stats:
+    """
+    单遍流式统计: 对多个通道同时累计均值、标准差、最小/最大值及其出现时刻、偏度、峰度和百分位数.
+    数据可以按块逐次送入(来自.out分块读取或步进循环中记录器的缓冲区),
+    各块、各进程的部分结果可用merge合并,结果与一次性计算整段数据一致(百分位数为直方图近似)
+
+    百分位数由每通道nbins个箱的自适应直方图给出,箱宽为2的整数次幂,
+    数据超出范围时箱宽翻倍,精度约为(最大值-最小值)/nbins
+    """
+    def __init__(self, channels: Sequence[str], nbins: int = 4096):
+        self.channels: List[str] = list(channels)
+        self.nbins = nbins
+        m = len(self.channels)
+        self.n = 0
+        self.mean = np.zeros(m)
+        self.m2 = np.zeros(m)
+        self.m3 = np.zeros(m)
+        self.m4 = np.zeros(m)
+        self.min = np.full(m, np.inf)
+        self.max = np.full(m, -np.inf)
+        self.tmin = np.full(m, np.nan)
+        self.tmax = np.full(m, np.nan)
+        self.hist = np.zeros((m, nbins), dtype=np.int64)
+        self.hist_lo = np.zeros(m)
+        self.hist_width = np.zeros(m)
+
+    def _moments_merge(self, nb, mean_b, m2_b, m3_b, m4_b):
+        """按Pébay公式合并两组中心矩"""
+        na = self.n
+        n = na + nb
+        delta = mean_b - self.mean
+        d_n = delta / n
+        self.m4 = (self.m4 + m4_b
+                   + delta * d_n ** 3 * na * nb * (na * na - na * nb + nb * nb)
+                   + 6 * d_n ** 2 * (na * na * m2_b + nb * nb * self.m2)
+                   + 4 * d_n * (na * m3_b - nb * self.m3))
+        self.m3 = (self.m3 + m3_b
+                   + delta * d_n ** 2 * na * nb * (na - nb)
+                   + 3 * d_n * (na * m2_b - nb * self.m2))
+        self.m2 = self.m2 + m2_b + delta * d_n * na * nb
+        self.mean = self.mean + d_n * nb
+        self.n = n
+
+    def _cover(self, c, vmin, vmax, min_width=0.0):
+        """扩展通道c的直方图,使其覆盖[vmin, vmax]且箱宽不小于min_width"""
+        nbins = self.nbins
+        width = self.hist_width[c]
+        if width == 0:
+            span = max(vmax - vmin, abs(vmax) * 1e-12, 1e-300)
+            width = 2.0 ** np.ceil(np.log2(span / (nbins // 2)))
+            width = max(width, min_width)
+            self.hist_width[c] = width
+            self.hist_lo[c] = np.floor(vmin / width) * width
+            return
+        lo = self.hist_lo[c]
+        new_lo, new_width = lo, width
+        while new_width < min_width or vmin < new_lo or vmax >= new_lo + new_width * nbins:
+            new_width *= 2
+            new_lo = np.floor(min(new_lo, vmin) / new_width) * new_width
+        if new_width != width:
+            self.hist[c] = _rebin(self.hist[c], lo, width, new_lo, new_width)
+            self.hist_lo[c] = new_lo
+            self.hist_width[c] = new_width
+
+    def update(self, block: np.ndarray, time: Optional[np.ndarray] = None):
+        """
+        送入一块数据
+        :param block: (行数, 通道数)数组,列顺序与channels一致
+        :param time: 每行对应的时刻,缺省时以累计样本序号代替
+        """
+        block = np.asarray(block, dtype=np.float64)
+        if block.ndim == 1:
+            block = block[None, :]
+        nb = len(block)
+        if nb == 0:
+            return self
+        if time is None:
+            time = np.arange(self.n, self.n + nb, dtype=np.float64)
+
+        # 极值及其时刻
+        imin = block.argmin(axis=0)
+        imax = block.argmax(axis=0)
+        cols = np.arange(block.shape[1])
+        bmin = block[imin, cols]
+        bmax = block[imax, cols]
+        lower = bmin < self.min
+        upper = bmax > self.max
+        self.min = np.where(lower, bmin, self.min)
+        self.tmin = np.where(lower, time[imin], self.tmin)
+        self.max = np.where(upper, bmax, self.max)
+        self.tmax = np.where(upper, time[imax], self.tmax)
+
+        # 直方图: 先保证范围覆盖,再一次bincount累加所有通道
+        for c in np.flatnonzero((bmin < self.hist_lo) | (bmax >= self.hist_lo + self.hist_width * self.nbins)
+                                | (self.hist_width == 0)):
+            self._cover(c, bmin[c], bmax[c])
+        idx = np.floor((block - self.hist_lo) / self.hist_width).astype(np.int64)
+        np.clip(idx, 0, self.nbins - 1, out=idx)
+        idx += cols * self.nbins
+        self.hist += np.bincount(idx.ravel(), minlength=self.hist.size).reshape(self.hist.shape)
+
+        # 中心矩
+        mean_b = block.mean(axis=0)
+        d = block - mean_b
+        d2 = d * d
+        self._moments_merge(nb, mean_b, d2.sum(axis=0), (d2 * d).sum(axis=0), (d2 * d2).sum(axis=0))
+        return self
+
+    def merge(self, other: 'HawtC_Stats'):
+        """合并另一组部分结果(同一组通道),返回自身"""
+        if other.channels != self.channels:
+            raise ValueError("合并的统计量通道不一致")
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            for name in ("n", "mean", "m2", "m3", "m4", "min", "max", "tmin", "tmax",
+                         "hist", "hist_lo", "hist_width"):
+                value = getattr(other, name)
+                setattr(self, name, value.copy() if isinstance(value, np.ndarray) else value)
+            return self
+
+        other_hist = other.hist.copy()
+        for c in range(len(self.channels)):
+            vmin = min(self.min[c], other.min[c])
+            vmax = max(self.max[c], other.max[c])
+            self._cover(c, vmin, vmax, other.hist_width[c])
+            if other.hist_width[c] != self.hist_width[c] or other.hist_lo[c] != self.hist_lo[c]:
+                other_hist[c] = _rebin(other_hist[c], other.hist_lo[c], other.hist_width[c],
+                                       self.hist_lo[c], self.hist_width[c])
+        self.hist += other_hist
+
+        # 极值相同时取较早出现的时刻
+        lower = (other.min < self.min) | ((other.min == self.min) & (other.tmin < self.tmin))
+        upper = (other.max > self.max) | ((other.max == self.max) & (other.tmax < self.tmax))
+        self.min = np.where(lower, other.min, self.min)
+        self.tmin = np.where(lower, other.tmin, self.tmin)
+        self.max = np.where(upper, other.max, self.max)
+        self.tmax = np.where(upper, other.tmax, self.tmax)
+        self._moments_merge(other.n, other.mean, other.m2, other.m3, other.m4)
+        return self
+
+    def percentile(self, q) -> np.ndarray:
+        """
+        各通道的百分位数(直方图内线性插值)
+        :param q: 百分位数,标量或序列,单位%
+        :return: (len(q), 通道数)
+        """
+        q = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        cum = np.cumsum(self.hist, axis=1)
+        result = np.empty((len(q), len(self.channels)))
+        for c in range(len(self.channels)):
+            target = q / 100.0 * self.n
+            k = np.clip(np.searchsorted(cum[c], target, 'left'), 0, self.nbins - 1)
+            before = np.where(k > 0, cum[c][k - 1], 0)
+            inside = np.maximum(self.hist[c][k], 1)
+            frac = np.clip((target - before) / inside, 0.0, 1.0)
+            value = self.hist_lo[c] + (k + frac) * self.hist_width[c]
+            result[:, c] = np.clip(value, self.min[c], self.max[c])
+        return result
+
+    @property
+    def std(self) -> np.ndarray:
+        """总体标准差"""
+        return np.sqrt(self.m2 / max(self.n, 1))
+
+    @property
+    def skewness(self) -> np.ndarray:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.sqrt(self.n) * self.m3 / self.m2 ** 1.5
+
+    @property
+    def kurtosis(self) -> np.ndarray:
+        """峰度(正态分布为3)"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.n * self.m4 / (self.m2 * self.m2)
+
+    def summary(self, percentiles: Sequence[float] = PERCENTILES) -> Dict[str, dict]:
+        """
+        汇总结果
+        :return: 通道名 -> {n, mean, std, min, tmin, max, tmax, skewness, kurtosis, p<q>...}
+        """
+        pct = self.percentile(percentiles) if self.n else np.full((len(percentiles), len(self.channels)), np.nan)
+        std, skew, kurt = self.std, self.skewness, self.kurtosis
+        result = {}
+        for c, name in enumerate(self.channels):
+            item = {
+                "n": self.n,
+                "mean": float(self.mean[c]),
+                "std": float(std[c]),
+                "min": float(self.min[c]),
+                "tmin": float(self.tmin[c]),
+                "max": float(self.max[c]),
+                "tmax": float(self.tmax[c]),
+                "skewness": float(skew[c]),
+                "kurtosis": float(kurt[c]),
+            }
+            for i, q in enumerate(percentiles):
+                item[f"p{q:g}"] = float(pct[i, c])
+            result[name] = item
+        return result
+
+    @classmethod
+    def from_out(cls, path: str, channels: Optional[Sequence[str]] = None, nbins: int = 4096) -> 'HawtC_Stats':
+        """对.out文件分块读取并统计,除时间通道外默认统计全部通道"""
+        from HawtC_IO_Out import OUT
+        out = OUT(path)
+        if channels is None:
+            channels = [ch for ch in out.channels if ch != out.time_channel]
+        stats = cls(channels, nbins)
+        for block in out.iter_blocks(list(channels) + [out.time_channel]):
+            stats.update(block[:, :-1], block[:, -1])
+        return stats
@@ -0,0 +1,120 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+import numpy as np
+
+# 队列结束标记
+_DONE = object()
+
+
+class HawtC_AsyncSession:
+    """
+    HawtC的异步会话: 所有DLL调用都在一个专用工作线程中串行执行,
+    ctypes在调用外部函数期间释放GIL,因此求解时事件循环中的控制器通信、日志与结果写出可以并发进行
+
+    用法:
+        session = HawtC_AsyncSession(sim)
+        await session.ini(path)
+        async for n, t, state in session.run(1000, 0.05, gather=lambda: sim.snapshot(0).data):
+            ...
+    """
+    def __init__(self, sim, queue_size: int = 8):
+        self.sim = sim
+        self.queue_size = queue_size
+        self.steps = 0
+        self.t = 0.0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="HawtC")
+
+    async def call(self, func: Callable, *args):
+        """在工作线程中执行任意DLL相关调用(如取值函数、快照)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def ini(self, path: str):
+        await self.call(self.sim.HawtC_S_INI, path)
+
+    async def solve(self):
+        await self.call(self.sim.HawtC_Solve)
+
+    async def close(self, turbinenum: int = 0):
+        await self.call(self.sim.HawtC_S_Close, turbinenum)
+
+    async def step(self, t: float):
+        """推进到时刻t"""
+        await self.call(self.sim.HawtC_S_Update_Step, self.steps, t)
+        self.steps += 1
+        self.t = t
+
+    def _step_and_gather(self, t: float, gather: Optional[Callable]):
+        """工作线程中执行: 步进后立即读取状态,避免两次线程切换"""
+        self.sim.HawtC_S_Update_Step(self.steps, t)
+        return gather() if gather is not None else None
+
+    async def run(self, nsteps: int, dt: float, gather: Optional[Callable] = None):
+        """
+        异步生成器,以固定步长推进nsteps步,逐步产出(步数, 时刻, 状态)
+        求解在后台持续进行,最多领先消费者queue_size步(背压),提前退出async for时后台求解随之停止
+        gather返回numpy数组时会拷贝到预分配的轮换缓冲区中,产出的数组在之后queue_size+1次迭代内保持有效
+        """
+        loop = asyncio.get_running_loop()
+        # 队列本身不限长度,由信号量限制领先的步数;结束标记和异常不占用名额,放入时不会等待
+        queue: asyncio.Queue = asyncio.Queue()
+        slots = asyncio.Semaphore(self.queue_size)
+        pool = []
+
+        async def produce():
+            try:
+                for k in range(nsteps):
+                    t = self.t + dt
+                    state = await loop.run_in_executor(self._executor, self._step_and_gather, t, gather)
+                    self.steps += 1
+                    self.t = t
+                    if isinstance(state, np.ndarray):
+                        if not pool:
+                            pool.extend(np.empty_like(state) for _ in range(self.queue_size + 2))
+                        buf = pool[k % len(pool)]
+                        buf[...] = state
+                        state = buf
+                    await slots.acquire()
+                    queue.put_nowait((self.steps - 1, t, state))
+                queue.put_nowait(_DONE)
+            except asyncio.CancelledError:
+                # 消费者已离开,不再写队列
+                raise
+            except BaseException as exc:
+                queue.put_nowait(exc)
+                raise
+
+        producer = asyncio.ensure_future(produce())
+        try:
+            while True:
+                item = await queue.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                slots.release()
+                yield item
+        finally:
+            if not producer.done():
+                producer.cancel()
+            # asyncio.wait不抛出生产者的异常(已经通过队列交给消费者),调用方自身被取消时照常抛出CancelledError
+            await asyncio.wait({producer})
+            if not producer.cancelled():
+                producer.exception()
+
+    def shutdown(self):
+        """关闭工作线程(阻塞直到正在执行的DLL调用返回,不要在事件循环中直接调用)"""
+        self._executor.shutdown(wait=True)
+
+    async def aclose(self):
+        """关闭工作线程,等待正在执行的DLL调用返回期间不阻塞事件循环"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.shutdown)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
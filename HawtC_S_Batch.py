@@ -0,0 +1,234 @@
+import json
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from multiprocessing.connection import wait
+from typing import Callable, Dict, Iterable, Optional, Sequence
+
+logger = logging.getLogger('HawtC_S_Batch')
+
+
+def _run_case(dll_path: str, hst_path: str):
+    """
+    子进程入口: 独立加载HawtC.dll并完整求解一个工况
+    DLL内部保存全局仿真状态,因此每个工况必须在单独的进程中运行
+    """
+    from HawtC_S_Simulation import HawtC
+    sim = HawtC(dll_path)
+    sim.HawtC_S_INI(hst_path)
+    sim.HawtC_Solve()
+    sim.HawtC_S_Close(0)
+
+
+def _run_in_dir(workdir: str, target, dll_path: str, hst_path: str):
+    """子进程入口: 切换到工况自己的工作目录(DLL日志写在当前目录下)后运行target"""
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+    target(dll_path, hst_path)
+
+
+def case_workdir(hst_path: str) -> str:
+    """工况的默认工作目录: 与.hst同目录的<工况名>.run"""
+    return os.path.splitext(hst_path)[0] + ".run"
+
+
+class HawtC_Ledger:
+    """
+    工况完成记录(JSON Lines格式),每完成一个工况追加一行并立即落盘,
+    中断后重新运行时跳过已完成的工况
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.records: Dict[str, dict] = {}
+        # 进程被强制终止时最后一行可能没有换行,下一条记录需另起一行
+        self._newline = False
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                if f.seek(0, os.SEEK_END):
+                    f.seek(-1, os.SEEK_END)
+                    self._newline = f.read(1) != b"\n"
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # 进程被强制终止时最后一行可能不完整
+                        logger.warning(f"忽略损坏的记录行: {line[:80]}")
+                        continue
+                    self.records[record["case"]] = record
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def is_done(self, case: str) -> bool:
+        record = self.records.get(case)
+        return record is not None and record["status"] == "done"
+
+    def append(self, record: dict):
+        self.records[record["case"]] = record
+        with open(self.path, 'a', encoding='utf-8') as f:
+            if self._newline:
+                f.write("\n")
+                self._newline = False
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class HawtC_BatchRunner:
+    """
+    多进程批量工况求解器: 每个.hst工况在独立子进程中调用HawtC_S_INI/HawtC_S_Solve/HawtC_S_Close,
+    支持并行进程数、单工况超时、崩溃重试,并通过完成记录实现断点续算.
+    给出结果库store时,输入未变化的工况直接命中结果库(状态为"cached"),
+    新完成的工况将outputs指定的.out文件(相对.hst所在目录的通配符)存入结果库.
+    watch_log为True时每个工况在自己的工作目录(workdir(case),默认为case_workdir)中运行,
+    启动前将上一次运行的日志改名为.prev,运行期间每log_interval秒增量读取其DLL日志,出现错误时立即终止该工况(状态为"error",不重试),
+    正常退出但日志中有错误的工况同样记为"error"
+    """
+    def __init__(self, dll_path: str, ledger_path: str, workers: Optional[int] = None,
+                 timeout: Optional[float] = None, retries: int = 1, target=_run_case,
+                 store=None, outputs: Sequence[str] = (), watch_log: bool = False,
+                 workdir: Callable[[str], str] = case_workdir, log_interval: float = 0.2):
+        self.dll_path = dll_path
+        self.ledger = HawtC_Ledger(ledger_path)
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.retries = retries
+        # 子进程入口,必须是可被spawn导入的模块级函数 target(dll_path, hst_path)
+        self.target = target
+        # 结果库(HawtC_ResultStore)及需要保存的结果文件
+        self.store = store
+        self.outputs = list(outputs)
+        self.watch_log = watch_log
+        self.workdir = workdir
+        self.log_interval = log_interval
+        self._ctx = multiprocessing.get_context("spawn")
+
+    def run(self, cases: Iterable[str]) -> Dict[str, str]:
+        """
+        求解全部工况
+        :param cases: .hst文件路径
+        :return: 工况路径 -> "done"/"cached"/"failed"/"timeout"/"error"
+        """
+        results = {}
+        pending = deque()
+        keys = {}
+        for case in cases:
+            case = os.path.abspath(case)
+            if case in results:
+                continue
+            if self.ledger.is_done(case):
+                results[case] = "done"
+                continue
+            if self.store is not None:
+                # 启动前计算键,结果对应的是提交时的输入
+                keys[case] = self.store.key(case, self.dll_path)
+                if keys[case] in self.store:
+                    results[case] = "cached"
+                    continue
+            results[case] = None
+            pending.append((case, 1))
+        skipped = len(results) - len(pending)
+        if skipped:
+            logger.info(f"跳过已完成工况 {skipped} 个")
+
+        running = {}  # sentinel -> (process, case, attempt, start)
+        monitors = {}  # sentinel -> HawtC_LogMonitor
+        while pending or running:
+            while pending and len(running) < self.workers:
+                case, attempt = pending.popleft()
+                proc, monitor = self._start(case)
+                running[proc.sentinel] = (proc, case, attempt, time.monotonic())
+                if monitor is not None:
+                    monitors[proc.sentinel] = monitor
+
+            ready = wait(list(running), timeout=self._wait_timeout(running))
+            now = time.monotonic()
+            for sentinel in list(running):
+                proc, case, attempt, start = running[sentinel]
+                monitor = monitors.get(sentinel)
+                if monitor is not None:
+                    monitor.poll()
+                if sentinel in ready:
+                    proc.join()
+                    status = "done" if proc.exitcode == 0 else "failed"
+                    if monitor is not None and monitor.failed:
+                        status = "error"
+                elif monitor is not None and monitor.failed:
+                    # DLL报错后可能停在当前步不再返回,不必等到超时
+                    proc.kill()
+                    proc.join()
+                    status = "error"
+                elif self.timeout is not None and now - start > self.timeout:
+                    proc.kill()
+                    proc.join()
+                    status = "timeout"
+                else:
+                    continue
+                del running[sentinel]
+                monitors.pop(sentinel, None)
+                proc.close()
+
+                record = {"case": case, "status": status, "attempts": attempt,
+                          "elapsed": round(now - start, 3), "finished": time.time()}
+                if status == "error":
+                    # 输入或许可证错误,重试结果相同
+                    record["error"] = monitor.error_message()
+                    logger.error(f"工况{case}运行出错: {record['error']}")
+                    results[case] = status
+                    self.ledger.append(record)
+                    continue
+                if status != "done" and attempt <= self.retries:
+                    logger.warning(f"工况{case}第{attempt}次运行{status},重试")
+                    pending.append((case, attempt + 1))
+                    continue
+                if status != "done":
+                    logger.error(f"工况{case}运行{status}")
+                elif case in keys:
+                    self._store_outputs(case, keys[case])
+                results[case] = status
+                self.ledger.append(record)
+        return results
+
+    def _start(self, case: str):
+        """启动工况子进程,watch_log时同时返回其日志监视器"""
+        if not self.watch_log:
+            proc = self._ctx.Process(target=self.target, args=(self.dll_path, case), daemon=True)
+            proc.start()
+            return proc, None
+        from HawtC_S_Log import LOG_NAME, HawtC_LogMonitor, rotate_log
+        workdir = os.path.abspath(self.workdir(case))
+        log_path = os.path.join(workdir, LOG_NAME)
+        # 子进程尚未加载DLL,上一次运行(包括本工况之前的尝试)留下的日志改名保留,
+        # 即使本次写出的日志与之完全相同也会从头读取
+        rotate_log(log_path)
+        monitor = HawtC_LogMonitor(log_path)
+        proc = self._ctx.Process(target=_run_in_dir, args=(workdir, self.target, os.path.abspath(self.dll_path), case),
+                                 daemon=True)
+        proc.start()
+        return proc, monitor
+
+    def _store_outputs(self, case: str, key: str):
+        """将工况的结果文件存入结果库,失败时只记录警告"""
+        from HawtC_S_ResultStore import output_files
+        files = output_files(case, self.outputs)
+        if not files:
+            logger.warning(f"工况{case}没有找到需要保存的结果文件")
+            return
+        try:
+            self.store.put_outputs(key, files, info={"hst": case})
+        except (OSError, ValueError) as exc:
+            logger.warning(f"工况{case}的结果未能存入结果库: {exc}")
+
+    def _wait_timeout(self, running) -> Optional[float]:
+        """计算下一次需要检查超时或读取日志的等待时间"""
+        interval = self.log_interval if self.watch_log else None
+        if self.timeout is None:
+            return interval
+        now = time.monotonic()
+        remaining = max(min(start + self.timeout - now for _, _, _, start in running.values()), 0.0) + 0.01
+        return remaining if interval is None else min(remaining, interval)
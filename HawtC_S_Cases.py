@@ -0,0 +1,245 @@
+import hashlib
+import itertools
+import json
+import logging
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger('HawtC_S_Cases')
+
+# 输出目录中记录已生成文件的清单: 文件名 -> [摘要, 大小, 修改时间]
+MANIFEST_NAME = ".cases.json"
+
+
+def format_value(value) -> str:
+    """
+    将参数值转换为节点值: 浮点数使用repr保证读回后数值不变,
+    列表/数组每个元素(或每行)写成一个"-  "列表项
+    """
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (bool, np.bool_)):
+        return "true" if value else "false"
+    if isinstance(value, (float, np.floating)):
+        return repr(float(value))
+    if isinstance(value, (int, np.integer)):
+        return str(int(value))
+    rows = []
+    for row in value:
+        if isinstance(row, str) or np.ndim(row) == 0:
+            rows.append("-  " + format_value(row))
+        else:
+            rows.append("-  " + " ".join(format_value(v) for v in row))
+    return "\n".join(rows)
+
+
+# ---------------------------------------------------------------------- 采样方案
+def grid(params: Dict[str, Sequence]) -> Iterator[Dict[str, object]]:
+    """全因子网格: 依次产生各参数取值的全部组合(最后一个参数变化最快)"""
+    keys = list(params)
+    for combo in itertools.product(*(params[k] for k in keys)):
+        yield dict(zip(keys, combo))
+
+
+def latin_hypercube(ranges: Dict[str, Tuple[float, float]], n: int,
+                    seed: Optional[int] = None) -> Iterator[Dict[str, float]]:
+    """
+    拉丁超立方采样: 每个参数的区间[lo, hi]等分为n份,每份恰好取一个点
+    :param ranges: 参数 -> (lo, hi)
+    """
+    rng = np.random.default_rng(seed)
+    keys = list(ranges)
+    bounds = np.array([ranges[k] for k in keys], dtype=np.float64).reshape(-1, 2)
+    # (n, 参数数)的单位采样,每列是[0,1)上分层后打乱的点
+    unit = (np.argsort(rng.random((n, len(keys))), axis=0) + rng.random((n, len(keys)))) / n
+    samples = bounds[:, 0] + unit * (bounds[:, 1] - bounds[:, 0])
+    for row in samples.tolist():
+        yield dict(zip(keys, row))
+
+
+def explicit(cases: Iterable[Dict[str, object]]) -> Iterator[Dict[str, object]]:
+    """显式给出的工况列表"""
+    for case in cases:
+        yield dict(case)
+
+
+# ---------------------------------------------------------------------- 生成
+class _Join:
+    """推迟拼接的工况文本(在写文件的线程中调用)"""
+    __slots__ = ('template', 'changes')
+
+    def __init__(self, template, changes):
+        self.template = template
+        self.changes = changes
+
+    def __call__(self) -> str:
+        return self.template.join(self.changes)
+
+
+class HawtC_CaseGenerator:
+    """
+    由YML/.hst模板和采样方案生成参数化工况文件:
+    逐个渲染变体(只替换修改键的文本片段,见HawtC_IO.YMLTemplate),按内容摘要去重,
+    并由线程池并行写出;输出目录中内容未变的文件不重写,重复运行只写新增或变化的工况.
+    注意模板中的相对路径在生成的文件中相对输出目录解析
+
+    gen = HawtC_CaseGenerator("base.hst", "./cases")
+    for case in gen.generate(grid({"Wind.Speed": [4, 8, 12], "Wave.Hs": [1.0, 2.0]})):
+        print(case["path"], case["status"])
+    """
+    def __init__(self, template, out_dir: str, name_format: str = "case_{index:06d}{ext}",
+                 workers: int = 8, max_pending: int = 256):
+        """
+        :param template: 模板文件路径或HawtC_IO.YML对象
+        :param name_format: 文件名格式,可用字段index(工况序号)、digest(内容摘要)、ext(模板扩展名)
+        :param workers: 写文件的线程数
+        :param max_pending: 最多同时等待写出的文件数,限制渲染结果占用的内存
+        """
+        from HawtC_IO import YML
+        if isinstance(template, str):
+            template = YML(template, readonly=True)
+        self.template = template.template()
+        self.ext = os.path.splitext(template.path or "")[1] or ".yml"
+        self.out_dir = os.path.abspath(out_dir)
+        self.name_format = name_format
+        self.workers = workers
+        self.max_pending = max_pending
+        self.manifest_path = os.path.join(self.out_dir, MANIFEST_NAME)
+        # 模板内容摘要,模板变化后所有工况的摘要都随之变化
+        self._template_digest = hashlib.blake2b(self.template.join([]).encode('utf-8'),
+                                                digest_size=16).digest()
+
+    def render(self, params: Dict[str, object]) -> str:
+        """渲染一个工况的文件内容"""
+        return self.template.render(self._values(params))
+
+    @staticmethod
+    def _values(params: Dict[str, object]) -> Dict[str, str]:
+        return {k: format_value(v) for k, v in params.items()}
+
+    def _plan(self, plan: Iterable[Dict[str, object]]) -> Iterator[Tuple[dict, object]]:
+        """
+        逐个计算工况的内容摘要并去重,文本推迟到需要写出时再拼接:
+        只修改已有键时摘要由模板摘要和改动的片段计算,与文件长度无关
+        :return: (工况信息, 生成文本的函数)
+        """
+        template = self.template
+        seen: Dict[str, int] = {}
+        for index, params in enumerate(plan):
+            values = self._values(params)
+            changes = template.changes(values)
+            digest = hashlib.blake2b(self._template_digest, digest_size=16)
+            if changes is None:
+                text = template.render(values)
+                digest.update(b"\0full\0" + text.encode('utf-8'))
+                render = text.__str__
+            else:
+                for position, block in changes:
+                    digest.update(f"\0{position}\0{block}".encode('utf-8'))
+                render = _Join(template, changes)
+            digest = digest.hexdigest()
+            first = seen.setdefault(digest, index)
+            yield ({"index": index, "params": params, "digest": digest,
+                    "duplicate_of": None if first == index else first}, render)
+
+    def cases(self, plan: Iterable[Dict[str, object]]) -> Iterator[dict]:
+        """
+        逐个渲染工况(不写文件),内容相同的工况摘要相同
+        :return: {"index", "params", "digest", "duplicate_of", "text"}
+        """
+        for case, render in self._plan(plan):
+            case["text"] = render()
+            yield case
+
+    def _load_manifest(self) -> Dict[str, list]:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, manifest: Dict[str, list]):
+        tmp_path = f"{self.manifest_path}.tmp{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+
+    @staticmethod
+    def _is_unchanged(path: str, record: Optional[list], digest: str) -> bool:
+        """清单中记录的摘要相同且文件的大小、修改时间未变"""
+        if record is None or record[0] != digest:
+            return False
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        return [stat.st_size, stat.st_mtime_ns] == record[1:]
+
+    @staticmethod
+    def _write(path: str, render) -> list:
+        data = render().encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(data)
+        stat = os.stat(path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def generate(self, plan: Iterable[Dict[str, object]]) -> Iterator[dict]:
+        """
+        渲染并写出工况文件,按工况顺序逐个返回
+        :return: {"index", "params", "digest", "path", "status"},
+                 status为"written"(新写出)、"unchanged"(已存在且内容相同)或"duplicate"(与前面的工况内容相同)
+        """
+        os.makedirs(self.out_dir, exist_ok=True)
+        manifest = self._load_manifest()
+        paths: Dict[str, str] = {}  # 摘要 -> 文件路径
+        pending = deque()
+        try:
+            with ThreadPoolExecutor(self.workers) as pool:
+                for case, render in self._plan(plan):
+                    digest = case["digest"]
+                    if case["duplicate_of"] is not None:
+                        case["path"], case["status"] = paths[digest], "duplicate"
+                        pending.append((case, None, None))
+                    else:
+                        name = self.name_format.format(index=case["index"], digest=digest, ext=self.ext)
+                        path = case["path"] = paths[digest] = os.path.join(self.out_dir, name)
+                        if self._is_unchanged(path, manifest.get(name), digest):
+                            case["status"] = "unchanged"
+                            pending.append((case, None, None))
+                        else:
+                            case["status"] = "written"
+                            future = pool.submit(self._write, path, render)
+                            pending.append((case, name, future))
+                    # 按顺序返回已完成的工况,等待写出的文件过多时阻塞
+                    while pending and (len(pending) > self.max_pending or
+                                       pending[0][2] is None or pending[0][2].done()):
+                        yield self._finish(pending.popleft(), manifest)
+                while pending:
+                    yield self._finish(pending.popleft(), manifest)
+        finally:
+            self._save_manifest(manifest)
+
+    @staticmethod
+    def _finish(item, manifest: Dict[str, list]) -> dict:
+        case, name, future = item
+        if future is not None:
+            manifest[name] = [case["digest"]] + future.result()
+        return case
+
+    def write(self, plan: Iterable[Dict[str, object]]) -> Dict[str, Union[int, list]]:
+        """
+        写出全部工况
+        :return: 各状态的工况数,以及去重后的文件列表files
+        """
+        summary = {"written": 0, "unchanged": 0, "duplicate": 0, "files": []}
+        for case in self.generate(plan):
+            summary[case["status"]] += 1
+            if case["status"] != "duplicate":
+                summary["files"].append(case["path"])
+        logger.info(f"生成工况: 新写出{summary['written']}个,未变化{summary['unchanged']}个,"
+                    f"重复{summary['duplicate']}个")
+        return summary
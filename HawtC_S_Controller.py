@@ -0,0 +1,81 @@
+import ctypes
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+# DLL侧的控制器回调签名:
+# void controller(int turbnum, int times_n, double t, double* state, int nstate, double* command, int ncommand)
+# 指针参数声明为c_void_p,回调中直接得到整数地址,避免每步构造指针对象
+HAWTC_CONTROLLER_CALLBACK = ctypes.CFUNCTYPE(
+    None, ctypes.c_int, ctypes.c_int, ctypes.c_double,
+    ctypes.c_void_p, ctypes.c_int, ctypes.c_void_p, ctypes.c_int)
+
+
+class HawtC_Controller(ABC):
+    """
+    Python控制器基类,子类实现update即可
+    state为DLL打包的风机状态,command为控制指令(如变桨角、发电机转矩),二者均为零拷贝的numpy视图,
+    只在本次调用期间有效,需要保留时请自行拷贝
+    """
+    @abstractmethod
+    def update(self, turbnum: int, t: float, state: np.ndarray, command: np.ndarray):
+        """每台风机每步调用一次,直接写入command修改控制指令"""
+
+
+class HawtC_ControllerBridge:
+    """
+    控制器与DLL之间的桥接: 创建并持有CFUNCTYPE回调,每台风机的state/command各缓存最近一次的numpy视图,
+    回调中的异常在本步结束后由HawtC_S_Update_Step抛出,HawtC_Solve中的异常在求解结束后抛出
+    """
+    def __init__(self, sim, controller):
+        self.sim = sim
+        self.controller = controller
+        self.error = None
+        self.calls = 0
+        # (风机编号, 参数序号) -> (地址, 长度, 视图)
+        self._views = {}
+        # 回调对象必须在整个会话期间保持引用
+        self._trampoline = HAWTC_CONTROLLER_CALLBACK(self._on_step)
+
+    def _view(self, slot, address, n):
+        """
+        返回地址address处长度为n的double数组视图;DLL复用同一缓冲区时无需重新创建,
+        地址或长度变化(DLL每步重新分配缓冲区)时替换该参数缓存的视图,不保留指向已释放内存的视图
+        """
+        cached = self._views.get(slot)
+        if cached is not None and cached[0] == address and cached[1] == n:
+            return cached[2]
+        if address is None or n <= 0:
+            view = np.empty(0)
+        else:
+            view = np.ctypeslib.as_array((ctypes.c_double * n).from_address(address))
+        self._views[slot] = (address, n, view)
+        return view
+
+    def _on_step(self, turbnum, times_n, t, state, nstate, command, ncommand):
+        self.calls += 1
+        try:
+            self.controller.update(turbnum, t, self._view((turbnum, 0), state, nstate),
+                                   self._view((turbnum, 1), command, ncommand))
+        except BaseException as exc:  # 异常不能穿过C栈,留到步进结束后抛出
+            if self.error is None:
+                self.error = exc
+
+    def raise_error(self):
+        """抛出回调中保存的异常(只抛出一次)"""
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def __call__(self, times_n, t):
+        self.raise_error()
+
+    def attach(self):
+        self.sim.api.HawtC_S_SetController(ctypes.cast(self._trampoline, ctypes.c_void_p))
+        self.sim.step_hooks.append(self)
+        return self
+
+    def detach(self):
+        if self in self.sim.step_hooks:
+            self.sim.step_hooks.remove(self)
+        self._views.clear()
@@ -0,0 +1,117 @@
+import time
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from HawtC_S_Snapshot import HawtC_Snapshot
+
+
+class HawtC_Farm:
+    """
+    多风机同步步进驱动: 依次初始化N台风机(第i个.hst文件对应风机编号i),
+    每个时间步调用一次HawtC_S_Update_Step推进全部风机,随后一次遍历读取所有风机状态,
+    结果以(n_turbines, ...)形状的数组给出,便于尾流/控制耦合代码直接做向量化计算
+    """
+    def __init__(self, sim, hst_paths: List[str], nblade: int = 3, nsection: int = 1, ntower: int = 1):
+        self.sim = sim
+        self.n_turbines = len(hst_paths)
+        for path in hst_paths:
+            sim.HawtC_S_INI(path)
+
+        n = self.n_turbines
+        size = HawtC_Snapshot.size(nblade, nsection, ntower)
+        self.data = np.zeros((n, size))
+        self.snapshots = [HawtC_Snapshot(sim.api, i, nblade, nsection, ntower, data=self.data[i])
+                          for i in range(n)]
+        # 整场的数组均为self.data的视图,列布局与单台风机快照一致
+        offsets = np.cumsum((0,) + HawtC_Snapshot._sizes(nblade, nsection, ntower))
+        views = [self.data[:, offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+        self.blade = views[0].reshape(n, nblade, nsection, 6)
+        self.blade_root = views[1].reshape(n, nblade, 6)
+        self.tower = views[2].reshape(n, ntower, 6)
+        self.tower_base = views[3]
+        self.platform = views[4].reshape(n, 3, 6)
+        self._calls = [call for snap in self.snapshots for call in snap._calls]
+        # 按元素写入整场数组的视图,读取状态时不分配临时列表
+        self._flat = memoryview(self.data.reshape(-1))
+
+        self.steps = 0
+        self.t = 0.0
+        self._time_step = 0.0    # HawtC_S_Update_Step累计耗时
+        self._time_gather = 0.0  # 状态读取累计耗时
+        self._time_couple = 0.0  # 耦合回调累计耗时
+
+    def rebind(self, api):
+        """api的函数被替换(如开启计时)后重新生成全部风机的调用计划"""
+        for snap in self.snapshots:
+            snap.rebind(api)
+        self._calls = [call for snap in self.snapshots for call in snap._calls]
+        return self
+
+    def gather(self):
+        """一次遍历读取所有风机的状态到共享数组"""
+        flat = self._flat
+        for i, call in enumerate(self._calls):
+            flat[i] = call()
+        return self
+
+    def step(self, t: float, coupling: Optional[Callable] = None):
+        """
+        推进到时刻t并读取全场状态
+        :param coupling: 可选的耦合回调 coupling(farm, t),在读取状态后调用
+        """
+        t0 = time.perf_counter()
+        self.sim.HawtC_S_Update_Step(self.steps, t)
+        t1 = time.perf_counter()
+        self.gather()
+        t2 = time.perf_counter()
+        if coupling is not None:
+            coupling(self, t)
+        t3 = time.perf_counter()
+        self._time_step += t1 - t0
+        self._time_gather += t2 - t1
+        self._time_couple += t3 - t2
+        self.steps += 1
+        self.t = t
+        return self
+
+    def run(self, nsteps: int, dt: float, coupling: Optional[Callable] = None):
+        """以固定步长推进nsteps步"""
+        for _ in range(nsteps):
+            self.step(self.t + dt, coupling)
+        return self
+
+    def overhead(self) -> dict:
+        """
+        每步平均耗时统计(微秒),gather_per_turbine_us随风机数增长应保持近似不变
+        """
+        steps = max(self.steps, 1)
+        return {
+            "n_turbines": self.n_turbines,
+            "steps": self.steps,
+            "step_us": self._time_step / steps * 1e6,
+            "gather_us": self._time_gather / steps * 1e6,
+            "gather_per_turbine_us": self._time_gather / steps / self.n_turbines * 1e6,
+            "coupling_us": self._time_couple / steps * 1e6,
+        }
+
+    def close(self):
+        """释放全部风机"""
+        for i in range(self.n_turbines):
+            self.sim.HawtC_S_Close(i)
+
+
+if __name__ == "__main__":
+    # 用法: python HawtC_S_Farm.py <dll路径> <hst路径> [最大风机数]
+    import sys
+    from HawtC_S_Simulation import HawtC
+
+    dll_path, hst_path = sys.argv[1], sys.argv[2]
+    max_n = int(sys.argv[3]) if len(sys.argv) > 3 else 16
+    n = 1
+    while n <= max_n:
+        farm = HawtC_Farm(HawtC(dll_path), [hst_path] * n, nsection=20, ntower=10)
+        farm.run(200, 0.05)
+        print(farm.overhead())
+        farm.close()
+        n *= 2
@@ -0,0 +1,286 @@
+import logging
+import os
+import re
+import threading
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+logger = logging.getLogger('HawtC_S_Log')
+
+# DLL在当前工作目录下写出的日志文件名
+LOG_NAME = "OpenWECD.HawtC2.log"
+# 用于判断日志是否被原地重写的已读内容末尾字节数
+_TAIL = 64
+
+# HawtC2.C DLL Vision:VVSCODE CALL_Release_x64,BuildAt: 2024.11.27 Math:SIMD@zzz
+_BUILD = re.compile(r"Vision:\s*(?P<version>.*?)\s*,\s*BuildAt:\s*(?P<date>\S+)(?:\s+Math:\s*(?P<math>\S+))?")
+# [Message]: Cant find MKL acc
+_BACKEND_MISSING = re.compile(r"(?:Can'?t|Cannot|Can not)\s+find\s+(?P<name>\S+)\s+acc\b", re.IGNORECASE)
+# 其他"... <名称> acc"形式的加速库信息,视为已加载
+_BACKEND = re.compile(r"(?P<name>[A-Za-z][\w.+-]*)\s+acc\b")
+_LICENSE_DATE = re.compile(r"Lic at\s+(?P<date>\d{4}-\d{1,2}-\d{1,2})")
+_ERROR = re.compile(r"ERROR!?\s*:?\s*(?P<message>.*)")
+_TAG = re.compile(r"^\s*\[(?P<tag>\w+)\]\s*:?\s*(?P<text>.*)$")
+
+
+def rotate_log(path: str = LOG_NAME) -> Optional[str]:
+    """
+    将上一次运行留下的日志改名为<path>.prev,本次运行的日志从头读取;
+    只能在DLL打开日志之前调用(如工况子进程启动前)
+    :return: 改名后的路径,日志不存在时为None
+    """
+    previous = path + ".prev"
+    try:
+        os.replace(path, previous)
+    except FileNotFoundError:
+        return None
+    return previous
+
+
+class HawtC_RunError(RuntimeError):
+    """DLL日志中出现错误(ERROR!或RUN.ERROR)"""
+    def __init__(self, message: str, events: List['LogEvent'] = ()):
+        super().__init__(message)
+        self.events = list(events)
+
+
+class LogEvent(NamedTuple):
+    """
+    日志事件
+    kind: header/build/license/contact/backend/message/warning/error/run_error/info
+    data: build为{version, date, math};backend为{name, available};license为{ok, holder, date};error为{message}
+    """
+    kind: str
+    text: str
+    line: int
+    data: dict
+
+
+def parse_line(text: str, line: int = 0) -> LogEvent:
+    """解析日志中的一行"""
+    stripped = text.strip()
+    compact = stripped.replace(" ", "")
+    if "RUN.ERROR" in compact.upper():
+        return LogEvent("run_error", stripped, line, {})
+    if stripped.startswith("ERROR") or " ERROR!" in text or stripped.startswith("ERROR!"):
+        match = _ERROR.search(stripped)
+        return LogEvent("error", stripped, line, {"message": match.group("message").strip() if match else stripped})
+    match = _BUILD.search(stripped)
+    if match:
+        return LogEvent("build", stripped, line, {k: v for k, v in match.groupdict().items() if v is not None})
+    match = _BACKEND_MISSING.search(stripped)
+    if match:
+        return LogEvent("backend", stripped, line, {"name": match.group("name"), "available": False})
+    tag = _TAG.match(stripped)
+    body = tag.group("text") if tag else stripped
+    if "许可" in body or "Licens" in body or "Licensd" in body:
+        ok = not any(word in body for word in ("错误", "过期", "无效", "失败", "invalid", "expired"))
+        data = {"ok": ok}
+        date = _LICENSE_DATE.search(body)
+        if date:
+            data["date"] = date.group("date")
+        if ":" in body and "Licensd" in body:
+            data["holder"] = body.split(":", 1)[1].split(" - ")[0].strip()
+        return LogEvent("license", stripped, line, data)
+    match = _BACKEND.search(body)
+    if match and tag:
+        return LogEvent("backend", stripped, line, {"name": match.group("name"), "available": True})
+    if stripped.startswith("-") and "Log file" in stripped:
+        return LogEvent("header", stripped, line, {})
+    if "Tel:" in stripped or "http" in stripped or stripped.startswith(">"):
+        return LogEvent("contact", stripped, line, {})
+    if tag:
+        kind = "warning" if tag.group("tag").lower().startswith("warn") else "message"
+        return LogEvent(kind, stripped, line, {})
+    return LogEvent("info", stripped, line, {})
+
+
+class HawtC_LogMonitor:
+    """
+    OpenWECD.HawtC2.log的增量读取与解析: 记录已读取的字节位置,每次poll()只读取新追加的完整行;
+    文件被截断、重新创建或原地重写(已读内容的末尾字节发生变化,或长度不变而修改时间变化,
+    如同一工况再次运行写出完全相同的日志)时从头读取.
+    解析结果汇总为build(版本信息)、backends(各加速库是否可用)、license和errors,
+    可在步进回调中定期检查(见HawtC.watch_log),也可用start()在后台线程中监视
+    """
+    def __init__(self, path: str = LOG_NAME, on_event: Optional[Callable[[LogEvent], None]] = None):
+        self.path = os.path.abspath(path)
+        self.on_event = on_event
+        self.events: List[LogEvent] = []
+        self.build: Dict[str, str] = {}
+        self.backends: Dict[str, bool] = {}
+        self.license: Dict[str, object] = {}
+        self.errors: List[LogEvent] = []
+        self._offset = 0
+        self._partial = b""
+        self._line = 0
+        self._identity = None
+        self._mtime = None
+        self._tail = b""
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    # ------------------------------------------------------------------ 读取
+    def _reset(self):
+        self.events.clear()
+        self.build.clear()
+        self.backends.clear()
+        self.license.clear()
+        self.errors.clear()
+        self._offset = 0
+        self._partial = b""
+        self._line = 0
+        self._tail = b""
+        self._mtime = None
+
+    def skip(self):
+        """忽略日志中已有的内容(如上一次运行留下的错误),只解析之后写入的行"""
+        with self._lock:
+            self._reset()
+            try:
+                stat = os.stat(self.path)
+            except OSError:
+                self._identity = None
+                return self
+            self._identity = (stat.st_dev, stat.st_ino)
+            self._mtime = stat.st_mtime_ns
+            with open(self.path, 'rb') as f:
+                f.seek(max(stat.st_size - _TAIL, 0))
+                self._tail = f.read(_TAIL)
+            self._offset = stat.st_size
+        return self
+
+    def poll(self) -> List[LogEvent]:
+        """读取并解析新追加的行,返回新事件"""
+        with self._lock:
+            try:
+                stat = os.stat(self.path)
+            except OSError:
+                return []
+            identity = (stat.st_dev, stat.st_ino)
+            if identity != self._identity or stat.st_size < self._offset:
+                # 日志被重新创建或截断
+                self._restart(identity)
+            elif stat.st_size == self._offset and self._offset and stat.st_mtime_ns != self._mtime:
+                # 以相同长度原地重写,末尾字节也可能相同
+                self._restart(identity)
+            self._mtime = stat.st_mtime_ns
+            if stat.st_size == self._offset:
+                return []
+            with open(self.path, 'rb') as f:
+                start = self._offset - len(self._tail)
+                f.seek(start)
+                data = f.read(stat.st_size - start)
+                if not data.startswith(self._tail):
+                    # 原地重写且不短于已读取的长度
+                    self._restart(identity)
+                    f.seek(0)
+                    data = f.read(stat.st_size)
+                else:
+                    data = data[len(self._tail):]
+            self._offset += len(data)
+            self._tail = (self._tail + data)[-_TAIL:]
+            lines = (self._partial + data).split(b"\n")
+            self._partial = lines.pop()
+            new = []
+            for raw in lines:
+                self._line += 1
+                text = self._decode(raw.rstrip(b"\r"))
+                if text.strip():
+                    new.append(self._record(parse_line(text, self._line)))
+        if self.on_event is not None:
+            for event in new:
+                self.on_event(event)
+        return new
+
+    def _restart(self, identity):
+        if self._identity is not None:
+            logger.info(f"日志{self.path}已重写,从头读取")
+        self._reset()
+        self._identity = identity
+
+    @staticmethod
+    def _decode(raw: bytes) -> str:
+        # 中文Windows下DLL可能以GBK写出日志
+        try:
+            return raw.decode('utf-8')
+        except UnicodeDecodeError:
+            return raw.decode('gbk', errors='replace')
+
+    def _record(self, event: LogEvent) -> LogEvent:
+        self.events.append(event)
+        if event.kind == "build":
+            self.build.update(event.data)
+        elif event.kind == "backend":
+            self.backends[event.data["name"]] = event.data["available"]
+        elif event.kind == "license":
+            self.license.update(event.data)
+        elif event.kind in ("error", "run_error"):
+            self.errors.append(event)
+        return event
+
+    # ------------------------------------------------------------------ 查询
+    @property
+    def failed(self) -> bool:
+        return bool(self.errors)
+
+    @property
+    def backend(self) -> Optional[str]:
+        """实际使用的数学加速: 第一个已加载的加速库,都未找到时为构建信息中的Math(如SIMD@zzz)"""
+        for name, available in self.backends.items():
+            if available:
+                return name
+        return self.build.get("math")
+
+    def error_message(self) -> str:
+        messages = [e.data.get("message") or e.text for e in self.errors if e.kind == "error"]
+        return "; ".join(messages) if messages else (self.errors[0].text if self.errors else "")
+
+    def check(self):
+        """读取新内容,日志中出现错误时抛出HawtC_RunError"""
+        self.poll()
+        if self.errors:
+            raise HawtC_RunError(f"HawtC运行错误: {self.error_message()}", self.errors)
+
+    def summary(self) -> dict:
+        return {"path": self.path, "build": dict(self.build), "backends": dict(self.backends),
+                "backend": self.backend, "license": dict(self.license),
+                "errors": [e.data.get("message", e.text) for e in self.errors]}
+
+    # ------------------------------------------------------------------ 步进回调
+    def __call__(self, times_n, t):
+        """作为step_hooks使用时由HawtC.watch_log按间隔检查"""
+        self.check()
+
+    # ------------------------------------------------------------------ 后台监视
+    def start(self, interval: float = 0.2, on_error: Optional[Callable[['HawtC_LogMonitor'], None]] = None):
+        """
+        在后台线程中每interval秒读取一次,出现错误时调用on_error(monitor)后停止,
+        可用于在DLL卡死于某一步时由外部终止工况
+        """
+        if self._thread is not None:
+            return self
+        self._stop.clear()
+
+        def watch():
+            while not self._stop.wait(interval):
+                self.poll()
+                if self.errors:
+                    if on_error is not None:
+                        on_error(self)
+                    break
+
+        self._thread = threading.Thread(target=watch, name="HawtC_LogMonitor", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        return self
+
+    def __repr__(self) -> str:
+        return (f"<HawtC_LogMonitor '{self.path}' events={len(self.events)} "
+                f"backend={self.backend} errors={len(self.errors)}>")
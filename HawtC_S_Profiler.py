@@ -0,0 +1,232 @@
+import json
+import os
+import time
+from array import array
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+# 报告中的延迟分位数
+PERCENTILES = (50, 90, 99)
+# 步长耗时直方图: 每个数量级的分箱数,范围1微秒~10秒
+HISTOGRAM_BINS_PER_DECADE = 10
+HISTOGRAM_RANGE_US = (1.0, 1e7)
+
+
+class _Phase:
+    """一个记录阶段的原始数据: 每个函数的调用耗时(纳秒),以及需要导出trace的调用开始时刻"""
+    def __init__(self, name: str):
+        self.name = name
+        self.durations: Dict[str, array] = {}
+        self.starts: Dict[str, array] = {}
+        self.wall_ns = 0
+        # 每次进入阶段的(开始, 结束)时刻
+        self.spans: List[tuple] = []
+
+    def arrays(self, name: str, trace: bool):
+        durations = self.durations.setdefault(name, array('q'))
+        starts = self.starts.setdefault(name, array('q')) if trace else None
+        return durations, starts
+
+
+def _timed(func, durations: array, starts: Optional[array]):
+    """包装单个函数,记录每次调用的耗时"""
+    clock = time.perf_counter_ns
+    record = durations.append
+    if starts is None:
+        def timed(*args):
+            t0 = clock()
+            result = func(*args)
+            record(clock() - t0)
+            return result
+    else:
+        record_start = starts.append
+
+        def timed(*args):
+            t0 = clock()
+            result = func(*args)
+            record(clock() - t0)
+            record_start(t0)
+            return result
+    timed.__wrapped__ = func
+    return timed
+
+
+class HawtC_Profiler:
+    """
+    HawtC调用计时: 开启时把sim.api上的每个DLL函数替换为计时包装,并包装HawtC_S_Update_Step方法统计整步耗时
+    (DLL求解+step_hooks中的快照/记录器/耦合代码);关闭后恢复原函数,不开启时没有任何额外开销.
+    开启和关闭时会重新生成sim中缓存的快照、挂接的记录器/系泊模型以及targets的调用计划,
+    使它们调用当前的函数.
+
+    prof = HawtC_Profiler(sim)
+    with prof.phase("init"):
+        sim.HawtC_S_INI(path)
+    with prof.phase("steps"):
+        for i in range(1000):
+            sim.HawtC_S_Update_Step(i, (i + 1) * dt)
+    prof.save_json("profile.json")
+    prof.save_trace("profile.trace.json")  # chrome://tracing 或 Perfetto 打开
+    """
+    STEP = "step"
+
+    def __init__(self, sim, trace: bool = False, targets: Iterable = ()):
+        """
+        :param trace: 记录每次调用的开始时刻,用于导出完整的Chrome trace(调用次数多时占用内存较多);
+                      为False时trace中只有各阶段和每一步
+        :param targets: 其他需要重新生成调用计划的对象(有rebind(api)方法,如HawtC_Farm)
+        """
+        self.sim = sim
+        self.trace = trace
+        self.targets = list(targets)
+        self.phases: Dict[str, _Phase] = {}
+        self._active: Optional[_Phase] = None
+        self._originals: Dict[str, object] = {}
+        self._origin_ns = time.perf_counter_ns()
+
+    @property
+    def enabled(self) -> bool:
+        return self._active is not None
+
+    def _rebind(self):
+        api = self.sim.api
+        owners = list(self.sim._snapshots.values()) + list(self.sim.step_hooks) + self.targets
+        for owner in owners:
+            rebind = getattr(owner, "rebind", None)
+            if rebind is not None:
+                rebind(api)
+
+    def enable(self, phase: str = "default"):
+        """开始记录到阶段phase(同名阶段累计)"""
+        if self._active is not None:
+            raise RuntimeError(f"正在记录阶段{self._active.name},不能嵌套开启")
+        record = self.phases.get(phase)
+        if record is None:
+            record = self.phases[phase] = _Phase(phase)
+        api = self.sim.api
+        for name in api.names:
+            func = getattr(api, name)
+            self._originals[name] = func
+            setattr(api, name, _timed(func, *record.arrays(name, self.trace)))
+        # 实例属性覆盖类方法,关闭时删除即可恢复
+        self.sim.HawtC_S_Update_Step = _timed(self.sim.HawtC_S_Update_Step, *record.arrays(self.STEP, True))
+        self._rebind()
+        self._active = record
+        record.spans.append([time.perf_counter_ns(), None])
+        return self
+
+    def disable(self):
+        """停止记录并恢复原函数"""
+        record = self._active
+        if record is None:
+            return self
+        span = record.spans[-1]
+        span[1] = time.perf_counter_ns()
+        record.wall_ns += span[1] - span[0]
+        api = self.sim.api
+        for name, func in self._originals.items():
+            setattr(api, name, func)
+        self._originals.clear()
+        self.sim.__dict__.pop("HawtC_S_Update_Step", None)
+        self._rebind()
+        self._active = None
+        return self
+
+    @contextmanager
+    def phase(self, name: str):
+        """只在with块内记录,结果归入阶段name"""
+        self.enable(name)
+        try:
+            yield self
+        finally:
+            self.disable()
+
+    def __enter__(self):
+        return self.enable()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.disable()
+
+    def reset(self):
+        """清除已记录的数据"""
+        if self._active is not None:
+            raise RuntimeError("请先关闭记录再清除")
+        self.phases.clear()
+
+    # ------------------------------------------------------------------ 汇总
+    @staticmethod
+    def _latency(durations: array) -> dict:
+        us = np.frombuffer(durations, dtype=np.int64) / 1e3
+        item = {"count": len(us), "total_s": float(us.sum()) / 1e6, "mean_us": float(us.mean()),
+                "min_us": float(us.min()), "max_us": float(us.max())}
+        for q, value in zip(PERCENTILES, np.percentile(us, PERCENTILES)):
+            item[f"p{q}_us"] = float(value)
+        return item
+
+    @staticmethod
+    def histogram(durations: array) -> dict:
+        """按对数等距分箱的耗时直方图(微秒),超出范围的计入两端"""
+        lo, hi = np.log10(HISTOGRAM_RANGE_US)
+        edges = np.logspace(lo, hi, int(round((hi - lo) * HISTOGRAM_BINS_PER_DECADE)) + 1)
+        us = np.clip(np.frombuffer(durations, dtype=np.int64) / 1e3, edges[0], edges[-1])
+        counts, _ = np.histogram(us, edges)
+        return {"edges_us": edges.tolist(), "counts": counts.tolist()}
+
+    def report(self) -> dict:
+        """
+        各阶段的汇总:
+        wall_s为阶段总时长,dll_s为DLL函数调用的总耗时,python_s为其余时间(步进回调、用户代码等);
+        functions为每个DLL函数的调用次数、总耗时及延迟分位数,按总耗时降序;
+        step为整步耗时(含step_hooks)的分位数与直方图
+        """
+        result = {}
+        for name, record in self.phases.items():
+            functions = {fn: self._latency(d) for fn, d in record.durations.items()
+                         if fn != self.STEP and len(d)}
+            functions = dict(sorted(functions.items(), key=lambda item: -item[1]["total_s"]))
+            wall = record.wall_ns / 1e9
+            dll = sum(item["total_s"] for item in functions.values())
+            phase = {"wall_s": wall, "dll_s": dll, "python_s": max(wall - dll, 0.0),
+                     "calls": sum(item["count"] for item in functions.values()), "functions": functions}
+            steps = record.durations.get(self.STEP)
+            if steps is not None and len(steps):
+                phase["step"] = self._latency(steps)
+                phase["step"]["histogram"] = self.histogram(steps)
+            result[name] = phase
+        return result
+
+    def save_json(self, path: str) -> dict:
+        report = self.report()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+        return report
+
+    def trace_events(self) -> List[dict]:
+        """Chrome trace事件(完整事件"X",时间单位微秒): 阶段、每一步,trace=True时还有每次DLL调用"""
+        events = []
+        pid = os.getpid()
+        origin = self._origin_ns
+
+        def complete(name, cat, start_ns, dur_ns, tid):
+            events.append({"name": name, "cat": cat, "ph": "X", "pid": pid, "tid": tid,
+                           "ts": (start_ns - origin) / 1e3, "dur": dur_ns / 1e3})
+
+        for name, record in self.phases.items():
+            for start, end in record.spans:
+                if end is not None:
+                    complete(name, "phase", start, end - start, 0)
+            for fn, starts in record.starts.items():
+                durations = record.durations[fn]
+                tid = 1 if fn == self.STEP else 2
+                for start, dur in zip(starts, durations):
+                    complete(fn, "step" if fn == self.STEP else "dll", start, dur, tid)
+        events.sort(key=lambda e: e["ts"])
+        return events
+
+    def save_trace(self, path: str):
+        """导出Chrome trace文件(chrome://tracing、Perfetto可直接打开)"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}, f)
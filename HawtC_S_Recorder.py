@@ -0,0 +1,178 @@
+import functools
+import json
+import os
+import re
+from typing import List, Optional
+
+import numpy as np
+
+# 通道名格式: 去掉"HawtC_S_Get"前缀的取值函数名,可带方括号参数
+# 例如 "TowerBaseMy", "PlatformPitch", "BladeRootMx[b=1]", "BladeLocalFx[b=0,s=5]", "LocalTowerMyLoads[j=3]"
+_CHANNEL_PATTERN = re.compile(r"^\s*(\w+?)\s*(?:\[(.*)\])?\s*$")
+
+# 各类取值函数除turbnum外需要的参数名(按调用顺序)
+_CHANNEL_ARGS = (
+    ("BladeLocal", ("b", "s")),
+    ("BladeRoot", ("b",)),
+    ("LocalTower", ("j",)),
+)
+
+
+def parse_channel(api, channel: str, turbnum: int = 0):
+    """
+    将通道名解析为无参数的预绑定调用,t=参数可覆盖风机编号
+    :return: 调用时返回当前通道值的函数
+    """
+    match = _CHANNEL_PATTERN.match(channel)
+    if not match:
+        raise ValueError(f"无法解析通道名: {channel}")
+    name, arg_text = match.group(1), match.group(2)
+    func_name = "HawtC_S_Get" + name
+    if func_name not in api:
+        raise ValueError(f"未知通道: {channel} (HawtC.dll中没有{func_name})")
+
+    kwargs = {}
+    if arg_text:
+        for item in arg_text.split(','):
+            if '=' not in item:
+                raise ValueError(f"通道参数格式错误: {channel}")
+            k, v = item.split('=', 1)
+            kwargs[k.strip()] = int(v)
+    turb = kwargs.pop("t", turbnum)
+
+    arg_names = ()
+    for prefix, names in _CHANNEL_ARGS:
+        if name.startswith(prefix):
+            arg_names = names
+            break
+    missing = [k for k in arg_names if k not in kwargs]
+    extra = [k for k in kwargs if k not in arg_names]
+    if missing or extra:
+        raise ValueError(f"通道{channel}需要参数{list(arg_names)}")
+    return functools.partial(getattr(api, func_name), turb, *[kwargs[k] for k in arg_names])
+
+
+def load_spill(path: str):
+    """
+    读取记录器溢写到磁盘的数据
+    :return: (通道名列表, (n,1+通道数)的只读内存映射数组,第0列为时间)
+    """
+    with open(path + ".json", 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    ncol = len(meta["channels"]) + 1
+    if os.path.getsize(path) == 0:
+        return meta["channels"], np.empty((0, ncol))
+    data = np.memmap(path, dtype=np.float64, mode='r').reshape(-1, ncol)
+    return meta["channels"], data
+
+
+class HawtC_Recorder:
+    """
+    通道记录器: 挂接到HawtC.HawtC_S_Update_Step之后,每decimation步采样一次订阅的通道,
+    数据写入预分配的环形缓冲区; 指定spill_path时缓冲区写满即追加写入磁盘,否则覆盖最旧数据
+    """
+    def __init__(self, sim, channels: List[str], turbnum: int = 0, capacity: int = 100000,
+                 decimation: int = 1, spill_path: Optional[str] = None):
+        if capacity <= 0 or decimation <= 0:
+            raise ValueError("capacity和decimation必须为正整数")
+        self.sim = sim
+        self.channels = list(channels)
+        self.capacity = capacity
+        self.decimation = decimation
+        self.spill_path = spill_path
+        self.turbnum = turbnum
+        self.rebind(sim.api)
+
+        # 第0列为时间,其余为各通道
+        self.buffer = np.zeros((capacity, len(self.channels) + 1))
+        # 按元素写入缓冲区的一维视图,采样时不分配临时列表或数组视图
+        self._flat = memoryview(self.buffer.reshape(-1))
+        self._head = 0          # 下一行写入位置
+        self._wrapped = False   # 环形缓冲区是否已覆盖旧数据
+        self._skip = 0          # 距下一次采样还需跳过的步数
+        self.samples = 0        # 累计采样次数
+        self.spilled = 0        # 已写入磁盘的行数
+        self._spill_file = None
+        if spill_path:
+            os.makedirs(os.path.dirname(os.path.abspath(spill_path)), exist_ok=True)
+            self._spill_file = open(spill_path, 'wb')
+            with open(spill_path + ".json", 'w', encoding='utf-8') as f:
+                json.dump({"channels": self.channels, "dtype": "float64"}, f, ensure_ascii=False)
+
+    def rebind(self, api):
+        """按api重新解析订阅的通道(api的函数被替换后调用)"""
+        self._calls = [parse_channel(api, ch, self.turbnum) for ch in self.channels]
+        return self
+
+    def attach(self):
+        """挂接到仿真的时间步进回调"""
+        if self not in self.sim.step_hooks:
+            self.sim.step_hooks.append(self)
+        return self
+
+    def detach(self):
+        """从仿真中移除,并把剩余数据写入磁盘"""
+        if self in self.sim.step_hooks:
+            self.sim.step_hooks.remove(self)
+        self.close()
+
+    def __enter__(self):
+        return self.attach()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.detach()
+
+    def __call__(self, times_n, t):
+        if self._skip:
+            self._skip -= 1
+            return
+        self._skip = self.decimation - 1
+        self.sample(t)
+
+    def sample(self, t: float):
+        """立即采样一次所有通道"""
+        flat = self._flat
+        start = self._head * self.buffer.shape[1]
+        flat[start] = t
+        for i, call in enumerate(self._calls, start + 1):
+            flat[i] = call()
+        self.samples += 1
+        self._head += 1
+        if self._head == self.capacity:
+            if self._spill_file:
+                self.buffer.tofile(self._spill_file)
+                self.spilled += self.capacity
+            else:
+                self._wrapped = True
+            self._head = 0
+
+    def flush(self):
+        """将缓冲区中尚未溢写的数据写入磁盘(仅在指定spill_path时有效)"""
+        if self._spill_file and self._head:
+            self.buffer[:self._head].tofile(self._spill_file)
+            self.spilled += self._head
+            self._head = 0
+        if self._spill_file:
+            self._spill_file.flush()
+
+    def close(self):
+        """写出剩余数据并关闭溢写文件"""
+        if self._spill_file:
+            self.flush()
+            self._spill_file.close()
+            self._spill_file = None
+
+    def data(self) -> np.ndarray:
+        """
+        按时间顺序返回缓冲区中的数据(未覆盖时为视图,覆盖后为拷贝),第0列为时间
+        """
+        if not self._wrapped:
+            return self.buffer[:self._head]
+        return np.concatenate((self.buffer[self._head:], self.buffer[:self._head]))
+
+    def channel(self, name: str) -> np.ndarray:
+        """返回缓冲区中某一通道的数据"""
+        return self.data()[:, self.channels.index(name) + 1]
+
+    def __repr__(self) -> str:
+        return f"<HawtC_Recorder channels={len(self.channels)} samples={self.samples} spilled={self.spilled}>"
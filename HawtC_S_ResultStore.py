@@ -0,0 +1,405 @@
+import glob
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger('HawtC_S_ResultStore')
+
+# 键的格式版本,键的计算方式变化时递增使旧结果失效
+STORE_VERSION = 1
+# 默认容量上限(字节),超出后按最近使用时间淘汰
+MAX_BYTES = 10 * 1024 ** 3
+# 淘汰时降到容量上限的这一比例以下,之后的若干次保存无需再次淘汰
+EVICT_FRACTION = 0.9
+
+# 会继续查找引用文件的输入文件类型(YML格式)
+RECURSE_EXTENSIONS = (".hst", ".yml", ".yaml")
+# 形如文件路径的节点值: 以字母开头的扩展名结尾,排除"1.5"等数值
+_PATH_LIKE = re.compile(r"^[^<>|*?\"]*[^\s.<>|*?\"/\\]\.[A-Za-z][A-Za-z0-9_]{0,7}$")
+
+# 进程内缓存: 绝对路径 -> ((修改时间, 大小), 摘要)
+_DIGESTS: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+
+def _signature(path: str) -> Optional[Tuple[int, int]]:
+    """文件的(修改时间, 大小),文件不存在时为None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def file_digest(path: str) -> str:
+    """文件内容摘要,修改时间和大小不变时直接使用进程内缓存"""
+    from HawtC_IO_Out import file_hash
+    path = os.path.abspath(path)
+    sig = _signature(path)
+    cached = _DIGESTS.get(path)
+    if cached is not None and cached[0] == sig:
+        return cached[1]
+    digest = file_hash(path)
+    _DIGESTS[path] = (sig, digest)
+    return digest
+
+
+def _references(path: str) -> List[str]:
+    """YML格式输入文件中引用的其他文件(按出现顺序,相对路径以该文件所在目录为基准,含不存在的文件)"""
+    from HawtC_IO import YML
+    base = os.path.dirname(path)
+    refs = []
+    for node in YML(path, readonly=True).node_list:
+        if not node.value:
+            continue
+        # 多行列表值逐项检查
+        for item in node.value.split('\n'):
+            item = item.strip().lstrip('-').strip().strip('"\'')
+            if item and _PATH_LIKE.match(item):
+                refs.append(os.path.normpath(os.path.join(base, item.replace('\\', os.sep))))
+    return refs
+
+
+def walk_dependencies(hst_path: str) -> List[str]:
+    """
+    从.hst文件出发递归查找引用的全部文件(YML/配置、系泊lines.txt、翼型、风文件等),
+    :return: 依赖文件绝对路径,.hst文件本身在第一位;引用了但不存在的文件以"?"开头
+    """
+    root = os.path.abspath(hst_path)
+    order = [root]
+    seen = {root}
+    i = 0
+    while i < len(order):
+        path = order[i]
+        i += 1
+        if not path.lower().endswith(RECURSE_EXTENSIONS) or not os.path.isfile(path):
+            continue
+        for ref in _references(path):
+            if ref not in seen:
+                seen.add(ref)
+                order.append(ref)
+    return [p if os.path.isfile(p) else "?" + p for p in order]
+
+
+@contextmanager
+def _file_lock(path: str):
+    """跨进程文件锁(Windows使用msvcrt,其他系统使用fcntl)"""
+    with open(path, 'a+b') as f:
+        if os.name == 'nt':
+            import msvcrt
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK最多重试10秒,长时间淘汰时继续等待
+                    continue
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class HawtC_ResultStore:
+    """
+    按内容寻址的仿真结果库: 键为.hst文件、其引用的全部文件以及HawtC.dll的内容摘要,
+    输入未变化的工况直接返回已保存的通道数组和统计结果,不再调用HawtC_S_INI/HawtC_S_Solve.
+
+    每个结果是objects下的一个目录(每个通道一个.npy文件和meta.json),先写入临时目录再整体替换,
+    多个进程同时读写时不会读到不完整的结果;总字节数记录在index.json中,每次保存时在文件锁内增量更新,
+    超过容量上限时才扫描全部结果,按最近使用时间淘汰并重新统计总字节数.
+    依赖遍历的结果连同各文件的修改时间、大小和摘要保存在deps下,文件都未变化时计算键无需重新读取文件
+    """
+    def __init__(self, root: Optional[str] = None, max_bytes: int = MAX_BYTES):
+        if root is None:
+            from HawtC_IO import cache_dir
+            root = cache_dir("results")
+        self.root = os.path.abspath(root)
+        self.max_bytes = max_bytes
+        self.objects_dir = os.path.join(self.root, "objects")
+        self.deps_dir = os.path.join(self.root, "deps")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.deps_dir, exist_ok=True)
+        self.lock_path = os.path.join(self.root, "store.lock")
+        self.index_path = os.path.join(self.root, "index.json")
+        # 进程内的依赖记录: .hst绝对路径 -> 记录
+        self._deps: Dict[str, dict] = {}
+
+    # ------------------------------------------------------------------ 键
+    def _deps_path(self, hst_path: str) -> str:
+        name = hashlib.blake2b(hst_path.encode('utf-8'), digest_size=16).hexdigest()
+        return os.path.join(self.deps_dir, name + ".json")
+
+    @staticmethod
+    def _is_current(record: dict) -> bool:
+        """依赖记录中每个文件的修改时间和大小(及不存在的文件)都未变化"""
+        for path, sig, _ in record["files"]:
+            current = _signature(path.lstrip("?"))
+            if (None if current is None else list(current)) != sig:
+                return False
+        return True
+
+    def dependencies(self, hst_path: str) -> List[Tuple[str, Optional[str]]]:
+        """
+        .hst文件的依赖及其内容摘要(不存在的文件摘要为None),
+        优先使用进程内及deps目录中仍然有效的遍历记录
+        """
+        hst_path = os.path.abspath(hst_path)
+        record = self._deps.get(hst_path)
+        if record is None or not self._is_current(record):
+            record = None
+            path = self._deps_path(hst_path)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    record = json.load(f)
+                if record.get("version") != STORE_VERSION or not self._is_current(record):
+                    record = None
+            except (OSError, ValueError, KeyError):
+                record = None
+            if record is None:
+                record = self._walk(hst_path)
+                self._write_json(path, record)
+            self._deps[hst_path] = record
+        return [(p, d) for p, _, d in record["files"]]
+
+    @staticmethod
+    def _walk(hst_path: str) -> dict:
+        files = []
+        for path in walk_dependencies(hst_path):
+            if path.startswith("?"):
+                files.append([path, None, None])
+            else:
+                files.append([path, list(_signature(path)), file_digest(path)])
+        return {"version": STORE_VERSION, "hst": hst_path, "files": files}
+
+    def key(self, hst_path: str, dll_path: str) -> str:
+        """
+        工况的结果键: .hst及其依赖(相对.hst所在目录的路径与内容摘要)和DLL内容摘要,
+        整个工况目录复制到别处后键不变
+        """
+        hst_path = os.path.abspath(hst_path)
+        base = os.path.dirname(hst_path)
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f"v{STORE_VERSION}\ndll {file_digest(dll_path)}\n".encode('utf-8'))
+        for path, file_hash in self.dependencies(hst_path):
+            rel = os.path.relpath(path.lstrip("?"), base).replace(os.sep, '/')
+            digest.update(f"{rel} {file_hash}\n".encode('utf-8'))
+        return digest.hexdigest()
+
+    # ------------------------------------------------------------------ 读写
+    def _entry_dir(self, key: str) -> str:
+        return os.path.join(self.objects_dir, key[:2], key)
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(os.path.join(self._entry_dir(key), "meta.json"))
+
+    def get(self, key: str, mmap: bool = True) -> Optional[dict]:
+        """
+        读取结果,不存在时返回None
+        :return: {"arrays": 名称 -> 数组(默认只读内存映射), "stats": 统计结果, "meta": 其他信息}
+        """
+        entry = self._entry_dir(key)
+        meta_path = os.path.join(entry, "meta.json")
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            arrays = {name: np.load(os.path.join(entry, fname), mmap_mode='r' if mmap else None)
+                      for name, fname in zip(meta["arrays"], meta["files"])}
+            # 更新修改时间作为最近使用时间
+            os.utime(meta_path)
+        except (OSError, ValueError, KeyError):
+            # 不存在,或读取期间被其他进程淘汰
+            return None
+        return {"arrays": arrays, "stats": meta.get("stats", {}), "meta": meta.get("info", {})}
+
+    def put(self, key: str, arrays: Dict[str, np.ndarray], stats: Optional[dict] = None,
+            info: Optional[dict] = None) -> int:
+        """
+        保存结果(已存在时覆盖)
+        :return: 结果占用的字节数
+        """
+        entry = self._entry_dir(key)
+        tmp_dir = f"{entry}.tmp{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        try:
+            names = list(arrays)
+            files = [f"{i}.npy" for i in range(len(names))]
+            size = 0
+            for name, fname in zip(names, files):
+                fpath = os.path.join(tmp_dir, fname)
+                np.save(fpath, np.asarray(arrays[name]))
+                size += os.path.getsize(fpath)
+            meta = {"version": STORE_VERSION, "key": key, "arrays": names, "files": files,
+                    "bytes": size, "created": time.time(), "stats": stats or {}, "info": info or {}}
+            with open(os.path.join(tmp_dir, "meta.json"), 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+            with _file_lock(self.lock_path):
+                replaced = self._entry_bytes(key)
+                total = self._read_total()
+                shutil.rmtree(entry, ignore_errors=True)
+                os.replace(tmp_dir, entry)
+                if total is None:
+                    total = self._scan_total()
+                else:
+                    total += size - replaced
+                if total > self.max_bytes:
+                    total = self._evict()
+                self._write_total(total)
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        return size
+
+    def put_outputs(self, key: str, paths: Sequence[str], stats: bool = True,
+                    info: Optional[dict] = None) -> int:
+        """
+        保存工况的.out结果文件: 数组名为"文件名/通道名",stats为True时同时保存各文件的统计结果
+        """
+        from HawtC_IO_Out import OUT
+        arrays, summary = {}, {}
+        for path in paths:
+            name = os.path.basename(path)
+            out = OUT(path)
+            data = out.read()
+            for channel in out.channels:
+                arrays[f"{name}/{channel}"] = data[channel]
+            if stats and len(out.channels) > 1:
+                from HawtC_Post_Stats import HawtC_Stats
+                channels = [ch for ch in out.channels if ch != out.time_channel]
+                st = HawtC_Stats(channels)
+                st.update(np.column_stack([data[ch] for ch in channels]), data[out.time_channel])
+                summary[name] = st.summary()
+        return self.put(key, arrays, summary, info)
+
+    @staticmethod
+    def _write_json(path: str, obj: dict):
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(obj, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            logger.warning(f"无法写入{path}: {exc}")
+
+    # ------------------------------------------------------------------ 容量
+    def entries(self) -> List[Tuple[float, int, str]]:
+        """全部结果的(最近使用时间, 字节数, 键),按最近使用时间从旧到新排列"""
+        result = []
+        for prefix in os.scandir(self.objects_dir):
+            if not prefix.is_dir():
+                continue
+            for entry in os.scandir(prefix.path):
+                if ".tmp" in entry.name:
+                    continue
+                meta_path = os.path.join(entry.path, "meta.json")
+                try:
+                    mtime = os.stat(meta_path).st_mtime
+                    with open(meta_path, 'r', encoding='utf-8') as f:
+                        size = json.load(f)["bytes"]
+                except (OSError, ValueError, KeyError):
+                    continue
+                result.append((mtime, size, entry.name))
+        result.sort()
+        return result
+
+    def _entry_bytes(self, key: str) -> int:
+        """已保存结果的字节数,不存在时为0"""
+        try:
+            with open(os.path.join(self._entry_dir(key), "meta.json"), 'r', encoding='utf-8') as f:
+                return int(json.load(f)["bytes"])
+        except (OSError, ValueError, KeyError):
+            return 0
+
+    def _read_total(self) -> Optional[int]:
+        """index.json中记录的总字节数,不存在或损坏时为None"""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get("version") != STORE_VERSION:
+                return None
+            return int(index["bytes"])
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+    def _write_total(self, total: int):
+        self._write_json(self.index_path, {"version": STORE_VERSION, "bytes": total})
+
+    def _scan_total(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def size(self) -> int:
+        """结果库的总字节数(index.json中的记录,缺失时扫描全部结果重建)"""
+        total = self._read_total()
+        if total is None:
+            with _file_lock(self.lock_path):
+                total = self._scan_total()
+                self._write_total(total)
+        return total
+
+    def _evict(self) -> int:
+        """
+        删除最久未使用的结果,直到总字节数不超过容量上限的EVICT_FRACTION(调用方持有文件锁)
+        :return: 淘汰后按实际结果重新统计的总字节数
+        """
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * EVICT_FRACTION
+        for _, size, key in entries:
+            if total <= target:
+                break
+            shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+            total -= size
+            logger.info(f"淘汰结果{key}({size}字节)")
+        return total
+
+    def clear(self):
+        with _file_lock(self.lock_path):
+            shutil.rmtree(self.objects_dir, ignore_errors=True)
+            os.makedirs(self.objects_dir, exist_ok=True)
+            self._write_total(0)
+
+    # ------------------------------------------------------------------ 求解
+    def solve(self, dll_path: str, hst_path: str, outputs: Iterable[str], stats: bool = True) -> dict:
+        """
+        求解单个工况: 结果库中已有相同输入的结果时直接返回,否则在当前进程中调用
+        HawtC_S_INI/HawtC_S_Solve/HawtC_S_Close,并保存outputs指定的.out文件
+        :param outputs: .out结果文件的路径或通配符(相对.hst所在目录)
+        """
+        key = self.key(hst_path, dll_path)
+        result = self.get(key)
+        if result is not None:
+            logger.info(f"工况{hst_path}命中结果库: {key}")
+            return result
+        from HawtC_S_Simulation import HawtC
+        sim = HawtC(dll_path)
+        sim.HawtC_S_INI(hst_path)
+        sim.HawtC_Solve()
+        sim.HawtC_S_Close(0)
+        self.put_outputs(key, output_files(hst_path, outputs), stats, {"hst": os.path.abspath(hst_path)})
+        return self.get(key)
+
+
+def output_files(hst_path: str, patterns: Iterable[str]) -> List[str]:
+    """按通配符(相对.hst所在目录)查找工况的结果文件"""
+    base = os.path.dirname(os.path.abspath(hst_path))
+    files = []
+    for pattern in patterns:
+        files.extend(sorted(glob.glob(os.path.join(base, pattern))))
+    return files
@@ -2,6 +2,73 @@ import ctypes
 from ctypes import *
 from ctypes import CDLL
 
+_c_int = ctypes.c_int
+_c_double = ctypes.c_double
+
+# HawtC.dll导出函数签名表: 函数名 -> (argtypes, restype)
+# 加载DLL时一次性解析并设置类型,之后每次调用不再重复设置
+HAWTC_S_SIGNATURES = {
+    "HawtC_S_INI": ([ctypes.c_char_p], None),
+    "HawtC_S_Close": ([_c_int], None),
+    "HawtC_S_Update_Step": ([_c_int, _c_double], None),
+    "HawtC_S_Solve": ([], None),
+}
+for _comp in ("Fx", "Fy", "Fz", "Mx", "My", "Mz"):
+    # 塔基载荷 (turbnum)
+    HAWTC_S_SIGNATURES["HawtC_S_GetTowerBase" + _comp] = ([_c_int], _c_double)
+    # 塔架各节点载荷 (turbnum, J)
+    HAWTC_S_SIGNATURES["HawtC_S_GetLocalTower" + _comp + "Loads"] = ([_c_int, _c_int], _c_double)
+    # 叶根载荷 (turbnum, blade)
+    HAWTC_S_SIGNATURES["HawtC_S_GetBladeRoot" + _comp] = ([_c_int, _c_int], _c_double)
+    # 叶片各截面载荷 (turbnum, blade, section)
+    HAWTC_S_SIGNATURES["HawtC_S_GetBladeLocal" + _comp] = ([_c_int, _c_int, _c_int], _c_double)
+for _suffix in ("", "Vel", "Acc"):
+    for _dof in ("Surge", "Sway", "Heave", "Roll", "Pitch", "Yaw"):
+        # 平台位移/速度/加速度 (turbnum)
+        HAWTC_S_SIGNATURES["HawtC_S_GetPlatform" + _dof + _suffix] = ([_c_int], _c_double)
+
+# 可选的导出函数,仅在DLL提供时绑定
+HAWTC_S_OPTIONAL_SIGNATURES = {
+    # 测试版DLL中的回调示例
+    "GetAddc": ([], ctypes.c_void_p),
+    "SetAddc": ([ctypes.c_void_p], None),
+    # 注册控制器回调(见HawtC_S_Controller),传入NULL取消注册
+    "HawtC_S_SetController": ([ctypes.c_void_p], None),
+}
+
+
+class HawtC_API:
+    """
+    预绑定的HawtC.dll函数集合,每个属性都是已设置好argtypes/restype的ctypes函数,
+    可直接用Python的int/float调用,适合在步进循环中高频调用
+    """
+    def __init__(self, dll, signatures=HAWTC_S_SIGNATURES, optional=HAWTC_S_OPTIONAL_SIGNATURES):
+        self.names = []
+        missing = []
+        for name, (argtypes, restype) in signatures.items():
+            if not self._bind(dll, name, argtypes, restype):
+                missing.append(name)
+        if missing:
+            raise AttributeError(f"HawtC.dll缺少导出函数: {', '.join(missing)}")
+        for name, (argtypes, restype) in optional.items():
+            self._bind(dll, name, argtypes, restype)
+
+    def _bind(self, dll, name, argtypes, restype):
+        """解析单个导出函数并设置类型,找不到时返回False"""
+        try:
+            func = getattr(dll, name)
+        except AttributeError:
+            return False
+        func.argtypes = argtypes
+        func.restype = restype
+        setattr(self, name, func)
+        self.names.append(name)
+        return True
+
+    def __contains__(self, name):
+        return name in self.names
+
+
 class HawtC:
 
     """
@@ -10,405 +77,365 @@ class HawtC:
     def __init__(self, dll_path):
         print(dll_path)
         self.dll=CDLL(dll_path)
+        # 一次性解析全部导出函数,缺少函数时在加载阶段直接报错
+        self.api=HawtC_API(self.dll)
+        # 每台风机的状态快照缓存,避免每步重新分配数组
+        self._snapshots={}
+        # 每次时间步进后依次调用的回调 hook(times_n,t),如通道记录器
+        self.step_hooks=[]
+        # 当前注册的控制器桥接对象,持有回调引用直至会话结束
+        self._controller=None
+        # DLL日志监视器(HawtC_LogMonitor),由watch_log创建
+        self.log=None
         
     def HawtC_S_INI(self,path):
         """
         用于调用HawtC.dll中的HawtC_S_Simulation_INI函数,读取运行文件,并完成初始化和运行工作.该模式下无法运行MoptL模式
         """
-        config_path=path
-        config_path_bytes = config_path.encode('utf-8')
+        if self.log is not None:
+            # 只检查本次初始化写出的日志
+            self.log.skip()
         # 将字符串转换为字符指针
-        config_path_ptr = ctypes.c_char_p(config_path_bytes)
-        # 调用函数
-        self.dll.HawtC_S_INI(config_path_ptr)
+        self.api.HawtC_S_INI(path.encode('utf-8'))
+        if self.log is not None:
+            self.log.check()
         
     def HawtC_S_Close(self,turbinenum):
         """
         用于调用HawtC.dll中的Close函数,释放内存
         """     
-        turbinenum =ctypes.c_int(turbinenum)   
-        self.dll.HawtC_S_Close(turbinenum)
+        self.api.HawtC_S_Close(turbinenum)
         
 
     def HawtC_S_Update_Step(self,times_n,t):
         """
         用于调用HawtC.dll中的Update函数,进行时间步进
         """
-        self.dll.HawtC_S_Update_Step.argtypes = [ ctypes.c_int, ctypes.c_double]
-        self.dll.HawtC_S_Update_Step.restype = None
-        self.dll.HawtC_S_Update_Step(times_n,t)
+        self.api.HawtC_S_Update_Step(times_n,t)
+        for hook in self.step_hooks:
+            hook(times_n,t)
 
     def HawtC_Solve(self):
         """
         用于调用HawtC.dll中的求解函数,不能自定义时间步进
         """        
+        self.api.HawtC_S_Solve()
+        if self._controller is not None:
+            # 求解过程中不经过step_hooks,控制器异常在此抛出
+            self._controller.raise_error()
+        if self.log is not None:
+            self.log.check()
+
+    def set_controller(self,controller):
+        """
+        注册Python控制器,DLL每步调用一次controller.update(turbnum,t,state,command),
+        state/command为直接映射DLL内存的numpy数组;传入None取消注册
+        """
+        if "HawtC_S_SetController" not in self.api:
+            raise AttributeError("当前HawtC.dll不支持控制器回调(缺少HawtC_S_SetController)")
+        if self._controller is not None:
+            self._controller.detach()
+            self._controller=None
+        if controller is None:
+            self.api.HawtC_S_SetController(None)
+            return None
+        from HawtC_S_Controller import HawtC_ControllerBridge
+        self._controller=HawtC_ControllerBridge(self,controller).attach()
+        return self._controller
+
+    def watch_log(self,path=None,every=10):
+        """
+        监视DLL日志(HawtC_S_Log.HawtC_LogMonitor): 增量解析版本、加速库、许可证和错误信息,
+        HawtC_S_INI/HawtC_Solve之后以及每every步检查一次,日志中出现错误时抛出HawtC_RunError;
+        path默认为当前工作目录下的OpenWECD.HawtC2.log,every为0时不在步进中检查.
+        在HawtC_S_INI之前调用时,日志中上一次运行留下的内容不会被当作本次的错误
+        """
+        from HawtC_S_Log import LOG_NAME,HawtC_LogMonitor
+        if self.log is None:
+            log=self.log=HawtC_LogMonitor(path or LOG_NAME)
+
+            def check(times_n,t):
+                if every and times_n%every==0:
+                    log.check()
+            self.step_hooks.append(check)
+        return self.log
 
+    def profile(self,trace=False,targets=()):
+        """
+        创建调用计时器(HawtC_S_Profiler),在with块或phase()内记录每个DLL函数的调用次数、耗时分位数和整步耗时,
+        未开启时不影响调用开销
+        """
+        from HawtC_S_Profiler import HawtC_Profiler
+        return HawtC_Profiler(self,trace,targets)
 
-        self.dll.HawtC_S_Solve()
+    def snapshot(self,turbnum,nblade=3,nsection=None,ntower=None):
+        """
+        获取风机turbnum的结构状态快照(HawtC_Snapshot),一次性读取叶片各截面、叶根、塔架各节点、塔基和平台运动.
+        首次调用需给出叶片截面数nsection和塔架节点数ntower,之后复用同一组数组原地刷新
+        """
+        snap=self._snapshots.get(turbnum)
+        if snap is None or (nsection is not None and nsection!=snap.nsection) \
+                or (ntower is not None and ntower!=snap.ntower) or nblade!=snap.nblade:
+            if nsection is None or ntower is None:
+                raise ValueError("首次获取快照需要指定nsection和ntower")
+            from HawtC_S_Snapshot import HawtC_Snapshot
+            snap=HawtC_Snapshot(self.api,turbnum,nblade,nsection,ntower)
+            self._snapshots[turbnum]=snap
+        return snap.update()
         
     def HawtC_S_GetTowerBaseFx(self,turbnum):
         """
         用于调用HawtC.dll中的HawtC_S_GetTowerBaseFx函数,获取塔基X方向的力
         """
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetTowerBaseFx.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetTowerBaseFx(num)
+        return self.api.HawtC_S_GetTowerBaseFx(turbnum)
         
     def HawtC_S_GetTowerBaseFy(self,turbnum):
         """
         用于调用HawtC.dll中的HawtC_S_GetTowerBaseFy函数,获取塔基Y方向的力
         """
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetTowerBaseFy.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetTowerBaseFy(num)
+        return self.api.HawtC_S_GetTowerBaseFy(turbnum)
         
     def HawtC_S_GetTowerBaseFz(self,turbnum):
         """
         用于调用HawtC.dll中的HawtC_S_GetTowerBaseFz函数,获取塔基Z方向的力
         """
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetTowerBaseFz.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetTowerBaseFz(num)
+        return self.api.HawtC_S_GetTowerBaseFz(turbnum)
         
     def HawtC_S_GetTowerBaseMx(self,turbnum):
         """
         用于调用HawtC.dll中的HawtC_S_GetTowerBaseMx函数,获取塔基X方向的力矩
         """
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetTowerBaseMx.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetTowerBaseMx(num)
+        return self.api.HawtC_S_GetTowerBaseMx(turbnum)
         
     def HawtC_S_GetTowerBaseMy(self,turbnum):
         """
         用于调用HawtC.dll中的HawtC_S_GetTowerBaseMy函数,获取塔基Y方向的力矩
         """
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetTowerBaseMy.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetTowerBaseMy(num)
+        return self.api.HawtC_S_GetTowerBaseMy(turbnum)
         
     def HawtC_S_GetTowerBaseMz(self,turbnum):
         """
         用于调用HawtC.dll中的HawtC_S_GetTowerBaseMz函数,获取塔基Z方向的力矩
         """
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetTowerBaseMz.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetTowerBaseMz(num)
+        return self.api.HawtC_S_GetTowerBaseMz(turbnum)
         
     def HawtC_S_GetLocalTowerMxLoads(self,turbnum,J):
         """
         用于调用HawtC.dll中的HawtC_S_GetLocalTowerMxLoads函数,获取塔架各节点X方向的力矩
         """
-        J =ctypes.c_int(J)
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetLocalTowerMxLoads.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetLocalTowerMxLoads(num,J)
-        
+        return self.api.HawtC_S_GetLocalTowerMxLoads(turbnum, J)
         
     def HawtC_S_GetLocalTowerMyLoads(self,turbnum,J):
         """
         用于调用HawtC.dll中的HawtC_S_GetLocalTowerMyLoads函数,获取塔架各节点Y方向的力矩
         """
-        J =ctypes.c_int(J)
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetLocalTowerMyLoads.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetLocalTowerMyLoads(num,J)
+        return self.api.HawtC_S_GetLocalTowerMyLoads(turbnum, J)
         
     def HawtC_S_GetLocalTowerMzLoads(self,turbnum,J):
         """
         用于调用HawtC.dll中的HawtC_S_GetLocalTowerMzLoads函数,获取塔架各节点Z方向的力矩
         """
-        J =ctypes.c_int(J)
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetLocalTowerMzLoads.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetLocalTowerMzLoads(num,J)
+        return self.api.HawtC_S_GetLocalTowerMzLoads(turbnum, J)
         
     def HawtC_S_GetLocalTowerFxLoads(self,turbnum,J):
         """
         用于调用HawtC.dll中的HawtC_S_GetLocalTowerFxLoads函数,获取塔架各节点X方向的力
         """
-        J =ctypes.c_int(J)
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetLocalTowerFxLoads.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetLocalTowerFxLoads(num,J)
+        return self.api.HawtC_S_GetLocalTowerFxLoads(turbnum, J)
         
     def HawtC_S_GetLocalTowerFyLoads(self,turbnum,J):
         """
         用于调用HawtC.dll中的HawtC_S_GetLocalTowerFyLoads函数,获取塔架各节点Y方向的力
         """
-        J =ctypes.c_int(J)
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetLocalTowerFyLoads.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetLocalTowerFyLoads(num,J)
+        return self.api.HawtC_S_GetLocalTowerFyLoads(turbnum, J)
         
     def HawtC_S_GetLocalTowerFzLoads(self,turbnum,J):
         """
         用于调用HawtC.dll中的HawtC_S_GetLocalTowerFzLoads函数,获取塔架各节点Z方向的力
         """
-        J =ctypes.c_int(J)
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetLocalTowerFzLoads.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetLocalTowerFzLoads(num,J)
-        
+        return self.api.HawtC_S_GetLocalTowerFzLoads(turbnum, J)
         
     def HawtC_S_GetBladeRootFx(self,turbnum,blade):
         """
         用于调用HawtC.dll中的HawtC_S_GetBladeRootFx函数,获取叶片根X方向的力
         """
-        blade =ctypes.c_int(blade)
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetBladeRootFx.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetBladeRootFx(num,blade)
+        return self.api.HawtC_S_GetBladeRootFx(turbnum, blade)
         
     def HawtC_S_GetBladeRootFy(self,turbnum,blade):
         """
         用于调用HawtC.dll中的HawtC_S_GetBladeRootFy函数,获取叶片根Y方向的力
         """
-        blade =ctypes.c_int(blade)
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetBladeRootFy.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetBladeRootFy(num,blade)
+        return self.api.HawtC_S_GetBladeRootFy(turbnum, blade)
         
     def HawtC_S_GetBladeRootFz(self,turbnum,blade):
         """
         用于调用HawtC.dll中的HawtC_S_GetBladeRootFz函数,获取叶片根Z方向的力
         """
-        blade =ctypes.c_int(blade)
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetBladeRootFz.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetBladeRootFz(num,blade)
+        return self.api.HawtC_S_GetBladeRootFz(turbnum, blade)
         
     def HawtC_S_GetBladeRootMx(self,turbnum,blade):
         """
         用于调用HawtC.dll中的HawtC_S_GetBladeRootMx函数,获取叶片根X方向的力矩
         """
-        blade1 =ctypes.c_int(blade)
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetBladeRootMx.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetBladeRootMx(num,blade1)
+        return self.api.HawtC_S_GetBladeRootMx(turbnum, blade)
         
     def HawtC_S_GetBladeRootMy(self,turbnum,blade):
         """
         用于调用HawtC.dll中的HawtC_S_GetBladeRootMy函数,获取叶片根Y方向的力矩
         """
-        blade1 =ctypes.c_int(blade)
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetBladeRootMy.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetBladeRootMy(num,blade1)
+        return self.api.HawtC_S_GetBladeRootMy(turbnum, blade)
         
     def HawtC_S_GetBladeRootMz(self,turbnum,blade):
         """
         用于调用HawtC.dll中的HawtC_S_GetBladeRootMz函数,获取叶片根Z方向的力矩
         """
-        blade1 =ctypes.c_int(blade)
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetBladeRootMz.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetBladeRootMz(num,blade1)
+        return self.api.HawtC_S_GetBladeRootMz(turbnum, blade)
         
     def HawtC_S_GetBladeLocalMx(self,turbnum,blade,section):
         """
         用于调用HawtC.dll中的HawtC_S_GetBladeLocalMx函数,获取叶片各节根X方向的力矩
         """
-        blade1 =ctypes.c_int(blade)
-        section1 =ctypes.c_int(section)
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetBladeLocalMx.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetBladeLocalMx(num,blade1,section1)
+        return self.api.HawtC_S_GetBladeLocalMx(turbnum, blade, section)
         
     def HawtC_S_GetBladeLocalMy(self,turbnum,blade,section):
         """
         用于调用HawtC.dll中的HawtC_S_GetBladeLocalMy函数,获取叶片各节根Y方向的力矩
         """
-        blade1 =ctypes.c_int(blade)
-        section1 =ctypes.c_int(section)
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetBladeLocalMy.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetBladeLocalMy(num,blade1,section1)
+        return self.api.HawtC_S_GetBladeLocalMy(turbnum, blade, section)
         
     def HawtC_S_GetBladeLocalMz(self,turbnum,blade,section):
         """
         用于调用HawtC.dll中的HawtC_S_GetBladeLocalMz函数,获取叶片各节根Z方向的力矩
         """
-        blade =ctypes.c_int(blade)
-        section =ctypes.c_int(section)
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetBladeLocalMz.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetBladeLocalMz(num,blade,section)
+        return self.api.HawtC_S_GetBladeLocalMz(turbnum, blade, section)
         
     def HawtC_S_GetBladeLocalFx(self,turbnum,blade,section):
         """
         用于调用HawtC.dll中的HawtC_S_GetBladeLocalFx函数,获取叶片各节根X方向的力
         """
-        blade =ctypes.c_int(blade)
-        section =ctypes.c_int(section)
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetBladeLocalFx.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetBladeLocalFx(num,blade,section)
-
+        return self.api.HawtC_S_GetBladeLocalFx(turbnum, blade, section)
+        
     def HawtC_S_GetBladeLocalFy(self,turbnum,blade,section):
         """
         用于调用HawtC.dll中的HawtC_S_GetBladeLocalFy函数,获取叶片各节根Y方向的力
         """
-        blade =ctypes.c_int(blade)
-        section =ctypes.c_int(section)
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetBladeLocalFy.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetBladeLocalFy(num,blade,section)
+        return self.api.HawtC_S_GetBladeLocalFy(turbnum, blade, section)
         
     def HawtC_S_GetBladeLocalFz(self,turbnum,blade,section):
         """
         用于调用HawtC.dll中的HawtC_S_GetBladeLocalFz函数,获取叶片各节根Z方向的力
         """
-        blade =ctypes.c_int(blade)
-        section =ctypes.c_int(section)
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetBladeLocalFz.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetBladeLocalFz(num,blade,section)
+        return self.api.HawtC_S_GetBladeLocalFz(turbnum, blade, section)
         
     def HawtC_S_GetPlatformSurge(self,turbnum):
         """
         用于调用HawtC.dll中的HawtC_S_GetPlatformSurge函数,获取平台 surge方向的位移
         """
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetPlatformSurge.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetPlatformSurge(num)
+        return self.api.HawtC_S_GetPlatformSurge(turbnum)
         
     def HawtC_S_GetPlatformSway(self,turbnum):
         """
         用于调用HawtC.dll中的HawtC_S_GetPlatformSway函数,获取平台 sway方向的位移
         """
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetPlatformSway.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetPlatformSway(num)
+        return self.api.HawtC_S_GetPlatformSway(turbnum)
         
     def HawtC_S_GetPlatformHeave(self,turbnum):
         """
         用于调用HawtC.dll中的HawtC_S_GetPlatformHeave函数,获取平台 heave方向的位移
         """
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetPlatformHeave.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetPlatformHeave(num)
+        return self.api.HawtC_S_GetPlatformHeave(turbnum)
         
     def HawtC_S_GetPlatformRoll(self,turbnum):
         """
         用于调用HawtC.dll中的HawtC_S_GetPlatformRoll函数,获取平台 roll方向的旋转
         """
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetPlatformRoll.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetPlatformRoll(num)
+        return self.api.HawtC_S_GetPlatformRoll(turbnum)
         
     def HawtC_S_GetPlatformPitch(self,turbnum):
         """
         用于调用HawtC.dll中的HawtC_S_GetPlatformPitch函数,获取平台 pitch方向的旋转
         """
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetPlatformPitch.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetPlatformPitch(num)
+        return self.api.HawtC_S_GetPlatformPitch(turbnum)
         
     def HawtC_S_GetPlatformYaw(self,turbnum):
         """
         用于调用HawtC.dll中的HawtC_S_GetPlatformYaw函数,获取平台 yaw方向的旋转
         """
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetPlatformYaw.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetPlatformYaw(num)
+        return self.api.HawtC_S_GetPlatformYaw(turbnum)
         
     def HawtC_S_GetPlatformSurgeVel(self,turbnum):
         """
         用于调用HawtC.dll中的HawtC_S_GetPlatformSurge函数,获取平台 surge方向的位移
         """
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetPlatformSurgeVel.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetPlatformSurgeVel(num)
+        return self.api.HawtC_S_GetPlatformSurgeVel(turbnum)
         
     def HawtC_S_GetPlatformSwayVel(self,turbnum):
         """
         用于调用HawtC.dll中的HawtC_S_GetPlatformSway函数,获取平台 sway方向的位移
         """
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetPlatformSwayVel.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetPlatformSwayVel(num)
+        return self.api.HawtC_S_GetPlatformSwayVel(turbnum)
         
     def HawtC_S_GetPlatformHeaveVel(self,turbnum):
         """
         用于调用HawtC.dll中的HawtC_S_GetPlatformHeave函数,获取平台 heave方向的位移
         """
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetPlatformHeaveVel.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetPlatformHeaveVel(num)
+        return self.api.HawtC_S_GetPlatformHeaveVel(turbnum)
         
     def HawtC_S_GetPlatformRollVel(self,turbnum):
         """
         用于调用HawtC.dll中的HawtC_S_GetPlatformRoll函数,获取平台 roll方向的旋转
         """
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetPlatformRollVel.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetPlatformRollVel(num)
+        return self.api.HawtC_S_GetPlatformRollVel(turbnum)
         
     def HawtC_S_GetPlatformPitchVel(self,turbnum):
         """
         用于调用HawtC.dll中的HawtC_S_GetPlatformPitch函数,获取平台 pitch方向的旋转
         """
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetPlatformPitchVel.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetPlatformPitchVel(num)
+        return self.api.HawtC_S_GetPlatformPitchVel(turbnum)
         
     def HawtC_S_GetPlatformYawVel(self,turbnum):
         """
         用于调用HawtC.dll中的HawtC_S_GetPlatformYaw函数,获取平台 yaw方向的旋转
         """
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetPlatformYawVel.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetPlatformYawVel(num)
-    
+        return self.api.HawtC_S_GetPlatformYawVel(turbnum)
+        
     
     def HawtC_S_GetPlatformSurgeAcc(self,turbnum):
         """
         用于调用HawtC.dll中的HawtC_S_GetPlatformSurge函数,获取平台 surge方向的位移
         """
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetPlatformSurgeAcc.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetPlatformSurgeAcc(num)
+        return self.api.HawtC_S_GetPlatformSurgeAcc(turbnum)
         
     def HawtC_S_GetPlatformSwayAcc(self,turbnum):
         """
         用于调用HawtC.dll中的HawtC_S_GetPlatformSway函数,获取平台 sway方向的位移
         """
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetPlatformSwayAcc.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetPlatformSwayAcc(num)
+        return self.api.HawtC_S_GetPlatformSwayAcc(turbnum)
         
     def HawtC_S_GetPlatformHeaveAcc(self,turbnum):
         """
         用于调用HawtC.dll中的HawtC_S_GetPlatformHeave函数,获取平台 heave方向的位移
         """
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetPlatformHeaveAcc.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetPlatformHeaveAcc(num)
+        return self.api.HawtC_S_GetPlatformHeaveAcc(turbnum)
         
     def HawtC_S_GetPlatformRollAcc(self,turbnum):
         """
         用于调用HawtC.dll中的HawtC_S_GetPlatformRoll函数,获取平台 roll方向的旋转
         """
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetPlatformRollAcc.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetPlatformRollAcc(num)
+        return self.api.HawtC_S_GetPlatformRollAcc(turbnum)
         
     def HawtC_S_GetPlatformPitchAcc(self,turbnum):
         """
         用于调用HawtC.dll中的HawtC_S_GetPlatformPitch函数,获取平台 pitch方向的旋转
         """
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetPlatformPitchAcc.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetPlatformPitchAcc(num)
+        return self.api.HawtC_S_GetPlatformPitchAcc(turbnum)
         
     def HawtC_S_GetPlatformYawAcc(self,turbnum):
         """
         用于调用HawtC.dll中的HawtC_S_GetPlatformYaw函数,获取平台 yaw方向的旋转
         """
-        num =ctypes.c_int(turbnum)
-        self.dll.HawtC_S_GetPlatformYawAcc.restype = ctypes.c_double
-        return  self.dll.HawtC_S_GetPlatformYawAcc(num)
-          
+        return self.api.HawtC_S_GetPlatformYawAcc(turbnum)
+        
     class Test:
         """
         用于测试HawtC.dll中的测试函数
@@ -433,6 +460,8 @@ class HawtC:
             # 创建 Python 委托
             AddcType = ctypes.CFUNCTYPE(ctypes.c_double, ctypes.c_double, ctypes.c_double)
             addc_delegate = AddcType(add_func)
+            # 保持委托引用,避免被回收后DLL调用到已释放的函数
+            self.addc_delegate = addc_delegate
             self.dll.SetAddc.argtypes = [ctypes.c_void_p]  # 设置参数类型
             # 将 Python 委托传递给 C# MBD
             self.dll.SetAddc(ctypes.cast(addc_delegate, ctypes.c_void_p))
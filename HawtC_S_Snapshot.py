@@ -0,0 +1,95 @@
+import functools
+
+import numpy as np
+
+# 载荷分量顺序,快照数组最后一维按此顺序排列
+LOAD_COMPONENTS = ("Fx", "Fy", "Fz", "Mx", "My", "Mz")
+# 平台自由度顺序
+PLATFORM_DOFS = ("Surge", "Sway", "Heave", "Roll", "Pitch", "Yaw")
+# 平台运动量: 位移/速度/加速度
+PLATFORM_KINDS = ("", "Vel", "Acc")
+
+
+class HawtC_Snapshot:
+    """
+    单台风机的结构状态快照,所有数组在创建时一次性分配,每次update()原地刷新
+
+    blade      : (nblade, nsection, 6) 叶片各截面载荷 Fx,Fy,Fz,Mx,My,Mz
+    blade_root : (nblade, 6)           叶根载荷
+    tower      : (ntower, 6)           塔架各节点载荷
+    tower_base : (6,)                  塔基载荷
+    platform   : (3, 6)                平台位移/速度/加速度 x Surge..Yaw
+
+    data可传入外部分配的一维数组(长度为HawtC_Snapshot.size(...)),用于多台风机共享一块连续内存
+    """
+    def __init__(self, api, turbnum, nblade, nsection, ntower, data=None):
+        self.turbnum = turbnum
+        self.nblade = nblade
+        self.nsection = nsection
+        self.ntower = ntower
+
+        sizes = self._sizes(nblade, nsection, ntower)
+        # 所有量共享一块连续内存,各数组均为其视图
+        if data is None:
+            data = np.zeros(sum(sizes))
+        elif data.shape != (sum(sizes),):
+            raise ValueError(f"快照数组长度应为{sum(sizes)}")
+        self.data = data
+        # 按元素写入self.data的视图,刷新时不分配临时列表
+        self._out = memoryview(data)
+        offsets = np.cumsum((0,) + sizes)
+        views = [self.data[offsets[i]:offsets[i + 1]] for i in range(len(sizes))]
+        self.blade = views[0].reshape(nblade, nsection, 6)
+        self.blade_root = views[1].reshape(nblade, 6)
+        self.tower = views[2].reshape(ntower, 6)
+        self.tower_base = views[3]
+        self.platform = views[4].reshape(3, 6)
+
+        self.rebind(api)
+
+    def rebind(self, api):
+        """
+        预先生成调用计划,顺序与self.data的内存布局一致;
+        api的函数被替换(如开启计时)后重新调用,数组保持不变
+        """
+        turbnum = self.turbnum
+        calls = []
+        for b in range(self.nblade):
+            for s in range(self.nsection):
+                for comp in LOAD_COMPONENTS:
+                    calls.append(functools.partial(getattr(api, "HawtC_S_GetBladeLocal" + comp), turbnum, b, s))
+        for b in range(self.nblade):
+            for comp in LOAD_COMPONENTS:
+                calls.append(functools.partial(getattr(api, "HawtC_S_GetBladeRoot" + comp), turbnum, b))
+        for j in range(self.ntower):
+            for comp in LOAD_COMPONENTS:
+                calls.append(functools.partial(getattr(api, "HawtC_S_GetLocalTower" + comp + "Loads"), turbnum, j))
+        for comp in LOAD_COMPONENTS:
+            calls.append(functools.partial(getattr(api, "HawtC_S_GetTowerBase" + comp), turbnum))
+        for kind in PLATFORM_KINDS:
+            for dof in PLATFORM_DOFS:
+                calls.append(functools.partial(getattr(api, "HawtC_S_GetPlatform" + dof + kind), turbnum))
+        self._calls = calls
+        return self
+
+    @staticmethod
+    def _sizes(nblade, nsection, ntower):
+        return (nblade * nsection * 6, nblade * 6, ntower * 6, 6, 18)
+
+    @staticmethod
+    def size(nblade, nsection, ntower) -> int:
+        """快照所需的数组总长度"""
+        return sum(HawtC_Snapshot._sizes(nblade, nsection, ntower))
+
+    def update(self):
+        """
+        一次遍历调用计划原地刷新全部数组,返回自身
+        """
+        out = self._out
+        for i, call in enumerate(self._calls):
+            out[i] = call()
+        return self
+
+    def __repr__(self) -> str:
+        return (f"<HawtC_Snapshot turbnum={self.turbnum} blade={self.blade.shape} "
+                f"tower={self.tower.shape} platform={self.platform.shape}>")
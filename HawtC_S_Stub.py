@@ -0,0 +1,66 @@
+import logging
+import os
+import shutil
+import subprocess
+import sys
+from typing import Optional
+
+logger = logging.getLogger('HawtC_S_Stub')
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# 桩库源码(导出与HawtC2_User_C.dll相同的函数,返回确定的合成数值)
+STUB_SOURCE = os.path.join(HERE, "stub", "HawtC_Stub.c")
+# 编译结果目录(不纳入版本控制)
+BUILD_DIR = os.path.join(HERE, "stub", "build")
+
+
+def stub_path() -> str:
+    """当前平台的桩库文件路径"""
+    if sys.platform == "win32":
+        name = "HawtC_Stub.dll"
+    elif sys.platform == "darwin":
+        name = "libHawtC_Stub.dylib"
+    else:
+        name = "libHawtC_Stub.so"
+    return os.path.join(BUILD_DIR, name)
+
+
+def _compile_command(compiler: str, source: str, target: str) -> list:
+    if os.path.basename(compiler).lower().startswith("cl"):
+        return [compiler, "/nologo", "/O2", "/LD", source, f"/Fe:{target}", f"/Fo:{BUILD_DIR}{os.sep}"]
+    command = [compiler, "-O2", "-shared", "-o", target, source]
+    if sys.platform != "win32":
+        command[3:3] = ["-fPIC"]
+        command.append("-lm")
+    return command
+
+
+def build_stub(force: bool = False, compiler: Optional[str] = None) -> str:
+    """
+    编译桩库,已存在且比源码新时直接返回
+    :param compiler: C编译器,默认依次使用环境变量CC、cc、gcc、clang、cl
+    :return: 桩库路径,可直接传给HawtC_S_Simulation.HawtC
+    """
+    target = stub_path()
+    if not force and os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(STUB_SOURCE):
+        return target
+    candidates = [compiler] if compiler else [os.environ.get("CC"), "cc", "gcc", "clang", "cl"]
+    compiler = next((shutil.which(c) for c in candidates if c and shutil.which(c)), None)
+    if compiler is None:
+        raise RuntimeError("未找到C编译器,请安装gcc/clang/MSVC或设置环境变量CC")
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    # 先编译到临时文件再替换,多个进程同时编译时不会加载到不完整的库
+    root, ext = os.path.splitext(target)
+    tmp_target = f"{root}.tmp{os.getpid()}{ext}"
+    command = _compile_command(compiler, STUB_SOURCE, tmp_target)
+    logger.info(" ".join(command))
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"桩库编译失败:\n{result.stdout}{result.stderr}")
+    os.replace(tmp_target, target)
+    return target
+
+
+if __name__ == "__main__":
+    # 用法: python HawtC_S_Stub.py [--force]
+    print(build_stub(force="--force" in sys.argv))
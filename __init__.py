@@ -1,9 +1,64 @@
 # 我们基于HawtC_c_dll.实现python调用
+
+# 区分"键不存在"与"键存在但值为空"(PyYAML把空值读为None)
+_MISSING = object()
+
+
 class YML:
     def __init__(self, path):
         self.path = path
+        self.data = None
+        # (键, 类型) -> 转换结果,load()时清空
+        self._converted = {}
 
     def load(self):
-        import yaml
-        with open(self.path, 'r', encoding='utf-8') as file:
-            return yaml.safe_load(file)
+        # 与HawtC_IO.YML共用加载与类型转换,有libyaml时使用C加速的加载器
+        from HawtC_IO import load_yaml
+        self.data = load_yaml(self.path)
+        self._converted.clear()
+        return self.data
+
+    def _lookup(self, key: str):
+        """按点分隔的键路径查找值,键不存在时返回_MISSING"""
+        if self.data is None:
+            self.load()
+        value = self.data
+        for part in key.split('.'):
+            if not isinstance(value, dict) or part not in value:
+                return _MISSING
+            value = value[part]
+        return value
+
+    def read(self, key: str, default=None):
+        """按点分隔的键路径读取值,键不存在时返回default"""
+        value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def _read_typed(self, key: str, kind: str, default):
+        """按类型读取并缓存转换结果;键不存在且未给出default时抛出KeyError,值为空时抛出ValueError"""
+        try:
+            return self._converted[key, kind]
+        except KeyError:
+            pass
+        from HawtC_IO import CONVERTERS
+        value = self._lookup(key)
+        if value is _MISSING:
+            if default is not None:
+                return default
+            raise KeyError(f"未找到节点: {key}")
+        if value is None:
+            raise ValueError(f"节点{key}没有值")
+        result = self._converted[key, kind] = CONVERTERS[kind](value)
+        return result
+
+    def read_float(self, key: str, default=None) -> float:
+        return self._read_typed(key, "float", default)
+
+    def read_int(self, key: str, default=None) -> int:
+        return self._read_typed(key, "int", default)
+
+    def read_bool(self, key: str, default=None) -> bool:
+        return self._read_typed(key, "bool", default)
+
+    def read_array(self, key: str, default=None):
+        return self._read_typed(key, "array", default)
@@ -0,0 +1,103 @@
+"""
+绑定层基准: 使用桩库(stub/HawtC_Stub.c,导出与HawtC2_User_C.dll相同的函数),
+统计单次取值调用开销(直接调用预绑定函数/HawtC方法/快照中的partial)、整机快照刷新耗时、
+带快照的步进循环吞吐量、开启/关闭调用计时后的步进吞吐量,以及多风机场的同步步进
+用法: python benchmarks/bench_binding.py
+"""
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from HawtC_S_Farm import HawtC_Farm  # noqa: E402
+from HawtC_S_Simulation import HawtC  # noqa: E402
+from HawtC_S_Stub import build_stub  # noqa: E402
+
+
+def _per_call(func, ncalls):
+    """单次调用的平均耗时(纳秒)"""
+    t0 = time.perf_counter()
+    for _ in range(ncalls):
+        func()
+    return 1e9 * (time.perf_counter() - t0) / ncalls
+
+
+def getters(sim, ncalls):
+    """三种调用方式取叶片截面Fx的开销"""
+    api = sim.api
+    snap = sim.snapshot(0, 3, 1, 1)
+    return {
+        "api_ns": _per_call(lambda: api.HawtC_S_GetBladeLocalFx(0, 1, 0), ncalls),
+        "method_ns": _per_call(lambda: sim.HawtC_S_GetBladeLocalFx(0, 1, 0), ncalls),
+        "partial_ns": _per_call(snap._calls[0], ncalls),
+        "update_step_ns": _per_call(lambda: api.HawtC_S_Update_Step(0, 0.0), ncalls),
+    }
+
+
+def snapshot(sim, nsection, ntower, repeats):
+    snap = sim.snapshot(0, 3, nsection, ntower)
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        snap.update()
+    elapsed = (time.perf_counter() - t0) / repeats
+    return {"nsection": nsection, "ntower": ntower, "values": snap.data.size,
+            "update_us": 1e6 * elapsed, "per_value_ns": 1e9 * elapsed / snap.data.size}
+
+
+def step_loop(sim, nsteps, nsection, ntower, dt=0.05):
+    """每步HawtC_S_Update_Step后刷新一次快照(通过step_hooks)"""
+    snap = sim.snapshot(0, 3, nsection, ntower)
+    hook = lambda times_n, t: snap.update()  # noqa: E731
+    sim.step_hooks.append(hook)
+    try:
+        t0 = time.perf_counter()
+        for i in range(nsteps):
+            sim.HawtC_S_Update_Step(i, (i + 1) * dt)
+        elapsed = time.perf_counter() - t0
+    finally:
+        sim.step_hooks.remove(hook)
+    return {"steps": nsteps, "values_per_step": snap.data.size, "wall_s": elapsed,
+            "steps_per_s": nsteps / elapsed}
+
+
+def profiler(sim, nsteps, nsection=20, ntower=10):
+    """开启调用计时时的步进吞吐量,以及关闭后是否恢复到未计时的水平"""
+    sim.snapshot(0, 3, nsection, ntower)
+    prof = sim.profile()
+    with prof.phase("steps"):
+        enabled = step_loop(sim, nsteps, nsection, ntower)
+    disabled = step_loop(sim, nsteps, nsection, ntower)
+    return {"enabled_steps_per_s": enabled["steps_per_s"], "disabled_steps_per_s": disabled["steps_per_s"],
+            "calls_recorded": prof.report()["steps"]["calls"]}
+
+
+def farm(sim, n_turbines, nsteps, dt=0.05):
+    f = HawtC_Farm(sim, ["stub.hst"] * n_turbines, nsection=20, ntower=10)
+    t0 = time.perf_counter()
+    for i in range(nsteps):
+        f.step((i + 1) * dt)
+    elapsed = time.perf_counter() - t0
+    sim.HawtC_S_Close(0)
+    return {"turbines": n_turbines, "steps": nsteps, "wall_s": elapsed,
+            "turbine_steps_per_s": n_turbines * nsteps / elapsed}
+
+
+def main(ncalls=200000, repeats=2000, nsteps=2000, farms=(1, 10)):
+    sim = HawtC(build_stub())
+    sim.HawtC_S_INI("stub.hst")
+    result = {
+        "benchmark": "binding",
+        "getters": getters(sim, ncalls),
+        "snapshot": [snapshot(sim, ns, nt, repeats) for ns, nt in ((1, 1), (20, 10), (50, 30))],
+        "step_loop": [step_loop(sim, nsteps, ns, nt) for ns, nt in ((1, 1), (20, 10))],
+        "profiler": profiler(sim, nsteps),
+    }
+    sim.HawtC_S_Close(0)
+    result["farm"] = [farm(sim, n, max(nsteps // n, 10)) for n in farms]
+    print(json.dumps(result))
+    return result
+
+
+if __name__ == "__main__":
+    main()
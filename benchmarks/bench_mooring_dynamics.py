@@ -0,0 +1,94 @@
+"""
+集中质量法系泊动力学基准: 把Mooring/lines.txt中的3根缆绳复制成不同数量,
+平台做纵荡正弦运动,统计每秒推进的节点步数(自由节点数 x 积分步数),
+并检查运行过程中内存不随时间增长(输出逐行写入文件,不在内存中累积)
+用法: python benchmarks/bench_mooring_dynamics.py
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from HawtC_IO_MoorDyn import load_moordyn  # noqa: E402
+from HawtC_Mooring_Dynamics import MooringDynamics  # noqa: E402
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def replicate(doc, copies):
+    """把系泊系统复制copies份(节点与缆绳重新编号,几何位置相同)"""
+    new = doc.copy()
+    nodes, lines = [], []
+    nnode = len(doc.nodes)
+    for k in range(copies):
+        block = doc.nodes.copy()
+        block["Node"] += k * nnode
+        nodes.append(block)
+        block = doc.lines.copy()
+        block["Line"] += k * len(doc.lines)
+        block["NodeAnch"] += k * nnode
+        block["NodeFair"] += k * nnode
+        lines.append(block)
+    new.nodes = np.concatenate(nodes)
+    new.lines = np.concatenate(lines)
+    return new
+
+
+def _advance(model, t_start, duration, coupling_dt, on_step=None):
+    """平台纵荡正弦运动,按耦合步长推进"""
+    platform = np.zeros(6)
+    nsteps = int(round(duration / coupling_dt))
+    for i in range(1, nsteps + 1):
+        t = t_start + i * coupling_dt
+        platform[0] = 2.0 * np.sin(2 * np.pi * 0.1 * t)
+        model.step(t, platform)
+        if on_step is not None:
+            on_step(i, nsteps)
+    return t_start + nsteps * coupling_dt
+
+
+def run_case(doc, duration, coupling_dt):
+    model = MooringDynamics(doc)
+    with tempfile.TemporaryDirectory() as tmp:
+        model.open_output(os.path.join(tmp, "Lines.out"))
+        t = _advance(model, 0.0, 0.5, coupling_dt)  # 预热
+
+        t0 = time.perf_counter()
+        t = _advance(model, t, duration, coupling_dt)
+        elapsed = time.perf_counter() - t0
+
+        # tracemalloc本身开销很大,内存单独再跑一段统计: 中点与终点的已分配内存应基本相同
+        mem = []
+        tracemalloc.start()
+        _advance(model, t, duration, coupling_dt,
+                 lambda i, n: mem.append(tracemalloc.get_traced_memory()[0]) if i in (n // 2, n) else None)
+        tracemalloc.stop()
+        model.close_output()
+    substeps = int(round(duration / model.dt))
+    return {
+        "lines": len(model.line_nodes),
+        "free_nodes": len(model.free),
+        "sim_time_s": duration,
+        "wall_s": elapsed,
+        "node_steps_per_s": len(model.free) * substeps / elapsed,
+        "realtime_factor": duration / elapsed,
+        "memory_mid_bytes": mem[0],
+        "memory_end_bytes": mem[1],
+    }
+
+
+def main(copies=(1, 10, 100), duration=1.0, coupling_dt=0.025):
+    doc = load_moordyn(os.path.join(HERE, "Mooring", "lines.txt"))
+    cases = [run_case(replicate(doc, n), duration, coupling_dt) for n in copies]
+    result = {"benchmark": "mooring_dynamics", "dt": MooringDynamics(doc).dt, "cases": cases}
+    print(json.dumps(result))
+    return result
+
+
+if __name__ == "__main__":
+    main()
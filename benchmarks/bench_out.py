@@ -0,0 +1,72 @@
+"""
+.out结果文件读取基准: 以Mooring/Lines.out原始大小及将数据行重复100次(时间顺延)的文件,
+统计整文件解析、分块流式读取、建立二进制缓存、缓存加载和时间窗口读取的吞吐量
+用法: python benchmarks/bench_out.py
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from HawtC_IO_Out import OUT  # noqa: E402
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE = os.path.join(HERE, "Mooring", "Lines.out")
+
+
+def replicate(path, copies):
+    """将Lines.out的数据行重复copies次,每次时间顺延整个时长"""
+    with open(SOURCE, 'r', encoding='utf-8') as f:
+        header = [f.readline(), f.readline()]
+        rows = [line.split('\t', 1) for line in f if line.strip()]
+    times = [float(t) for t, _ in rows]
+    span = times[-1] - times[0] + (times[1] - times[0])
+    with open(path, 'w', encoding='utf-8') as f:
+        f.writelines(header)
+        for k in range(copies):
+            offset = k * span
+            f.writelines(f"{t + offset:g}\t{rest}" for t, (_, rest) in zip(times, rows))
+    return path
+
+
+def _timed(func):
+    t0 = time.perf_counter()
+    func()
+    return time.perf_counter() - t0
+
+
+def run_case(path):
+    out = OUT(path)
+    mb = out.size / 1e6
+    data = out.read()
+    rows = len(data[out.time_channel])
+    t_end = float(data[out.time_channel][-1])
+    result = {"bytes": out.size, "rows": rows, "channels": len(out.channels)}
+    result["read_s"] = _timed(out.read)
+    result["read_one_channel_s"] = _timed(lambda: out.read([out.channels[1]]))
+    result["iter_blocks_s"] = _timed(lambda: [None for _ in out.iter_blocks()])
+    result["read_window_10pct_s"] = _timed(lambda: out.read_window(0.45 * t_end, 0.55 * t_end))
+    result["build_cache_s"] = _timed(out.build_cache)
+    result["load_cached_s"] = _timed(lambda: [float(a[-1]) for a in out.load().values()])
+    result["read_MB_per_s"] = mb / result["read_s"]
+    result["rows_per_s"] = rows / result["read_s"]
+    shutil.rmtree(out.cache_dir, ignore_errors=True)
+    return result
+
+
+def main(copies=(1, 100)):
+    with tempfile.TemporaryDirectory() as tmp:
+        # 在临时目录中读取,索引与缓存文件不写入仓库
+        cases = [run_case(replicate(os.path.join(tmp, f"Lines_x{n}.out"), n)) for n in copies]
+    for n, case in zip(copies, cases):
+        case["copies"] = n
+    result = {"benchmark": "out", "source": os.path.relpath(SOURCE, HERE), "cases": cases}
+    print(json.dumps(result))
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+HawtC_IO.YML规模基准: 生成1k/10k/100k个节点的配置文件,
+统计加载、按完整路径读取全部节点、类型化读取列表、添加节点、格式化、删除子树、批量事务、保存、拷贝与变体的耗时;
+另外模拟10k个工况的参数扫描启动: 反复打开同一批配置文件,比较默认加载与只读+解析缓存加载
+用法: python benchmarks/bench_yml.py
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import HawtC_IO  # noqa: E402
+from HawtC_IO import YML  # noqa: E402
+
+
+def synthetic_yml(path, nnodes, fanout=10):
+    """
+    生成约nnodes个节点的配置文件: 每个分组fanout个子分组,每个子分组fanout个数值键,
+    每10个子分组带一个"-  "列表值
+    :return: 所有叶子节点的完整键路径
+    """
+    keys = []
+    lines = []
+    ngroups = max(nnodes // (1 + fanout * (1 + fanout)), 1)
+    for g in range(ngroups):
+        lines.append(f"Group{g}:")
+        for s in range(fanout):
+            lines.append(f"  Sub{s}:")
+            for k in range(fanout):
+                lines.append(f"    Key{k}: {g * 0.5 + s + k * 0.001}")
+                keys.append(f"Group{g}.Sub{s}.Key{k}")
+            if s == 0:
+                lines.append("    Table:")
+                lines.extend(f"      -  {v} {v * 2}" for v in range(5))
+                keys.append(f"Group{g}.Sub{s}.Table")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+    return keys
+
+
+def _timed(func):
+    t0 = time.perf_counter()
+    func()
+    return time.perf_counter() - t0
+
+
+def run_case(nnodes, tmp):
+    path = os.path.join(tmp, f"bench_{nnodes}.yml")
+    keys = synthetic_yml(path, nnodes)
+    result = {"nodes_requested": nnodes}
+    holder = {}
+
+    result["load_s"] = _timed(lambda: holder.setdefault("yml", YML(path)))
+    yml = holder["yml"]
+    result["nodes"] = len(yml.node_list)
+    result["read_all_s"] = _timed(lambda: [yml.read(k) for k in keys])
+    # 只给出末尾两级的后缀查找
+    suffixes = [k.split('.', 1)[1] for k in keys[:1000]]
+    result["read_suffix_1000_s"] = _timed(lambda: [yml.read(k) for k in suffixes])
+    # 类型化读取: 第一次解析,之后命中节点上的转换缓存
+    tables = [k for k in keys if k.endswith("Table")]
+    result["read_array_first_s"] = _timed(lambda: [yml.read_array(k) for k in tables])
+    result["read_array_cached_s"] = _timed(lambda: [yml.read_array(k) for k in tables])
+    result["add_1000_s"] = _timed(lambda: [yml.add_node(f"Added.Sub{i // 100}.Key{i}", str(i))
+                                           for i in range(1000)])
+    result["formatting_s"] = _timed(yml.formatting)
+    result["find_children_all_s"] = _timed(lambda: [yml.find_children(k.rsplit('.', 1)[0])
+                                                    for k in keys[::10]])
+    result["delete_subtree_s"] = _timed(lambda: yml.delete_node("Group0"))
+    # 事务: 修改1000个已有键、添加1000个新键、删除至多10个子树,提交时只格式化一次
+    edits = {k: "0" for k in keys[len(keys) // 2:len(keys) // 2 + 1000]}
+    edits.update({f"Batch.Sub{i // 100}.Key{i}": str(i) for i in range(1000)})
+    result["batch_update_2000_s"] = _timed(lambda: yml.update(edits))
+    groups = list(dict.fromkeys(k.split('.', 1)[0] for k in keys))[1:11]
+    result["batch_delete_10_s"] = _timed(lambda: yml.delete(groups))
+    result["save_s"] = _timed(lambda: yml.save(path))
+    # 参数化工况: 完整拷贝与只记录5个修改键的写时复制变体
+    result["clone_s"] = _timed(yml.clone)
+    changed = keys[-5:]
+    result["variant_1000_s"] = _timed(lambda: [yml.variant().update({k: str(i) for k in changed})
+                                               for i in range(1000)])
+    result["per_node_us"] = 1e6 * (result["load_s"] + result["read_all_s"] + result["formatting_s"]) / result["nodes"]
+    return result
+
+
+def sweep_startup(tmp, ncases=10000, nfiles=100, nnodes=200):
+    """ncases个工况轮流打开nfiles个配置文件并读取一个键,各加载方式的总耗时"""
+    paths = []
+    for i in range(nfiles):
+        path = os.path.join(tmp, f"case_{i}.yml")
+        synthetic_yml(path, nnodes)
+        paths.append(path)
+    key = "Group0.Sub0.Key0"
+    modes = {
+        "default_nocache_s": dict(cache=False),
+        "default_cached_s": dict(),
+        "readonly_cached_s": dict(readonly=True),
+    }
+    result = {"cases": ncases, "files": nfiles, "nodes_per_file": nnodes}
+    for name, kwargs in modes.items():
+        result[name] = _timed(lambda: [YML(paths[i % nfiles], **kwargs).read(key) for i in range(ncases)])
+    result["speedup"] = result["default_nocache_s"] / result["readonly_cached_s"]
+    return result
+
+
+def main(sizes=(1000, 10000, 100000), ncases=10000):
+    with tempfile.TemporaryDirectory() as tmp:
+        # 解析缓存放在临时目录,不影响其他缓存
+        HawtC_IO.CACHE_DIR = os.path.join(tmp, "cache")
+        cases = [run_case(n, tmp) for n in sizes]
+        startup = sweep_startup(tmp, ncases)
+    result = {"benchmark": "yml", "cases": cases, "sweep_startup": startup}
+    print(json.dumps(result))
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+基准测试套件: 依次运行绑定层(桩库)、YML解析/格式化规模、.out读取等基准,
+将结果连同运行环境(提交号、Python/NumPy版本、平台)写入一个JSON文件;
+给出--compare时与之前的结果逐项比较耗时/吞吐量,变差超过阈值的指标列为回退
+用法: python benchmarks/run_all.py [--quick] [--output result.json] [--compare baseline.json] [--threshold 0.2]
+"""
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Optional
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+import bench_binding  # noqa: E402
+import bench_fatigue  # noqa: E402
+import bench_mooring_dynamics  # noqa: E402
+import bench_out  # noqa: E402
+import bench_yml  # noqa: E402
+
+# 基准名 -> (入口函数, 完整规模的参数, --quick时的参数)
+SUITE = {
+    "binding": (bench_binding.main, {}, dict(ncalls=20000, repeats=200, nsteps=200)),
+    "yml": (bench_yml.main, {}, dict(sizes=(1000, 10000), ncases=1000)),
+    "out": (bench_out.main, {}, dict(copies=(1, 10))),
+    "fatigue": (bench_fatigue.main, {}, dict(duration=600.0, nch=10, nref=2)),
+    "mooring_dynamics": (bench_mooring_dynamics.main, {}, dict(copies=(1, 10))),
+}
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=BENCH_DIR, capture_output=True,
+                                text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "time": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run(names, quick=False) -> dict:
+    results = {}
+    for name in names:
+        func, full, small = SUITE[name]
+        t0 = time.perf_counter()
+        # 各基准自身打印的JSON不输出到终端,统一写入结果文件
+        with contextlib.redirect_stdout(io.StringIO()):
+            results[name] = func(**(small if quick else full))
+        print(f"{name}: {time.perf_counter() - t0:.1f}s", file=sys.stderr)
+    return {"environment": environment(), "quick": quick, "results": results}
+
+
+def flatten(obj, prefix="") -> dict:
+    """将嵌套结果展开为 路径 -> 数值"""
+    items = {}
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            items.update(flatten(value, f"{prefix}.{key}" if prefix else str(key)))
+    elif isinstance(obj, list):
+        for i, value in enumerate(obj):
+            items.update(flatten(value, f"{prefix}[{i}]"))
+    elif isinstance(obj, (int, float)) and not isinstance(obj, bool):
+        items[prefix] = float(obj)
+    return items
+
+
+def _higher_is_better(name: str) -> Optional[bool]:
+    """按指标名判断方向: 吞吐量越大越好,耗时越小越好,其他指标不比较"""
+    leaf = name.rsplit('.', 1)[-1]
+    if "_per_s" in leaf or leaf.endswith(("speedup", "realtime_factor")):
+        return True
+    if leaf.endswith(("_s", "_ns", "_us")):
+        return False
+    return None
+
+
+def compare(current: dict, baseline: dict, threshold: float = 0.2) -> dict:
+    """
+    比较两次运行的结果
+    :return: {"regressions": [...], "improvements": [...]},每项为(指标, 基准值, 当前值, 变化比例)
+    """
+    cur, base = flatten(current["results"]), flatten(baseline["results"])
+    regressions, improvements = [], []
+    for name in sorted(cur.keys() & base.keys()):
+        higher = _higher_is_better(name)
+        if higher is None or base[name] <= 0 or cur[name] <= 0:
+            continue
+        # 变化比例统一为"变差"的方向为正
+        change = base[name] / cur[name] - 1 if higher else cur[name] / base[name] - 1
+        item = (name, base[name], cur[name], round(change, 4))
+        if change > threshold:
+            regressions.append(item)
+        elif change < -threshold:
+            improvements.append(item)
+    return {"threshold": threshold, "regressions": regressions, "improvements": improvements}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("names", nargs="*", help=f"只运行指定的基准: {', '.join(SUITE)}")
+    parser.add_argument("--quick", action="store_true", help="缩小规模,用于快速检查")
+    parser.add_argument("--output", help="结果JSON文件,默认输出到终端")
+    parser.add_argument("--compare", help="与之前保存的结果比较")
+    parser.add_argument("--threshold", type=float, default=0.2, help="视为回退的变差比例")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.names if name not in SUITE]
+    if unknown:
+        parser.error(f"未知的基准: {', '.join(unknown)}")
+
+    result = run(args.names or list(SUITE), args.quick)
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            result["comparison"] = compare(result, json.load(f), args.threshold)
+    text = json.dumps(result, indent=1)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+    if args.compare and result["comparison"]["regressions"]:
+        for name, old, new, change in result["comparison"]["regressions"]:
+            print(f"回退: {name} {old:.4g} -> {new:.4g} ({change:+.0%})", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
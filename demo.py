@@ -23,4 +23,18 @@ for i in range(1000):
     Fx=sim.HawtC_S_GetBladeLocalFx(0,1,0)
     print(Fx)
 # 关闭仿真
-sim.HawtC_S_Close(0)
\ No newline at end of file
+sim.HawtC_S_Close(0)
+
+###################### DEMO 3 通道记录器 ######################
+from HawtC_S_Recorder import HawtC_Recorder
+
+sim.HawtC_S_INI(r"G:\2026\HawtC2\demo\5MW_Spar\HawtC2_5MW_PowerProduction_Spar.hst")
+# 每2步采样一次,缓冲区写满后追加写入磁盘
+recorder = HawtC_Recorder(sim, ["TowerBaseMy", "PlatformPitch", "BladeRootMx[b=1]"],
+                          capacity=10000, decimation=2, spill_path=r"./result/record.bin")
+with recorder:
+    t = 0
+    for i in range(1000):
+        t = t + dt
+        sim.HawtC_S_Update_Step(i, t)
+sim.HawtC_S_Close(0)
@@ -0,0 +1,167 @@
+/*
+ * HawtC2_User_C.dll 的桩实现: 导出与 HawtC_S_Simulation.HAWTC_S_SIGNATURES 相同的函数,
+ * 返回由时间、风机编号和节点编号确定的合成数值, 用于在没有真实DLL的平台上测试绑定层并测量其开销.
+ * 编译: python HawtC_S_Stub.py (或 cc -O2 -shared -fPIC -o libHawtC_Stub.so HawtC_Stub.c -lm)
+ */
+#include <math.h>
+#include <stddef.h>
+
+#ifdef _WIN32
+#define EXPORT __declspec(dllexport)
+#else
+#define EXPORT __attribute__((visibility("default")))
+#endif
+
+#define MAX_TURBINES 256
+#define NSTATE 8
+#define NCOMMAND 3
+/* HawtC_S_Solve 的固定步数与步长 */
+#define SOLVE_STEPS 1000
+#define SOLVE_DT 0.05
+
+static const double PI = 3.14159265358979323846;
+/* 转子转频与平台运动频率 (Hz) */
+static const double ROTOR_FREQ = 0.2;
+static const double PLATFORM_FREQ = 0.1;
+/* 载荷分量 Fx,Fy,Fz,Mx,My,Mz 的量级 */
+static const double LOAD_SCALE[6] = {5.0e4, 2.0e4, 3.0e5, 1.0e6, 2.0e6, 5.0e5};
+
+typedef void (*controller_t)(int turbnum, int times_n, double t,
+                             double *state, int nstate, double *command, int ncommand);
+typedef double (*addc_t)(double, double);
+
+static double T = 0.0;
+static int N_TURBINES = 0;
+static controller_t CONTROLLER = NULL;
+static addc_t ADDC = NULL;
+static double STATE[MAX_TURBINES][NSTATE];
+static double COMMAND[MAX_TURBINES][NCOMMAND];
+
+static int clamp_turbine(int turbnum)
+{
+    return turbnum < 0 ? 0 : (turbnum >= MAX_TURBINES ? MAX_TURBINES - 1 : turbnum);
+}
+
+/* 分量comp在(风机, 叶片/塔架节点, 截面)处的载荷: 随转子方位角周期变化, 沿展向线性增大 */
+static double load(int comp, int turbnum, int blade, int section)
+{
+    int k = clamp_turbine(turbnum);
+    double azimuth = 2.0 * PI * ROTOR_FREQ * T + 2.0 * PI * blade / 3.0 + 0.1 * turbnum;
+    double value = LOAD_SCALE[comp] * (1.0 + 0.1 * section) * (1.0 + 0.1 * sin(azimuth + comp));
+    /* 控制指令的第一个量(变桨角, 度)降低挥舞方向载荷 */
+    if (comp == 4)
+        value *= 1.0 - 0.01 * COMMAND[k][0];
+    return value;
+}
+
+/* 平台自由度dof的位移(order=0)/速度(1)/加速度(2) */
+static double platform(int dof, int turbnum, int order)
+{
+    double w = 2.0 * PI * PLATFORM_FREQ;
+    double amp = dof < 3 ? 2.0 / (dof + 1) : 0.05 / (dof - 2);
+    double phase = w * T + 0.1 * turbnum + dof;
+    if (order == 0)
+        return amp * sin(phase);
+    if (order == 1)
+        return amp * w * cos(phase);
+    return -amp * w * w * sin(phase);
+}
+
+EXPORT void HawtC_S_INI(const char *path)
+{
+    (void)path;
+    if (N_TURBINES < MAX_TURBINES)
+        N_TURBINES++;
+    T = 0.0;
+}
+
+EXPORT void HawtC_S_Close(int turbnum)
+{
+    (void)turbnum;
+    int k, i;
+    N_TURBINES = 0;
+    T = 0.0;
+    for (k = 0; k < MAX_TURBINES; k++)
+        for (i = 0; i < NCOMMAND; i++)
+            COMMAND[k][i] = 0.0;
+}
+
+EXPORT void HawtC_S_Update_Step(int times_n, double t)
+{
+    int k, n = N_TURBINES > 0 ? N_TURBINES : 1;
+    T = t;
+    if (CONTROLLER == NULL)
+        return;
+    for (k = 0; k < n; k++) {
+        STATE[k][0] = t;
+        STATE[k][1] = 2.0 * PI * ROTOR_FREQ;
+        STATE[k][2] = COMMAND[k][0];
+        STATE[k][3] = platform(4, k, 0);
+        STATE[k][4] = platform(0, k, 0);
+        STATE[k][5] = platform(0, k, 1);
+        STATE[k][6] = load(4, k, 0, 0);
+        STATE[k][7] = (double)times_n;
+        CONTROLLER(k, times_n, t, STATE[k], NSTATE, COMMAND[k], NCOMMAND);
+    }
+}
+
+EXPORT void HawtC_S_Solve(void)
+{
+    int i;
+    for (i = 0; i < SOLVE_STEPS; i++)
+        HawtC_S_Update_Step(i, (i + 1) * SOLVE_DT);
+}
+
+EXPORT void HawtC_S_SetController(void *callback)
+{
+    CONTROLLER = (controller_t)callback;
+}
+
+static double addc(double a, double b)
+{
+    return ADDC != NULL ? ADDC(a, b) : a + b;
+}
+
+EXPORT void *GetAddc(void)
+{
+    return (void *)addc;
+}
+
+EXPORT void SetAddc(void *callback)
+{
+    ADDC = (addc_t)callback;
+}
+
+#define LOAD_GETTERS(C, I)                                                                      \
+    EXPORT double HawtC_S_GetTowerBase##C(int turbnum) { return load(I, turbnum, 0, 0); }       \
+    EXPORT double HawtC_S_GetLocalTower##C##Loads(int turbnum, int j)                           \
+    {                                                                                           \
+        return load(I, turbnum, 3, j);                                                          \
+    }                                                                                           \
+    EXPORT double HawtC_S_GetBladeRoot##C(int turbnum, int blade)                               \
+    {                                                                                           \
+        return load(I, turbnum, blade, 0);                                                      \
+    }                                                                                           \
+    EXPORT double HawtC_S_GetBladeLocal##C(int turbnum, int blade, int section)                 \
+    {                                                                                           \
+        return load(I, turbnum, blade, section);                                                \
+    }
+
+LOAD_GETTERS(Fx, 0)
+LOAD_GETTERS(Fy, 1)
+LOAD_GETTERS(Fz, 2)
+LOAD_GETTERS(Mx, 3)
+LOAD_GETTERS(My, 4)
+LOAD_GETTERS(Mz, 5)
+
+#define PLATFORM_GETTERS(D, I)                                                                  \
+    EXPORT double HawtC_S_GetPlatform##D(int turbnum) { return platform(I, turbnum, 0); }       \
+    EXPORT double HawtC_S_GetPlatform##D##Vel(int turbnum) { return platform(I, turbnum, 1); }  \
+    EXPORT double HawtC_S_GetPlatform##D##Acc(int turbnum) { return platform(I, turbnum, 2); }
+
+PLATFORM_GETTERS(Surge, 0)
+PLATFORM_GETTERS(Sway, 1)
+PLATFORM_GETTERS(Heave, 2)
+PLATFORM_GETTERS(Roll, 3)
+PLATFORM_GETTERS(Pitch, 4)
+PLATFORM_GETTERS(Yaw, 5)
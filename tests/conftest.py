@@ -0,0 +1,36 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """解析缓存和结果库写到每个测试自己的临时目录"""
+    import HawtC_IO
+    path = tmp_path / "cache"
+    monkeypatch.setattr(HawtC_IO, "CACHE_DIR", str(path))
+    return path
+
+
+@pytest.fixture(scope="session")
+def stub_dll():
+    """编译桩库(stub/HawtC_Stub.c),没有C编译器时跳过依赖它的测试"""
+    from HawtC_S_Stub import build_stub
+    try:
+        return build_stub()
+    except RuntimeError as exc:
+        pytest.skip(str(exc))
+
+
+@pytest.fixture
+def sim(stub_dll):
+    """加载桩库的HawtC会话,结束时取消控制器并释放全部风机(桩库的状态是进程内全局的)"""
+    from HawtC_S_Simulation import HawtC
+    sim = HawtC(stub_dll)
+    yield sim
+    sim.set_controller(None)
+    sim.HawtC_S_Close(0)
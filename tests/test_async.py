@@ -0,0 +1,110 @@
+import asyncio
+import time
+
+import numpy as np
+
+from HawtC_S_Async import HawtC_AsyncSession
+
+
+def test_close_does_not_block_event_loop():
+    ticks = []
+
+    async def ticker(stop):
+        while not stop.is_set():
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    async def main():
+        stop = asyncio.Event()
+        task = asyncio.ensure_future(ticker(stop))
+        async with HawtC_AsyncSession(sim=None) as session:
+            # 模拟一次耗时的DLL调用,退出时仍在执行
+            session._executor.submit(time.sleep, 0.3)
+            await asyncio.sleep(0)
+            start = time.monotonic()
+        closed = time.monotonic()
+        stop.set()
+        await task
+        return start, closed
+
+    start, closed = asyncio.run(main())
+    assert closed - start >= 0.25
+    # 关闭期间其他协程继续运行
+    assert sum(start <= t <= closed for t in ticks) >= 5
+
+
+def test_run_yields_steps_in_order(sim):
+    sim.HawtC_S_INI("stub.hst")
+    sim.snapshot(0, 3, 2, 2)
+
+    async def main():
+        rows = []
+        async with HawtC_AsyncSession(sim, queue_size=2) as session:
+            async for n, t, state in session.run(20, 0.05, gather=lambda: sim.snapshot(0).data):
+                rows.append((n, t, state[0]))
+        return rows
+
+    rows = asyncio.run(main())
+    assert [n for n, _, _ in rows] == list(range(20))
+    np.testing.assert_allclose([t for _, t, _ in rows], 0.05 * np.arange(1, 21))
+
+
+def test_break_with_full_queue_does_not_hang(sim):
+    sim.HawtC_S_INI("stub.hst")
+    sim.snapshot(0, 3, 2, 2)
+
+    async def main():
+        async with HawtC_AsyncSession(sim, queue_size=2) as session:
+            agen = session.run(50, 0.05, gather=lambda: sim.snapshot(0).data)
+            async for n, t, state in agen:
+                if n == 3:
+                    # 等生产者填满队列后再退出
+                    await asyncio.sleep(0.2)
+                    break
+            start = time.monotonic()
+            await asyncio.wait_for(agen.aclose(), 5.0)
+            return time.monotonic() - start, session.steps
+
+    elapsed, steps = asyncio.run(main())
+    assert elapsed < 1.0
+    # 生产者最多领先消费者queue_size步
+    assert steps <= 4 + 2 + 1
+
+
+def test_caller_cancellation_is_not_swallowed():
+    async def main():
+        async with HawtC_AsyncSession(sim=None, queue_size=1) as session:
+            session._step_and_gather = lambda t, gather: t
+            agen = session.run(10, 0.1)
+            await agen.__anext__()
+            closing = asyncio.ensure_future(agen.aclose())
+            # aclose进入finally,等待生产者结束时被调用方取消(如wait_for超时)
+            await asyncio.sleep(0)
+            closing.cancel()
+            try:
+                await closing
+            except asyncio.CancelledError:
+                return True
+            return False
+
+    assert asyncio.run(main())
+
+
+def test_producer_error_reaches_consumer():
+    async def main():
+        async with HawtC_AsyncSession(sim=None, queue_size=1) as session:
+            def fail(t, gather):
+                if t > 0.25:
+                    raise RuntimeError("求解失败")
+                return t
+            session._step_and_gather = fail
+            seen = []
+            try:
+                async for n, t, state in session.run(10, 0.1):
+                    seen.append(n)
+                    await asyncio.sleep(0.05)
+            except RuntimeError as exc:
+                return seen, str(exc)
+
+    seen, message = asyncio.run(main())
+    assert seen == [0, 1] and message == "求解失败"
@@ -0,0 +1,75 @@
+import json
+import os
+
+from HawtC_S_Batch import HawtC_BatchRunner, HawtC_Ledger
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _cases(tmp_path, names):
+    paths = []
+    for name in names:
+        path = tmp_path / f"{name}.hst"
+        path.write_text("stub\n", encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+def _ledger_lines(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def test_ledger_resume(stub_dll, tmp_path):
+    ledger = str(tmp_path / "ledger.jsonl")
+    first = _cases(tmp_path, ["a", "b", "c"])
+    results = HawtC_BatchRunner(stub_dll, ledger, workers=2, timeout=60).run(first)
+    assert set(results.values()) == {"done"}
+    assert len(_ledger_lines(ledger)) == 3
+
+    # 重新运行时只求解新增的工况,已完成的工况不再启动
+    more = first + _cases(tmp_path, ["d"])
+    results = HawtC_BatchRunner(stub_dll, ledger, workers=2, timeout=60).run(more)
+    assert set(results.values()) == {"done"}
+    records = _ledger_lines(ledger)
+    assert [r["case"] for r in records[3:]] == [more[3]]
+
+
+def test_ledger_resume_after_interruption(stub_dll, tmp_path):
+    ledger = str(tmp_path / "ledger.jsonl")
+    cases = _cases(tmp_path, ["a", "b", "c"])
+    # 中断前: a已完成,b失败,c未记录;最后一行写到一半
+    with open(ledger, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({"case": cases[0], "status": "done", "attempts": 1}) + "\n")
+        f.write(json.dumps({"case": cases[1], "status": "failed", "attempts": 2}) + "\n")
+        f.write('{"case": "' + cases[2][:5])
+    assert HawtC_Ledger(ledger).is_done(cases[0])
+    assert not HawtC_Ledger(ledger).is_done(cases[1])
+
+    results = HawtC_BatchRunner(stub_dll, ledger, workers=2, timeout=60).run(cases)
+    assert results == {case: "done" for case in cases}
+    reloaded = HawtC_Ledger(ledger)
+    assert all(reloaded.is_done(case) for case in cases)
+    # 已完成的a没有重新运行
+    assert reloaded.records[cases[0]] == {"case": cases[0], "status": "done", "attempts": 1}
+
+
+def _failing_case(dll_path, hst_path):
+    """子进程入口: 模拟.hst不存在时DLL写出的日志(每次运行内容完全相同)并正常退出"""
+    import shutil
+    from HawtC_S_Log import LOG_NAME
+    shutil.copyfile(os.path.join(ROOT, LOG_NAME), LOG_NAME)
+
+
+def test_rerun_with_identical_failing_log_is_error(stub_dll, tmp_path):
+    ledger = str(tmp_path / "ledger.jsonl")
+    cases = _cases(tmp_path, ["a"])
+    for attempt in range(2):
+        runner = HawtC_BatchRunner(stub_dll, ledger, workers=1, timeout=60, target=_failing_case,
+                                   watch_log=True, log_interval=0.05)
+        assert runner.run(cases) == {cases[0]: "error"}
+    records = _ledger_lines(ledger)
+    assert [r["status"] for r in records] == ["error", "error"]
+    assert "不存在" in records[-1]["error"]
+    # 上一次运行的日志改名保留
+    assert os.path.exists(os.path.join(tmp_path, "a.run", "OpenWECD.HawtC2.log.prev"))
@@ -0,0 +1,198 @@
+import ctypes
+
+import numpy as np
+import pytest
+
+from HawtC_S_Controller import HawtC_Controller, HawtC_ControllerBridge
+from HawtC_S_Farm import HawtC_Farm
+from HawtC_S_Recorder import HawtC_Recorder, load_spill
+from HawtC_S_Snapshot import LOAD_COMPONENTS, PLATFORM_DOFS, PLATFORM_KINDS
+
+
+def _expected_snapshot(api, turbnum, nblade, nsection, ntower):
+    """逐个调用取值函数得到与快照相同布局的数组"""
+    blade = np.array([[[getattr(api, "HawtC_S_GetBladeLocal" + c)(turbnum, b, s) for c in LOAD_COMPONENTS]
+                       for s in range(nsection)] for b in range(nblade)])
+    root = np.array([[getattr(api, "HawtC_S_GetBladeRoot" + c)(turbnum, b) for c in LOAD_COMPONENTS]
+                     for b in range(nblade)])
+    tower = np.array([[getattr(api, f"HawtC_S_GetLocalTower{c}Loads")(turbnum, j) for c in LOAD_COMPONENTS]
+                      for j in range(ntower)])
+    base = np.array([getattr(api, "HawtC_S_GetTowerBase" + c)(turbnum) for c in LOAD_COMPONENTS])
+    platform = np.array([[getattr(api, f"HawtC_S_GetPlatform{d}{k}")(turbnum) for d in PLATFORM_DOFS]
+                         for k in PLATFORM_KINDS])
+    return blade, root, tower, base, platform
+
+
+def _assert_snapshot(snap, expected):
+    blade, root, tower, base, platform = expected
+    np.testing.assert_array_equal(snap.blade, blade)
+    np.testing.assert_array_equal(snap.blade_root, root)
+    np.testing.assert_array_equal(snap.tower, tower)
+    np.testing.assert_array_equal(snap.tower_base, base)
+    np.testing.assert_array_equal(snap.platform, platform)
+
+
+def test_snapshot_matches_getters(sim):
+    sim.HawtC_S_INI("stub.hst")
+    sim.HawtC_S_Update_Step(0, 0.35)
+    snap = sim.snapshot(0, 3, 4, 3)
+    _assert_snapshot(snap, _expected_snapshot(sim.api, 0, 3, 4, 3))
+    before = snap.data.copy()
+    sim.HawtC_S_Update_Step(1, 1.1)
+    # 同一个快照对象原地刷新
+    assert sim.snapshot(0) is snap
+    assert not np.array_equal(snap.data, before)
+    _assert_snapshot(snap, _expected_snapshot(sim.api, 0, 3, 4, 3))
+
+
+def test_snapshot_rebind_after_profiling(sim):
+    sim.HawtC_S_INI("stub.hst")
+    snap = sim.snapshot(0, 3, 2, 2)
+    with sim.profile().phase("steps"):
+        sim.HawtC_S_Update_Step(0, 0.5)
+        snap.update()
+    _assert_snapshot(snap, _expected_snapshot(sim.api, 0, 3, 2, 2))
+
+
+CHANNELS = ["TowerBaseMy", "BladeLocalFx[b=1,s=2]", "BladeRootMz[b=2]", "LocalTowerFyLoads[j=3]",
+            "PlatformPitchVel", "PlatformSurge[t=0]"]
+
+
+def _direct(api, t):
+    return [t, api.HawtC_S_GetTowerBaseMy(0), api.HawtC_S_GetBladeLocalFx(0, 1, 2),
+            api.HawtC_S_GetBladeRootMz(0, 2), api.HawtC_S_GetLocalTowerFyLoads(0, 3),
+            api.HawtC_S_GetPlatformPitchVel(0), api.HawtC_S_GetPlatformSurge(0)]
+
+
+def _run_with_reference(sim, nsteps, dt=0.05, decimation=1):
+    expected = []
+    hook = lambda times_n, t: times_n % decimation == 0 and expected.append(_direct(sim.api, t))  # noqa: E731
+    sim.step_hooks.append(hook)
+    for i in range(nsteps):
+        sim.HawtC_S_Update_Step(i, (i + 1) * dt)
+    sim.step_hooks.remove(hook)
+    return np.array(expected)
+
+
+def test_recorder_matches_getters(sim):
+    sim.HawtC_S_INI("stub.hst")
+    with HawtC_Recorder(sim, CHANNELS, capacity=100) as rec:
+        expected = _run_with_reference(sim, 30)
+    np.testing.assert_array_equal(rec.data(), expected)
+    np.testing.assert_array_equal(rec.channel("BladeRootMz[b=2]"), expected[:, 3])
+
+
+def test_recorder_ring_buffer_and_decimation(sim):
+    sim.HawtC_S_INI("stub.hst")
+    with HawtC_Recorder(sim, CHANNELS, capacity=8, decimation=3) as rec:
+        expected = _run_with_reference(sim, 40, decimation=3)
+    assert rec.samples == len(expected) == 14
+    # 环形缓冲区只保留最近capacity次采样
+    np.testing.assert_array_equal(rec.data(), expected[-8:])
+
+
+def test_recorder_spill(sim, tmp_path):
+    sim.HawtC_S_INI("stub.hst")
+    path = str(tmp_path / "rec.bin")
+    with HawtC_Recorder(sim, CHANNELS, capacity=4, spill_path=path):
+        expected = _run_with_reference(sim, 10)
+    channels, data = load_spill(path)
+    assert channels == CHANNELS
+    np.testing.assert_array_equal(data, expected)
+
+
+def test_farm_matches_getters(sim):
+    farm = HawtC_Farm(sim, ["stub.hst"] * 3, nsection=2, ntower=2)
+    farm.run(7, 0.05)
+    assert farm.steps == 7
+    for i, snap in enumerate(farm.snapshots):
+        blade, root, tower, base, platform = _expected_snapshot(sim.api, i, 3, 2, 2)
+        np.testing.assert_array_equal(farm.blade[i], blade)
+        np.testing.assert_array_equal(farm.blade_root[i], root)
+        np.testing.assert_array_equal(farm.tower[i], tower)
+        np.testing.assert_array_equal(farm.tower_base[i], base)
+        np.testing.assert_array_equal(farm.platform[i], platform)
+        # 整场数组与各风机快照共享内存
+        assert np.shares_memory(snap.data, farm.data)
+    # 不同风机的方位角相位不同
+    assert not np.array_equal(farm.blade[0], farm.blade[1])
+    farm.close()
+
+
+class _Pitch(HawtC_Controller):
+    """变桨角为gain*t,t超过fail_at时抛出异常"""
+    def __init__(self, gain=10.0, fail_at=None):
+        self.gain = gain
+        self.fail_at = fail_at
+        self.seen = []
+
+    def update(self, turbnum, t, state, command):
+        if self.fail_at is not None and t > self.fail_at:
+            raise ValueError(f"控制器在t={t:.2f}出错")
+        self.seen.append((turbnum, t, state[7]))
+        command[0] = self.gain * t
+
+
+def test_controller_writes_command(sim):
+    sim.HawtC_S_INI("stub.hst")
+    controller = _Pitch(gain=0.0)
+    sim.set_controller(controller)
+    sim.HawtC_S_Update_Step(0, 0.5)
+    free = sim.api.HawtC_S_GetBladeLocalMy(0, 0, 0)
+    controller.gain = 10.0
+    sim.HawtC_S_Update_Step(1, 0.5)
+    pitched = sim.api.HawtC_S_GetBladeLocalMy(0, 0, 0)
+    assert controller.seen == [(0, 0.5, 0.0), (0, 0.5, 1.0)]
+    # 桩库按变桨角(command[0],此处为5度)降低挥舞方向载荷
+    assert pitched == pytest.approx(free * (1 - 0.01 * 5.0), rel=1e-12)
+
+
+def test_controller_exception_propagates(sim):
+    sim.HawtC_S_INI("stub.hst")
+    controller = _Pitch(fail_at=0.12)
+    sim.set_controller(controller)
+    sim.HawtC_S_Update_Step(0, 0.05)
+    sim.HawtC_S_Update_Step(1, 0.10)
+    with pytest.raises(ValueError, match="t=0.15"):
+        sim.HawtC_S_Update_Step(2, 0.15)
+    # 异常只抛出一次,控制器恢复正常后可继续步进
+    controller.fail_at = None
+    sim.HawtC_S_Update_Step(3, 0.20)
+    assert [t for _, t, _ in controller.seen] == [0.05, 0.10, 0.20]
+
+
+def test_controller_exception_propagates_from_solve(sim):
+    sim.HawtC_S_INI("stub.hst")
+    controller = _Pitch(fail_at=1.0)
+    sim.set_controller(controller)
+    with pytest.raises(ValueError, match="t=1.05"):
+        sim.HawtC_Solve()
+    # 之后各步的异常不再保存,也不会在下一次步进时抛出
+    assert sim._controller.error is None
+    controller.fail_at = None
+    sim.HawtC_S_Update_Step(0, 0.05)
+
+
+def test_controller_base_is_abstract():
+    with pytest.raises(TypeError):
+        HawtC_Controller()
+
+
+def test_controller_views_follow_reallocated_buffers():
+    controller = _Pitch()
+    bridge = HawtC_ControllerBridge(None, controller)
+    kept = []
+    for step in range(20):
+        # DLL每步重新分配缓冲区
+        state = (ctypes.c_double * 8)(*range(step, step + 8))
+        command = (ctypes.c_double * 2)()
+        kept.append((state, command))
+        for turbnum in (0, 1):
+            bridge._on_step(turbnum, step, 0.1 * step, ctypes.addressof(state), 8,
+                            ctypes.addressof(command), 2)
+        assert command[0] == pytest.approx(controller.gain * 0.1 * step)
+    assert bridge.error is None
+    assert [s for _, _, s in controller.seen[::2]] == [step + 7.0 for step in range(20)]
+    # 每台风机的state/command各只缓存一个视图
+    assert len(bridge._views) == 4
+    assert bridge._views[(0, 0)][0] == ctypes.addressof(kept[-1][0])
@@ -0,0 +1,76 @@
+from collections import Counter
+
+import numpy as np
+import pytest
+
+import HawtC_Post_Fatigue
+from HawtC_Post_Fatigue import damage_equivalent_load, fatigue_damage, rainflow, rainflow_reference
+
+
+def _histogram(ranges, counts):
+    table = Counter()
+    for r, n in zip(ranges, counts):
+        table[float(r)] += float(n)
+    return dict(table)
+
+
+def _sorted(result):
+    ranges, means, counts = result
+    order = np.lexsort((counts, means, ranges))
+    return ranges[order], means[order], counts[order]
+
+
+def test_astm_e1049_example():
+    # ASTM E1049-85 第5.4.4节的示例载荷历程及其雨流计数表
+    x = np.array([-2, 1, -3, 5, -1, 3, -4, 4, -2], dtype=float)
+    expected = {3.0: 0.5, 4.0: 1.5, 6.0: 0.5, 8.0: 1.0, 9.0: 0.5}
+    ranges, _, counts = rainflow(x)
+    assert _histogram(ranges, counts) == expected
+    ranges, _, counts = rainflow_reference(x)
+    assert _histogram(ranges, counts) == expected
+
+
+@pytest.mark.parametrize("kind", ["noise", "walk", "narrowband"])
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_reference(kind, seed):
+    rng = np.random.default_rng(seed)
+    n = 20000
+    if kind == "noise":
+        x = rng.normal(size=n)
+    elif kind == "walk":
+        x = np.cumsum(rng.normal(size=n))
+    else:
+        t = np.arange(n) * 0.02
+        x = np.sin(2 * np.pi * 0.3 * t) + 0.2 * rng.normal(size=n)
+    # 量化后含相邻重复值和相等幅值,覆盖<=边界
+    x = np.round(x, 1)
+    for actual, expected in zip(_sorted(rainflow(x)), _sorted(rainflow_reference(x))):
+        np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-12)
+
+
+def test_sequential_fallback_matches_reference(monkeypatch):
+    # 每轮都切换到顺序算法
+    monkeypatch.setattr(HawtC_Post_Fatigue, "_MIN_PASS_FRACTION", 1.0)
+    x = np.round(np.random.default_rng(7).normal(size=5000), 2)
+    for actual, expected in zip(_sorted(rainflow(x)), _sorted(rainflow_reference(x))):
+        np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("x", [[], [1.0], [1.0, 2.0], [1.0, 1.0, 1.0], [0.0, 1.0, 0.0]])
+def test_short_series(x):
+    ranges, _, counts = rainflow(x)
+    ref_ranges, _, ref_counts = rainflow_reference(x)
+    assert _histogram(ranges, counts) == _histogram(ref_ranges, ref_counts)
+
+
+def test_damage_equivalent_load_per_channel_slopes():
+    rng = np.random.default_rng(3)
+    data = rng.normal(size=(3000, 3)).cumsum(axis=0)
+    slopes = [3.0, 4.0, 10.0]
+    neq = 600.0
+    expected = []
+    for c, m in enumerate(slopes):
+        ranges, _, counts = rainflow_reference(data[:, c])
+        expected.append((np.dot(counts, ranges ** m) / neq) ** (1 / m))
+    np.testing.assert_allclose(damage_equivalent_load(data, slopes, neq), expected, rtol=1e-12)
+    np.testing.assert_allclose(fatigue_damage(data[:, 0], 3.0), fatigue_damage(data, slopes)[:1], rtol=1e-12)
@@ -0,0 +1,153 @@
+import os
+
+import pytest
+
+from HawtC_S_Log import LOG_NAME, HawtC_LogMonitor, HawtC_RunError, parse_line, rotate_log
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _sample() -> bytes:
+    """仓库中的DLL日志样例: 许可证正确、加速库都未找到、.hst不存在导致RUN.ERROR"""
+    with open(os.path.join(ROOT, LOG_NAME), 'rb') as f:
+        return f.read()
+
+
+def _write(path, data: bytes, mode='wb'):
+    with open(path, mode) as f:
+        f.write(data)
+
+
+def _bump_mtime(path):
+    # 保证重写后的修改时间与之前不同(部分文件系统的时间精度较低)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def test_parse_sample_log():
+    events = [parse_line(line, i) for i, line in enumerate(_sample().decode('utf-8').splitlines(), 1)]
+    kinds = [e.kind for e in events]
+    assert kinds[0] == "header"
+    assert kinds.count("error") == 1 and kinds[-1] == "run_error"
+    build = next(e for e in events if e.kind == "build")
+    assert build.data == {"version": "VVSCODE CALL_Release_x64", "date": "2024.11.27", "math": "SIMD@zzz"}
+    backends = {e.data["name"]: e.data["available"] for e in events if e.kind == "backend"}
+    assert backends == {"Native": False, "MKL": False, "OpenBLAS": False, "CUDA": False}
+    licenses = [e.data for e in events if e.kind == "license"]
+    assert all(data["ok"] for data in licenses)
+    assert any(data.get("date") == "2025-05-21" and data.get("holder") == "超级用户" for data in licenses)
+    error = next(e for e in events if e.kind == "error")
+    assert "HawtC2_5MW_PowerProduction_Spar.hst不存在" in error.data["message"]
+
+
+@pytest.mark.parametrize("line, kind", [
+    ("[Message]: MKL acc loaded", "backend"),
+    ("[Warning]: 步长过大", "warning"),
+    ("[Message]: 读取完成", "message"),
+    ("Read File!", "info"),
+])
+def test_parse_line_kinds(line, kind):
+    assert parse_line(line).kind == kind
+
+
+def test_summary_of_sample(tmp_path):
+    path = tmp_path / LOG_NAME
+    _write(path, _sample())
+    log = HawtC_LogMonitor(str(path))
+    with pytest.raises(HawtC_RunError) as info:
+        log.check()
+    assert "不存在" in str(info.value) and info.value.events == log.errors
+    assert log.build["math"] == "SIMD@zzz"
+    assert log.backend == "SIMD@zzz"
+    assert log.license["ok"]
+
+
+def test_poll_reads_appended_lines_only(tmp_path):
+    path = tmp_path / LOG_NAME
+    _write(path, b"[Message]: a\n[Message]: b")
+    log = HawtC_LogMonitor(str(path))
+    assert [e.text for e in log.poll()] == ["[Message]: a"]
+    # 不完整的行在换行写出后才解析
+    _write(path, b"b\n[Message]: c\n", 'ab')
+    assert [e.text for e in log.poll()] == ["[Message]: bb", "[Message]: c"]
+    assert log.poll() == []
+    assert [e.line for e in log.events] == [1, 2, 3]
+
+
+def test_truncated_or_recreated_log_is_reread(tmp_path):
+    path = tmp_path / LOG_NAME
+    _write(path, b"[Message]: old line one\n[Message]: old line two\n")
+    log = HawtC_LogMonitor(str(path))
+    log.poll()
+    _write(path, b"ERROR! :x\n")
+    assert [e.kind for e in log.poll()] == ["error"]
+    os.remove(path)
+    _write(path, b"[Message]: new\n")
+    assert [e.text for e in log.poll()] == ["[Message]: new"]
+    assert log.errors == []
+
+
+def test_rewrite_with_different_tail_is_reread(tmp_path):
+    path = tmp_path / LOG_NAME
+    _write(path, b"[Message]: first run\n")
+    log = HawtC_LogMonitor(str(path))
+    log.poll()
+    # 原地重写为更长的内容,已读部分的末尾字节不同
+    with open(path, 'r+b') as f:
+        f.write(b"ERROR! :second run failed\n")
+    assert [e.kind for e in log.poll()] == ["error"]
+
+
+def test_skip_ignores_previous_run(tmp_path):
+    path = tmp_path / LOG_NAME
+    _write(path, _sample())
+    log = HawtC_LogMonitor(str(path)).skip()
+    log.check()
+    _write(path, b"[Message]: next\n", 'ab')
+    log.check()
+    assert [e.text for e in log.events] == ["[Message]: next"]
+
+
+def test_identical_rewrite_after_skip_is_reported(tmp_path):
+    path = tmp_path / LOG_NAME
+    _write(path, _sample())
+    log = HawtC_LogMonitor(str(path)).skip()
+    # 同一工况再次运行,DLL原地写出完全相同的日志(长度和inode都不变)
+    with open(path, 'r+b') as f:
+        f.write(_sample())
+    _bump_mtime(path)
+    with pytest.raises(HawtC_RunError):
+        log.check()
+    assert [e.kind for e in log.errors] == ["error", "run_error"]
+    # 之后没有变化时不再重复读取
+    assert log.poll() == []
+
+
+def test_gbk_log(tmp_path):
+    path = tmp_path / LOG_NAME
+    _write(path, " ERROR! :当前文件不存在\n".encode('gbk'))
+    log = HawtC_LogMonitor(str(path))
+    assert log.poll()[0].data["message"] == "当前文件不存在"
+
+
+def test_rotate_log(tmp_path):
+    path = str(tmp_path / LOG_NAME)
+    assert rotate_log(path) is None
+    _write(path, _sample())
+    assert rotate_log(path) == path + ".prev"
+    assert not os.path.exists(path)
+    with open(path + ".prev", 'rb') as f:
+        assert f.read() == _sample()
+
+
+def test_background_watch(tmp_path):
+    path = tmp_path / LOG_NAME
+    _write(path, b"[Message]: start\n")
+    failed = []
+    log = HawtC_LogMonitor(str(path)).start(interval=0.01, on_error=failed.append)
+    try:
+        _write(path, b"ERROR! :boom\n", 'ab')
+        log._thread.join(5.0)
+    finally:
+        log.stop()
+    assert failed == [log] and log.error_message() == "boom"
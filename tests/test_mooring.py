@@ -0,0 +1,35 @@
+import os
+
+import numpy as np
+
+from HawtC_IO_MoorDyn import load_moordyn
+from HawtC_IO_Out import OUT
+from HawtC_Mooring_Catenary import MooringSystem
+
+MOORING = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Mooring")
+TENSIONS = ["FAIRTEN1", "FAIRTEN2", "ANCHTEN1"]
+
+
+def _reference(t, channels, tmp_path):
+    """Lines.out中时刻t的一行(拷贝到临时目录读取,时间索引不写入仓库)"""
+    path = tmp_path / "Lines.out"
+    path.write_bytes(open(os.path.join(MOORING, "Lines.out"), 'rb').read())
+    window = OUT(str(path)).read_window(t, t, channels)
+    assert all(len(window[ch]) == 1 for ch in channels)
+    return np.array([window[ch][0] for ch in channels])
+
+
+def test_catenary_static_tension_matches_lines_out(tmp_path):
+    system = MooringSystem(load_moordyn(os.path.join(MOORING, "lines.txt")))
+    static = system.solve(np.zeros(6))
+    computed = [static["fairlead_tension"][0], static["fairlead_tension"][1], static["anchor_tension"][0]]
+    np.testing.assert_allclose(computed, _reference(0.0, TENSIONS, tmp_path), rtol=5e-3)
+
+
+def test_dynamics_at_rest_matches_lines_out(tmp_path):
+    from HawtC_Mooring_Dynamics import MooringDynamics
+    model = MooringDynamics(load_moordyn(os.path.join(MOORING, "lines.txt"))).settle()
+    for t in (0.0, 0.5, 1.0, 2.0):
+        model.step(t, np.zeros(6))
+        reference = _reference(t, model.output_names, tmp_path)
+        np.testing.assert_allclose(model.outputs(), reference, rtol=1e-2, err_msg=f"t={t}")
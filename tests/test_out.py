@@ -0,0 +1,81 @@
+import os
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from HawtC_IO_Out import OUT
+
+
+def _write_out(path, rows, time_column=1):
+    """time_column列为时间(步长0.1),其余列为合成数据"""
+    names = ["X", "Y", "Z"]
+    names.insert(time_column, "Time")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("\t".join(names) + "\n")
+        f.write("\t".join("s" if n == "Time" else "-" for n in names) + "\n")
+        for i in range(rows):
+            values = [f"{i * 2}", f"{np.sin(i):.6f}", f"{i % 7}"]
+            values.insert(time_column, f"{i * 0.1:.1f}")
+            f.write("\t".join(values) + "\n")
+    return str(path)
+
+
+def test_cache_matches_text_and_records_time_channel(tmp_path):
+    out = OUT(_write_out(tmp_path / "a.out", 3000, time_column=1))
+    meta = out.build_cache(chunk_size=4096)
+    assert meta["time_channel"] == "Time" == out.time_channel
+    assert meta["rows"] == 3000
+    full = out.read()
+    cached = out.load()
+    for name in out.channels:
+        np.testing.assert_array_equal(cached[name], full[name])
+
+
+def test_build_cache_streams_blocks(tmp_path):
+    out = OUT(_write_out(tmp_path / "big.out", 200000))
+    full_bytes = 200000 * len(out.channels) * 8
+    tracemalloc.start()
+    out.build_cache(chunk_size=64 * 1024)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # 逐块写入,峰值内存远小于整个文件的数值数据
+    assert peak < full_bytes / 2
+
+
+def test_empty_body(tmp_path):
+    path = tmp_path / "empty.out"
+    path.write_text("Time A\ns -\n", encoding="utf-8")
+    out = OUT(str(path))
+    assert out.build_cache()["rows"] == 0
+    assert len(out.load()["A"]) == 0
+
+
+def test_read_window_matches_full_read(tmp_path):
+    out = OUT(_write_out(tmp_path / "w.out", 2000))
+    full = out.read()
+    assert not os.path.exists(out.index_path)  # 完整读取不写索引
+    window = out.read_window(12.3, 45.6)
+    mask = (full["Time"] >= 12.3) & (full["Time"] <= 45.6)
+    for name in out.channels:
+        np.testing.assert_array_equal(window[name], full[name][mask])
+    assert os.path.exists(out.index_path)
+
+
+@pytest.mark.parametrize("blocker", ["directory", "readonly"])
+def test_read_window_without_writable_index(tmp_path, blocker):
+    out = OUT(_write_out(tmp_path / "w.out", 2000))
+    full = out.read()
+    if blocker == "directory":
+        os.mkdir(out.index_path)
+    else:
+        os.chmod(tmp_path, 0o555)
+        if os.access(tmp_path, os.W_OK):  # root不受权限限制
+            os.chmod(tmp_path, 0o755)
+            pytest.skip("当前用户可写只读目录")
+    try:
+        window = out.read_window(100.0, 100.5, ["X"])
+    finally:
+        os.chmod(tmp_path, 0o755)
+    mask = (full["Time"] >= 100.0) & (full["Time"] <= 100.5)
+    np.testing.assert_array_equal(window["X"], full["X"][mask])
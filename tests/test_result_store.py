@@ -0,0 +1,76 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+import HawtC_S_ResultStore
+from HawtC_S_ResultStore import HawtC_ResultStore
+
+
+def _arrays(n=1000):
+    return {"t": np.arange(n, dtype=float)}
+
+
+def _age(store, key, mtime):
+    os.utime(os.path.join(store._entry_dir(key), "meta.json"), (mtime, mtime))
+
+
+def test_size_tracks_puts_and_overwrites(tmp_path):
+    store = HawtC_ResultStore(str(tmp_path / "store"))
+    store.put("aa01", _arrays(100))
+    store.put("bb02", _arrays(200))
+    store.put("aa01", _arrays(300))
+    assert store.size() == store._scan_total()
+    assert sorted(key for _, _, key in store.entries()) == ["aa01", "bb02"]
+
+
+def test_put_below_limit_does_not_scan(tmp_path, monkeypatch):
+    store = HawtC_ResultStore(str(tmp_path / "store"))
+    store.put("aa01", _arrays())
+
+    def scan():
+        raise AssertionError("put扫描了全部结果")
+
+    monkeypatch.setattr(store, "entries", scan)
+    for i in range(5):
+        store.put(f"cc{i:02d}", _arrays())
+    monkeypatch.undo()
+    assert store.size() == store._scan_total()
+
+
+def test_evicts_least_recently_used(tmp_path):
+    one = HawtC_ResultStore(str(tmp_path / "probe")).put("aa00", _arrays())
+    store = HawtC_ResultStore(str(tmp_path / "store"), max_bytes=3 * one)
+    for i, key in enumerate(("aa01", "bb02", "cc03")):
+        store.put(key, _arrays())
+        _age(store, key, 1000.0 + i)
+    # 读取刷新最近使用时间
+    assert store.get("aa01") is not None
+    store.put("dd04", _arrays())
+    keys = {key for _, _, key in store.entries()}
+    assert "aa01" in keys and "dd04" in keys and "bb02" not in keys
+    assert store.size() == store._scan_total() <= store.max_bytes * HawtC_S_ResultStore.EVICT_FRACTION
+
+
+def test_index_rebuilt_when_missing_or_stale(tmp_path):
+    store = HawtC_ResultStore(str(tmp_path / "store"))
+    store.put("aa01", _arrays())
+    store.put("bb02", _arrays())
+    os.remove(store.index_path)
+    assert store.size() == store._scan_total()
+    with open(store.index_path, 'w', encoding='utf-8') as f:
+        json.dump({"version": -1, "bytes": 0}, f)
+    store.put("cc03", _arrays())
+    assert store.size() == store._scan_total()
+    store.clear()
+    assert store.size() == 0 and store.entries() == []
+
+
+@pytest.mark.parametrize("bad", ["", "[]", "{\"version\": 1}"])
+def test_corrupt_index(tmp_path, bad):
+    store = HawtC_ResultStore(str(tmp_path / "store"))
+    store.put("aa01", _arrays())
+    with open(store.index_path, 'w', encoding='utf-8') as f:
+        f.write(bad)
+    assert store.size() == store._scan_total()
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from HawtC_Post_Stats import HawtC_Stats
+
+CHANNELS = ["normal", "skewed", "offset", "constant"]
+
+
+def _signal(n=60000, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(n) * 0.01
+    data = np.column_stack([
+        rng.normal(3.0, 2.0, n),
+        rng.exponential(5.0, n) - 20.0,
+        1e5 + np.sin(0.7 * t) + 0.1 * rng.normal(size=n),
+        np.full(n, 7.5),
+    ])
+    return t, data
+
+
+def _chunks(n, rng):
+    edges = np.sort(rng.choice(np.arange(1, n), size=17, replace=False))
+    return list(zip(np.r_[0, edges], np.r_[edges, n]))
+
+
+def _assert_matches(stats, t, data):
+    mean = data.mean(axis=0)
+    d = data - mean
+    m2 = (d ** 2).mean(axis=0)
+    assert stats.n == len(data)
+    np.testing.assert_allclose(stats.mean, mean, rtol=1e-12)
+    np.testing.assert_allclose(stats.std, data.std(axis=0), rtol=1e-9, atol=1e-12)
+    varying = m2 > 0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        skewness = (d ** 3).mean(axis=0) / m2 ** 1.5
+        kurtosis = (d ** 4).mean(axis=0) / m2 ** 2
+    # 偏度接近0的通道(均值1e5)按绝对误差比较
+    np.testing.assert_allclose(stats.skewness[varying], skewness[varying], rtol=1e-7, atol=1e-7)
+    np.testing.assert_allclose(stats.kurtosis[varying], kurtosis[varying], rtol=1e-7)
+    np.testing.assert_array_equal(stats.min, data.min(axis=0))
+    np.testing.assert_array_equal(stats.max, data.max(axis=0))
+    np.testing.assert_array_equal(stats.tmin, t[data.argmin(axis=0)])
+    np.testing.assert_array_equal(stats.tmax, t[data.argmax(axis=0)])
+
+    # 直方图近似: 百分位数落在对应秩两侧的样本之间,误差不超过两个箱宽
+    q = np.array([1, 5, 25, 50, 75, 95, 99])
+    ordered = np.sort(data, axis=0)
+    rank = q / 100 * (len(data) - 1)
+    below = ordered[np.maximum(np.floor(rank).astype(int) - 1, 0)]
+    above = ordered[np.minimum(np.ceil(rank).astype(int) + 1, len(data) - 1)]
+    tolerance = 2 * stats.hist_width
+    estimate = stats.percentile(q)
+    assert np.all(estimate >= below - tolerance) and np.all(estimate <= above + tolerance)
+    assert np.all(np.abs(estimate - np.percentile(data, q, axis=0)) <= above - below + tolerance)
+
+
+def test_streaming_matches_one_shot():
+    t, data = _signal()
+    stats = HawtC_Stats(CHANNELS)
+    for lo, hi in _chunks(len(data), np.random.default_rng(1)):
+        stats.update(data[lo:hi], t[lo:hi])
+    _assert_matches(stats, t, data)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_merged_chunks_match_one_shot(seed):
+    t, data = _signal(seed=seed)
+    rng = np.random.default_rng(seed + 10)
+    parts = []
+    for lo, hi in _chunks(len(data), rng):
+        parts.append(HawtC_Stats(CHANNELS).update(data[lo:hi], t[lo:hi]))
+    # 以随机顺序两两合并,各部分的直方图箱宽、起点不同
+    while len(parts) > 1:
+        a = parts.pop(rng.integers(len(parts)))
+        b = parts.pop(rng.integers(len(parts)))
+        parts.append(a.merge(b))
+    _assert_matches(parts[0], t, data)
+
+
+def test_merge_empty_and_mismatched():
+    t, data = _signal(1000)
+    full = HawtC_Stats(CHANNELS).update(data, t)
+    merged = HawtC_Stats(CHANNELS).merge(full).merge(HawtC_Stats(CHANNELS))
+    _assert_matches(merged, t, data)
+    # 合并到空的统计量时复制数组,之后互不影响
+    merged.update(data[:10], t[:10])
+    assert full.n == len(data)
+    with pytest.raises(ValueError):
+        full.merge(HawtC_Stats(CHANNELS[:2]))
+
+
+def test_equal_extremes_keep_earliest_time():
+    first = HawtC_Stats(["x"]).update(np.array([[1.0], [5.0]]), np.array([10.0, 11.0]))
+    second = HawtC_Stats(["x"]).update(np.array([[5.0], [1.0]]), np.array([2.0, 3.0]))
+    merged = first.merge(second)
+    assert (merged.tmin[0], merged.tmax[0]) == (3.0, 2.0)
@@ -0,0 +1,125 @@
+import random
+
+import pytest
+
+from HawtC_IO import YML
+
+
+def _find_by_scan(yml, key):
+    """逐个比较node_list的查找方式(索引之前的实现),作为find_node_by_key的参考结果"""
+    keys = key.split('.')
+    for node in reversed(yml.node_list):
+        if node.name != keys[-1]:
+            continue
+        temp = node
+        for part in reversed(keys[:-1]):
+            temp = temp.parent
+            if temp is None or temp.name != part:
+                break
+        else:
+            return node
+    return None
+
+
+def _random_yml(path, rng):
+    names = ["a", "b", "b3", "x", "y"]
+    lines, depth = [], 0
+    for i in range(rng.randint(3, 25)):
+        depth = rng.randint(0, min(depth + 1, 3)) if lines else 0
+        lines.append("  " * depth + f"{rng.choice(names)}: {i}")
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_find_node_by_key_matches_scan(tmp_path):
+    rng = random.Random(1)
+    checked = 0
+    for trial in range(200):
+        path = tmp_path / f"case{trial}.yml"
+        _random_yml(path, rng)
+        yml = YML(str(path), cache=False)
+        keys = set()
+        for node in yml.node_list:
+            parts = yml.get_node_key(node).split('.')
+            keys.update('.'.join(parts[i:]) for i in range(len(parts)))
+        for key in keys:
+            assert yml.find_node_by_key(key) is _find_by_scan(yml, key), key
+            checked += 1
+    assert checked > 1000
+
+
+def test_find_node_by_key_prefers_last_suffix_match(tmp_path):
+    path = tmp_path / "a.yml"
+    path.write_text("b3: 1\nx:\n  b3: 2\n", encoding="utf-8")
+    yml = YML(str(path), cache=False)
+    assert yml.find_node_by_key("b3").value.strip() == "2"
+    assert yml.find_node_by_key("x.b3").value.strip() == "2"
+
+
+def _package_yml():
+    """仓库根目录__init__.py中基于PyYAML的YML"""
+    import importlib.util
+    import os
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    spec = importlib.util.spec_from_file_location("_openwecd_init", os.path.join(root, "__init__.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.YML
+
+
+def test_package_yml_typed_reads(tmp_path, monkeypatch):
+    path = tmp_path / "a.yml"
+    path.write_text("a:\n  x: 1.5\n  n: 3\n  flag: yes\n  table: [1, 2, 3]\n  empty:\n", encoding="utf-8")
+    yml = _package_yml()(str(path))
+    assert yml.read_float("a.x") == 1.5
+    assert yml.read_int("a.n") == 3
+    assert yml.read_bool("a.flag") is True
+    table = yml.read_array("a.table")
+    assert table.tolist() == [1.0, 2.0, 3.0]
+
+    # 转换结果按(键, 类型)缓存,重复读取不再转换
+    import HawtC_IO
+    calls = []
+    original = HawtC_IO.CONVERTERS["array"]
+    monkeypatch.setitem(HawtC_IO.CONVERTERS, "array", lambda v: calls.append(v) or original(v))
+    assert yml.read_array("a.table") is table
+    assert calls == []
+
+    # 键存在但值为空与键不存在区别对待
+    assert yml.read("a.empty", "d") is None
+    assert yml.read("a.missing", "d") == "d"
+    with pytest.raises(ValueError):
+        yml.read_float("a.empty")
+    with pytest.raises(KeyError):
+        yml.read_float("a.missing")
+    assert yml.read_float("a.missing", 2.0) == 2.0
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("-1.5", [-1.5]),
+    ("-1 -2 -3", [-1.0, -2.0, -3.0]),
+    ("-1,2,-3", [-1.0, 2.0, -3.0]),
+    ("-  -1.5", [-1.5]),
+    ("-  -1 2\n-  3 -4", [[-1.0, 2.0], [3.0, -4.0]]),
+    ("-  -1\n-  -2", [-1.0, -2.0]),
+])
+def test_to_array_negative_values(value, expected):
+    from HawtC_IO import to_array
+    assert to_array(value).tolist() == expected
+
+
+def test_negative_values_from_file(tmp_path):
+    path = tmp_path / "neg.yml"
+    path.write_text("a:\n  x: -1.5\n  row: -1 -2 -3\n  table:\n    -  -1 2\n    -  3 -4\n", encoding="utf-8")
+    yml = YML(str(path), cache=False)
+    assert yml.read_float("a.x") == -1.5
+    assert yml.read_array("a.x").tolist() == [-1.5]
+    assert yml.read_array("a.row").tolist() == [-1.0, -2.0, -3.0]
+    assert yml.read_array("a.table").tolist() == [[-1.0, 2.0], [3.0, -4.0]]
+
+    # 写回后负号开头的列表项仍带"-  "前缀
+    yml.add_node("a.cols", "-1 2\n-3 4")
+    out = tmp_path / "out.yml"
+    yml.save(str(out))
+    again = YML(str(out), cache=False)
+    assert again.read_array("a.cols").tolist() == [[-1.0, 2.0], [-3.0, 4.0]]
+    assert again.read_array("a.table").tolist() == [[-1.0, 2.0], [3.0, -4.0]]